@@ -0,0 +1,9 @@
+class BM_Import:
+    """Benchmarks for the import time of trackintel"""
+
+    def timeraw_import_trackintel(self):
+        # timeraw benchmarks run in a fresh interpreter, thus no module is cached
+        return "import trackintel"
+
+    def timeraw_import_trackintel_preprocessing(self):
+        return "import trackintel.preprocessing"
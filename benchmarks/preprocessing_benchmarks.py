@@ -26,6 +26,10 @@ class BM_Read_PFS:
     def peakmem_read_pfs(self):
         self.common_func()
 
+    def time_read_pfs_parallel(self):
+        os.chdir(trackintel_root)
+        ti.io.dataset_reader.read_geolife(os.path.join("tests", "data", bm_dataset), n_jobs=-1)
+
 
 class BM_Generate_SP:
     """Benchmarks for generate staypoints"""
@@ -124,3 +128,26 @@ class BM_Generate_TOURS:
 
     def peakmem_gen_tours_geolife_long(self):
         self.common_func()
+
+
+class BM_Pipeline:
+    """Benchmarks for the full chain pfs -> sp -> tpls -> trips -> tours"""
+
+    def setup(self):
+        os.chdir(trackintel_root)
+        self.pfs, _ = ti.io.dataset_reader.read_geolife(os.path.join("tests", "data", "geolife_long_10_MB"))
+
+    def common_func(self):
+        """Generate all trackintel classes from positionfixes"""
+        pfs, sp = self.pfs.generate_staypoints(method="sliding", dist_threshold=25, time_threshold=5)
+        pfs, tpls = pfs.generate_triplegs(sp, method="between_staypoints")
+        sp = sp.create_activity_flag(time_threshold=15)
+        sp, tpls, trips = ti.preprocessing.generate_trips(sp, tpls)
+        trips, tours = ti.preprocessing.generate_tours(trips, max_dist=100)
+        return tours
+
+    def time_pipeline(self):
+        self.common_func()
+
+    def peakmem_pipeline(self):
+        self.common_func()
@@ -269,6 +269,15 @@ class TestLocation_Identifier:
         fr = freq_method(example_freq)
         assert_geodataframe_equal(li, fr)
 
+    def test_input_unchanged(self, example_freq, default_kwargs):
+        """Test if an existing purpose column of the input is not overwritten."""
+        default_kwargs["thresh_sp_at_loc"] = 2
+        example_freq["purpose"] = "unknown"
+        sp = example_freq.copy()
+        li = location_identifier(example_freq, method="FREQ", pre_filter=True, **default_kwargs)
+        assert_geodataframe_equal(example_freq, sp)
+        assert (li["purpose"] != "unknown").any()
+
 
 @pytest.fixture
 def example_osna():
@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 import pandas as pd
-from pandas.testing import assert_series_equal
+from pandas.testing import assert_index_equal, assert_series_equal
 from shapely.geometry import Point
 
 import trackintel as ti
@@ -80,6 +80,52 @@ class TestRadius_gyration:
         smeth = staypoints.radius_gyration()
         assert_series_equal(sfunc, smeth)
 
+    def test_index(self, staypoints):
+        """Test if result is indexed by user_id in sorted order"""
+        staypoints = staypoints.sample(frac=1, random_state=0)
+        s = radius_gyration(staypoints)
+        assert_index_equal(s.index, pd.Index([0, 1], name="user_id"))
+        assert s.name == "radius_gyration"
+
+    def test_zero_weights(self, staypoints):
+        """Test if user with only zero durations gets NaN"""
+        staypoints["finished_at"] = staypoints["started_at"].where(
+            staypoints["user_id"] == 1, staypoints["finished_at"]
+        )
+        s = radius_gyration(staypoints, method="duration")
+        assert s.loc[0] == pytest.approx(3)
+        assert np.isnan(s.loc[1])
+
+    def test_freq(self, staypoints):
+        """Test if radius of gyration is computed per time window"""
+        staypoints.loc[staypoints["id"].isin([3, 8]), "started_at"] += pd.Timedelta(days=7)
+        s = radius_gyration(staypoints, freq="W")
+        assert s.index.names == ["user_id", "window"]
+        assert len(s) == 4
+        # user 0: p1, p2 in first week, p3 alone in second week
+        assert s.iloc[0] == pytest.approx(np.sqrt(18) / 2)
+        assert s.iloc[1] == 0
+        # user 1: only p1 in first week
+        assert s.iloc[2] == 0
+        assert s.iloc[3] == 0
+
+    def test_freq_single_window(self, staypoints):
+        """Test if one window per user gives the same result as without windows"""
+        s1 = radius_gyration(staypoints)
+        s2 = radius_gyration(staypoints, freq="W").droplevel("window")
+        assert_series_equal(s1, s2)
+
+    @pytest.mark.parametrize("freq", [None, "W"])
+    def test_missing_user_id(self, staypoints, freq):
+        """Test if staypoints without user_id are ignored"""
+        s1 = radius_gyration(staypoints, freq=freq)
+        staypoints["user_id"] = staypoints["user_id"].astype(float)
+        staypoints.loc[staypoints["id"] == 2, "user_id"] = np.nan
+        s2 = radius_gyration(staypoints, freq=freq)
+        assert len(s2) == len(s1)
+        assert s2.iloc[0] == pytest.approx(np.sqrt(18))  # p1 and p3 remain for user 0
+        assert s2.iloc[1] == pytest.approx(s1.iloc[1])
+
 
 class TestJump_length:
     def test_planar(self, staypoints):
@@ -120,3 +166,19 @@ class TestJump_length:
         sfunc = jump_length(staypoints)
         smeth = staypoints.jump_length()
         assert_series_equal(sfunc, smeth)
+
+    def test_freq(self, staypoints):
+        """Test if no jumps are computed across time windows"""
+        staypoints.loc[staypoints["id"] == 3, "started_at"] += pd.Timedelta(days=1)
+        s = jump_length(staypoints, freq="D")
+        s_test = pd.Series([np.sqrt(18), np.nan, np.nan, 0, np.sqrt(72), np.nan])
+        assert_series_equal(s, s_test, check_names=False)
+
+    @pytest.mark.parametrize("freq", [None, "D"])
+    def test_missing_user_id(self, staypoints, freq):
+        """Test if no jumps are computed from or to staypoints without user_id"""
+        staypoints["user_id"] = staypoints["user_id"].astype(float)
+        staypoints.loc[staypoints["id"] == 2, "user_id"] = np.nan
+        s = jump_length(staypoints, freq=freq).sort_index()
+        s_test = pd.Series([np.sqrt(72), np.nan, np.nan, 0, np.sqrt(72), np.nan])
+        assert_series_equal(s, s_test, check_names=False)
@@ -2,12 +2,14 @@ import os
 import datetime
 
 import pytest
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point
 
 import trackintel as ti
-from trackintel.analysis.tracking_quality import _get_times
+from trackintel.analysis import temporal_tracking_quality_positionfixes
+from trackintel.analysis.tracking_quality import _coverage_runs, _get_times
 
 
 @pytest.fixture
@@ -265,6 +267,83 @@ class TestTemporal_tracking_quality:
             assert quality.values[-1][-1] == correct_quality
 
 
+@pytest.fixture
+def example_pfs_quality():
+    """Positionfixes of two users with gaps of different lengths."""
+    t = pd.Timestamp("1971-01-01 00:00:00", tz="utc")
+    m = pd.Timedelta("1min")
+    # user 0: fixes every 2 minutes for 10 minutes, then a gap of 20 minutes, then a single fix
+    times_0 = [t + i * 2 * m for i in range(6)] + [t + 30 * m]
+    # user 1: two fixes in the same minute
+    times_1 = [t, t + pd.Timedelta("10s")]
+    data = [{"user_id": 0, "tracked_at": tracked_at, "geom": Point(0.0, 0.0)} for tracked_at in times_0]
+    data += [{"user_id": 1, "tracked_at": tracked_at, "geom": Point(0.0, 0.0)} for tracked_at in times_1]
+    return ti.Positionfixes(data=data, geometry="geom", crs="EPSG:4326")
+
+
+class TestTemporal_tracking_quality_positionfixes:
+    """Tests for the temporal_tracking_quality_positionfixes() function."""
+
+    def test_coverage_runs(self, example_pfs_quality):
+        """Test if gaps smaller than max_gap are bridged and bins are merged into runs."""
+        pfs = example_pfs_quality
+        runs = _coverage_runs(pfs, pd.Timedelta("1min"), pd.Timedelta("5min"))
+        t = pd.Timestamp("1971-01-01 00:00:00", tz="utc")
+        m = pd.Timedelta("1min")
+        assert runs["user_id"].to_list() == [0, 0, 1]
+        assert runs["started_at"].to_list() == [t, t + 30 * m, t]
+        assert runs["finished_at"].to_list() == [t + 11 * m, t + 31 * m, t + m]
+
+    def test_missing_user_id(self, example_pfs_quality):
+        """Test if positionfixes without user_id are ignored."""
+        pfs = example_pfs_quality
+        runs = _coverage_runs(pfs, pd.Timedelta("1min"), pd.Timedelta("5min"))
+        pfs["user_id"] = pfs["user_id"].astype(float)
+        pfs.loc[pfs.index[-1], "user_id"] = np.nan  # after the fixes of user 1 in factorize order
+        pfs.loc[pfs.index[-1], "tracked_at"] += pd.Timedelta("1h")
+        runs_nan = _coverage_runs(pfs, pd.Timedelta("1min"), pd.Timedelta("5min"))
+        pd.testing.assert_frame_equal(runs, runs_nan, check_dtype=False)
+
+    def test_small_max_gap(self, example_pfs_quality):
+        """Test if no gaps are bridged if max_gap is smaller than the sampling interval."""
+        runs = _coverage_runs(example_pfs_quality, pd.Timedelta("1min"), pd.Timedelta("1min"))
+        assert len(runs) == 6 + 1 + 1
+        assert ((runs["finished_at"] - runs["started_at"]) == pd.Timedelta("1min")).all()
+
+    def test_quality_all(self, example_pfs_quality):
+        """Test if the overall quality corresponds to the covered bins."""
+        quality = temporal_tracking_quality_positionfixes(example_pfs_quality, granularity="all")
+        assert quality["user_id"].to_list() == [0, 1]
+        assert quality["quality"].to_list() == [12 / 31, 1]
+
+    def test_quality_day(self, example_pfs_quality):
+        """Test if the quality per day corresponds to the covered bins."""
+        quality = temporal_tracking_quality_positionfixes(example_pfs_quality, granularity="day")
+        assert quality["quality"].to_list() == [12 / 1440, 1 / 1440]
+
+    def test_resolution(self, example_pfs_quality):
+        """Test if coarser resolution covers more time."""
+        quality = temporal_tracking_quality_positionfixes(example_pfs_quality, granularity="hour", resolution="1h")
+        assert quality["quality"].to_list() == [1, 1]
+
+    def test_resolution_error(self, example_pfs_quality):
+        """Test if a non-positive resolution raises an error."""
+        with pytest.raises(ValueError, match="resolution must be positive"):
+            temporal_tracking_quality_positionfixes(example_pfs_quality, resolution="0min")
+
+    def test_missing_columns(self, testdata_sp_tpls_geolife_long):
+        """Test if a KeyError is raised for data without 'tracked_at'."""
+        with pytest.raises(KeyError):
+            temporal_tracking_quality_positionfixes(testdata_sp_tpls_geolife_long)
+
+    def test_positionfixes_accessor(self, example_pfs_quality):
+        """Test tracking_quality calculation from positionfixes method."""
+        pfs = example_pfs_quality
+        quality_method = pfs.temporal_tracking_quality(granularity="day", max_gap="10min")
+        quality_func = temporal_tracking_quality_positionfixes(pfs, granularity="day", max_gap="10min")
+        pd.testing.assert_frame_equal(quality_method, quality_func)
+
+
 class TestSplit_overlaps:
     """Tests for the _split_overlaps() function."""
 
@@ -357,6 +436,29 @@ class TestSplit_overlaps:
         assert (sp_res["started_at"] == [start, midnight, start, midnight, midnight]).all()
         assert (sp_res["finished_at"] == [midnight, end, midnight, end, midnight]).all()
 
+    def test_split_overlaps_dst(self):
+        """Test if records across daylight saving time changes are split into consecutive parts."""
+        tz = "Europe/Zurich"
+        data = [
+            # spring forward, 02:00 local time does not exist
+            {"user_id": 0, "started_at": pd.Timestamp("2021-03-28 00:30", tz=tz), "geom": Point(0.0, 0.0)},
+            # fall back, 02:00 local time occurs twice
+            {"user_id": 1, "started_at": pd.Timestamp("2021-10-31 00:30", tz=tz), "geom": Point(0.0, 0.0)},
+        ]
+        sp = gpd.GeoDataFrame(data=data, geometry="geom", crs="EPSG:4326")
+        sp["finished_at"] = sp["started_at"] + pd.Timedelta(hours=4)
+        sp["duration"] = sp["finished_at"] - sp["started_at"]
+
+        for granularity in ["day", "hour"]:
+            splitted = ti.analysis.tracking_quality._split_overlaps(sp, granularity=granularity)
+            for _, user in splitted.groupby("user_id"):
+                # parts are consecutive and cover the whole record
+                assert (user["started_at"].iloc[1:].values == user["finished_at"].iloc[:-1].values).all()
+                assert (user["duration"] > pd.Timedelta(0)).all()
+            assert splitted["duration"].sum() == sp["duration"].sum()
+        # hour parts start at full local hours
+        assert (splitted["started_at"].iloc[[1, 2, 3, 4, 6, 7, 8]].dt.minute == 0).all()
+
 
 class TestGet_times:
     """Test if _get_times splits correctly"""
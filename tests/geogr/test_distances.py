@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import pytest
 from geopandas.testing import assert_geodataframe_equal
+from pandas.testing import assert_frame_equal, assert_index_equal, assert_series_equal
 import shapely
 from shapely import wkt
 from shapely.geometry import LineString, MultiLineString, Point
@@ -17,6 +18,7 @@ from trackintel.geogr.distances import (
     calculate_distance_matrix,
     calculate_haversine_length,
     check_gdf_planar,
+    get_kinematics_positionfixes,
     get_speed_positionfixes,
     point_haversine_dist,
     meters_to_decimal_degrees,
@@ -460,6 +462,95 @@ class TestSpeedPositionfixes:
         correct_speed = np.array((np.sqrt(2), np.sqrt(2), 5 / 2))
         assert np.all(np.isclose(pfs["speed"].to_numpy(), correct_speed, rtol=1e-6))
 
+    def test_user_boundaries(self, load_positionfixes):
+        """Test that the speed is not computed over the positionfixes of different users."""
+        pfs, correct_speeds = load_positionfixes
+        pfs_other = pfs.copy()
+        pfs_other["user_id"] = 2
+        pfs_other.index = pfs_other.index + len(pfs)
+        # interleave the two users
+        pfs_both = pd.concat([pfs, pfs_other]).sort_values("tracked_at", kind="stable")
+        speed_pfs = get_speed_positionfixes(pfs_both)
+        assert np.allclose(speed_pfs.loc[pfs.index, "speed"], correct_speeds, rtol=1e-06)
+        assert np.allclose(speed_pfs.loc[pfs_other.index, "speed"], correct_speeds, rtol=1e-06)
+        # original order is kept
+        assert_index_equal(speed_pfs.index, pfs_both.index)
+
+    def test_zero_time_delta(self, load_positionfixes):
+        """Test that speeds over a time difference of zero are NaN."""
+        pfs, _ = load_positionfixes
+        pfs.loc[2, "tracked_at"] = pfs.loc[1, "tracked_at"]
+        speed_pfs = get_speed_positionfixes(pfs)
+        assert np.isnan(speed_pfs.loc[2, "speed"])
+        assert np.isfinite(speed_pfs["speed"].drop(index=2)).all()
+
+
+class TestGetKinematicsPositionfixes:
+    def test_positionfixes_stable(self, load_positionfixes):
+        """Test whether the positionfixes stay the same apart from the new columns"""
+        pfs, _ = load_positionfixes
+        kin_pfs = get_kinematics_positionfixes(pfs)
+        assert_geodataframe_equal(pfs, kin_pfs.drop(columns=["speed", "acceleration", "bearing", "turning_angle"]))
+
+    def test_accessor(self, load_positionfixes):
+        """Test whether the accessor yields the same output as the function"""
+        pfs, _ = load_positionfixes
+        assert_geodataframe_equal(pfs.as_positionfixes.get_kinematics(), get_kinematics_positionfixes(pfs))
+
+    def test_speed_equal(self, load_positionfixes):
+        """Test that the speed is identical to get_speed_positionfixes."""
+        pfs, _ = load_positionfixes
+        kin_pfs = get_kinematics_positionfixes(pfs)
+        speed_pfs = get_speed_positionfixes(pfs)
+        assert_series_equal(kin_pfs["speed"], speed_pfs["speed"])
+
+    def test_planar_geometry(self):
+        """Test all features on a planar example."""
+        t = pd.Timestamp("2022-05-26 23:59:59", tz="utc")
+        second = pd.Timedelta("1s")
+        d = [
+            {"user_id": 0, "tracked_at": t, "g": Point(0.0, 0.0)},
+            {"user_id": 0, "tracked_at": t + second, "g": Point(0.0, 2.0)},  # north, 2 m/s
+            {"user_id": 0, "tracked_at": t + 2 * second, "g": Point(4.0, 2.0)},  # east, 4 m/s
+            {"user_id": 0, "tracked_at": t + 4 * second, "g": Point(4.0, 0.0)},  # south, 1 m/s
+        ]
+        pfs = gpd.GeoDataFrame(d, geometry="g", crs="EPSG:2056")
+        pfs = get_kinematics_positionfixes(pfs)
+        nan = np.nan
+        assert np.allclose(pfs["speed"], [2, 2, 4, 1], equal_nan=True)
+        assert np.allclose(pfs["acceleration"], [nan, nan, 2, -1.5], equal_nan=True)
+        assert np.allclose(pfs["bearing"], [nan, 0, 90, 180], equal_nan=True)
+        assert np.allclose(pfs["turning_angle"], [nan, nan, 90, 90], equal_nan=True)
+
+    def test_bearing_geographic(self):
+        """Test that the bearing follows the compass directions in WGS84."""
+        t = pd.Timestamp("2022-05-26 23:59:59", tz="utc")
+        minute = pd.Timedelta("1min")
+        points = [Point(8.5, 47.3), Point(8.5, 47.4), Point(8.6, 47.4), Point(8.6, 47.3), Point(8.5, 47.3)]
+        d = [{"user_id": 0, "tracked_at": t + i * minute, "g": p} for i, p in enumerate(points)]
+        pfs = gpd.GeoDataFrame(d, geometry="g", crs="EPSG:4326")
+        pfs = get_kinematics_positionfixes(pfs)
+        assert np.allclose(pfs["bearing"].iloc[1:], [0, 90, 180, 270], atol=0.1)
+        assert np.allclose(pfs["turning_angle"].iloc[2:], [90, 90, 90], atol=0.1)
+
+    def test_split_triplegs(self, example_triplegs):
+        """Test that features are reset at tripleg boundaries and NaN outside of triplegs."""
+        pfs, tpls = example_triplegs
+        kin_pfs = get_kinematics_positionfixes(pfs, split_triplegs=True)
+        no_tpls = pfs["tripleg_id"].isna()
+        assert kin_pfs.loc[no_tpls, ["speed", "acceleration", "bearing", "turning_angle"]].isna().all(axis=None)
+        # each tripleg on its own gives the same result
+        tpl = tpls.index[1]
+        pfs_tpl = pfs[pfs["tripleg_id"] == tpl]
+        kin_tpl = get_kinematics_positionfixes(pfs_tpl)
+        assert_frame_equal(kin_pfs.loc[pfs_tpl.index], kin_tpl)
+
+    def test_split_triplegs_error(self, load_positionfixes):
+        """Test that an error is raised if the column tripleg_id is missing."""
+        pfs, _ = load_positionfixes
+        with pytest.raises(AttributeError, match='Positionfixes must include column "tripleg_id".'):
+            get_kinematics_positionfixes(pfs, split_triplegs=True)
+
 
 class TestPfsMeanSpeedTriplegs:
     def test_triplegs_stable(self, example_triplegs):
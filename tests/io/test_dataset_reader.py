@@ -1,13 +1,30 @@
 import datetime
+import glob
 import os
+import shutil
+import warnings
 
+import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
 from geopandas.testing import assert_geodataframe_equal
+from numpy.testing import assert_almost_equal
+from pandas.testing import assert_frame_equal, assert_index_equal
 from shapely.geometry import Point
 
 import trackintel as ti
-from trackintel.io.dataset_reader import _get_df, _get_labels, geolife_add_modes_to_triplegs, read_geolife, read_gpx
+from trackintel.io.dataset_reader import (
+    FEET2METER,
+    _get_labels,
+    _read_plt_files,
+    _read_snapshot,
+    _snapshot_dir,
+    _write_snapshot,
+    geolife_add_modes_to_triplegs,
+    read_geolife,
+    read_gpx,
+)
 from trackintel import Positionfixes
 
 
@@ -101,6 +118,50 @@ class TestReadGeolife:
         captured_noprint = capsys.readouterr()
         assert captured_noprint.err == ""
 
+    def test_n_jobs(self):
+        """Test if reading the users in parallel returns the same positionfixes."""
+        geolife_path = os.path.join("tests", "data", "geolife_modes")
+        pfs, _ = read_geolife(geolife_path)
+        pfs_parallel, _ = read_geolife(geolife_path, n_jobs=2)
+        assert_geodataframe_equal(pfs, pfs_parallel)
+        assert set(pfs_parallel["user_id"]) == {10, 20, 178}
+
+    def test_cache(self, tmp_path, monkeypatch):
+        """Test if a second read with cache_dir uses the snapshot instead of parsing the files."""
+        pytest.importorskip("pyarrow")
+        geolife_path = os.path.join("tests", "data", "geolife_modes")
+        pfs, labels = read_geolife(geolife_path, cache_dir=tmp_path)
+        assert len(os.listdir(tmp_path)) == 1
+
+        def raise_error(*args, **kwargs):
+            raise AssertionError("files parsed despite snapshot")
+
+        monkeypatch.setattr(ti.io.dataset_reader, "_read_plt_files", raise_error)
+        pfs_cached, labels_cached = read_geolife(geolife_path, cache_dir=tmp_path)
+        assert isinstance(pfs_cached, Positionfixes)
+        assert_geodataframe_equal(pfs, pfs_cached)
+        assert labels.keys() == labels_cached.keys()
+        for user_id in labels:
+            assert_frame_equal(labels[user_id], labels_cached[user_id])
+
+    def test_cache_invalidation(self, tmp_path):
+        """Test if changing the source files invalidates and replaces the snapshot."""
+        pytest.importorskip("pyarrow")
+        geolife_path = tmp_path / "geolife"
+        cache_dir = tmp_path / "cache"
+        shutil.copytree(os.path.join("tests", "data", "geolife"), geolife_path)
+        pfs, _ = read_geolife(geolife_path, cache_dir=cache_dir)
+        snapshots = os.listdir(cache_dir)
+
+        # touching a single trajectory file changes its mtime and must trigger a new snapshot
+        trajectory = sorted(glob.glob(os.path.join(geolife_path, "*", "Trajectory", "*.plt")))[0]
+        stat = os.stat(trajectory)
+        os.utime(trajectory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        pfs_changed, _ = read_geolife(geolife_path, cache_dir=cache_dir)
+        assert_geodataframe_equal(pfs, pfs_changed)
+        assert len(os.listdir(cache_dir)) == 1
+        assert os.listdir(cache_dir) != snapshots
+
     def test_label_reading(self):
         """Test data types of the labels returned by read_geolife."""
         _, labels = read_geolife(os.path.join("tests", "data", "geolife_modes"))
@@ -145,22 +206,61 @@ class Test_GetLabels:
         assert all(df.columns.tolist() == ["started_at", "finished_at", "mode"] for df in labels.values())
 
 
-class Test_GetDf:
+class Test_ReadPltFiles:
     def test_example_data(self):
         """Read example data and test if it is valid."""
-        geolife_path = os.path.join("tests", "data", "geolife_modes")
-        uids = ["010", "020", "178"]
-        df_gen = _get_df(geolife_path, uids, False)
-
-        s = 0
-        df_lengths = [681, 818, 915, 1004, 66, 327, 256, 66, 84]
-        columns = ["elevation", "tracked_at", "geom", "user_id"]
-        for df in df_gen:
-            assert len(df) in df_lengths
-            assert df.columns.tolist() == columns
-            assert isinstance(df["geom"][0], Point)
-            s += 1
-        assert s == len(df_lengths)
+        pattern = os.path.join("tests", "data", "geolife_modes", "*", "Trajectory", "*.plt")
+        paths = sorted(glob.glob(pattern))
+        arrays = _read_plt_files(paths)
+
+        assert len(arrays) == 4
+        assert all(len(a) == sum([681, 818, 915, 1004, 66, 327, 256, 66, 84]) for a in arrays)
+        assert [a.dtype for a in arrays] == [np.float64, np.float64, np.float64, np.int64]
+
+    def test_timestamps(self, tmp_path):
+        """Test if timestamps from the day-fraction column match the date and time columns."""
+        header = "Geolife trajectory\nWGS 84\nAltitude is in Feet\nReserved 3\n0,2,255,My Track,0,0,2,8421376\n0\n"
+        rows = [
+            "39.984702,116.318417,0,492,39744.1201851852,2008-10-23,02:53:04",
+            "39.984683,116.31845,0,-777,39744.1202546296,2008-10-23,02:53:10",
+        ]
+        path = tmp_path / "trajectory.plt"
+        path.write_text(header + "\r\n".join(rows))  # no trailing newline
+        latitude, longitude, elevation, tracked_at = _read_plt_files([path, path])
+
+        expected = pd.to_datetime(["2008-10-23 02:53:04", "2008-10-23 02:53:10"] * 2, utc=True)
+        assert_index_equal(pd.to_datetime(tracked_at, unit="s", utc=True), expected)
+        assert_almost_equal(elevation, np.array([492, -777] * 2) * FEET2METER)
+        assert_almost_equal(latitude, [39.984702, 39.984683] * 2)
+        assert_almost_equal(longitude, [116.318417, 116.31845] * 2)
+
+    def test_empty(self, tmp_path):
+        """Test if files without positionfixes return empty arrays."""
+        path = tmp_path / "trajectory.plt"
+        path.write_text("Geolife trajectory\nWGS 84\nAltitude is in Feet\nReserved 3\n0,2,255\n0\n")
+        arrays = _read_plt_files([path])
+        assert all(len(a) == 0 for a in arrays)
+
+
+class Test_Snapshot:
+    def test_additional_geometry(self, tmp_path):
+        """Test if frames with several geometry columns and plain DataFrames survive a snapshot."""
+        pytest.importorskip("pyarrow")
+        gdf = gpd.GeoDataFrame(
+            {"user_id": [0, 1], "geom": [Point(0, 0), Point(1, 1)], "extra": [Point(2, 2), None]},
+            geometry="geom",
+            crs="EPSG:4326",
+        )
+        gdf["extra"] = gdf["extra"].astype(object)  # shapely objects without geometry dtype
+        df = pd.DataFrame({"user_id": [0, 1]}, index=pd.Index([10, 11], name="trip_id"))
+        snapshot = _snapshot_dir(tmp_path, "test", os.path.join("tests", "data", "geolife"))
+        assert _read_snapshot(snapshot) is None
+
+        _write_snapshot(snapshot, {"gdf": gdf, "df": df})
+        frames = _read_snapshot(snapshot)
+        gdf["extra"] = gpd.GeoSeries(gdf["extra"])
+        assert_geodataframe_equal(frames["gdf"], gdf)
+        assert_frame_equal(frames["df"], df)
 
 
 class TestGeolife_add_modes_to_triplegs:
@@ -238,6 +338,40 @@ class TestGeolife_add_modes_to_triplegs:
         assert pd.isna(tpls.loc[2, "mode"]) and pd.isna(tpls.loc[2, "label_id"])
         assert tpls.loc[3, "mode"] == "bike" and tpls.loc[3, "label_id"] == 1
 
+    def test_many_overlapping_triplegs(self):
+        """Test if a label is matched to all triplegs it covers, not only to the nearest ones."""
+        t = pd.Timestamp("1970-01-01", tz="utc")
+        one_min = pd.Timedelta("1min")
+        triplegs = pd.DataFrame(
+            {
+                "started_at": [t + 2 * i * one_min for i in range(30)],
+                "finished_at": [t + (2 * i + 1) * one_min for i in range(30)],
+            }
+        )
+        triplegs["user_id"] = 0
+        labels_raw = pd.DataFrame([{"started_at": t, "finished_at": t + 60 * one_min, "mode": "walk"}])
+        labels = {0: labels_raw}
+
+        tpls = geolife_add_modes_to_triplegs(triplegs, labels)
+        assert (tpls["mode"] == "walk").all()
+        assert (tpls["label_id"] == 0).all()
+        # labels are not modified
+        assert labels_raw.columns.tolist() == ["started_at", "finished_at", "mode"]
+
+    def test_deprecated_arguments(self, matching_data):
+        """Test if passing the deprecated arguments warns, but the default values do not."""
+        triplegs, labels_raw = matching_data
+        labels = {0: labels_raw}
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            tpls_default = geolife_add_modes_to_triplegs(triplegs, labels, max_triplegs=20)
+        warn_string = "The arguments 'max_triplegs' and 'max_duration_tripleg' are deprecated"
+        with pytest.warns(DeprecationWarning, match=warn_string):
+            tpls = geolife_add_modes_to_triplegs(triplegs, labels, max_triplegs=1)
+        with pytest.warns(DeprecationWarning, match=warn_string):
+            geolife_add_modes_to_triplegs(triplegs, labels, max_duration_tripleg=60)
+        assert_frame_equal(tpls, tpls_default)
+
     def test_impossible_matching(self, impossible_matching_data):
         # bring label data into right format.
         tpls, labels_raw = impossible_matching_data
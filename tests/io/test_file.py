@@ -85,6 +85,53 @@ class TestPositionfixes:
         pfs = ti.read_positionfixes_csv(file, sep=";", index_col=ind_name)
         assert isinstance(pfs, ti.Positionfixes)
 
+    def test_pyarrow_engine(self):
+        """Test if the pyarrow engine reads the same positionfixes as the default engine."""
+        pytest.importorskip("pyarrow")
+        file = os.path.join("tests", "data", "positionfixes.csv")
+        pfs = ti.read_positionfixes_csv(file, sep=";", index_col="id")
+        pfs_arrow = ti.read_positionfixes_csv(file, sep=";", index_col="id", engine="pyarrow")
+        assert_geodataframe_equal(pfs, pfs_arrow)
+
+        column_mapping = {"lat": "latitude", "lon": "longitude", "time": "tracked_at"}
+        mod_file = os.path.join("tests", "data", "positionfixes_mod_columns.csv")
+        mod_pfs = ti.read_positionfixes_csv(mod_file, sep=";", index_col="id", columns=column_mapping, engine="pyarrow")
+        assert_geodataframe_equal(pfs, mod_pfs)
+
+    def test_pyarrow_dtype_error(self):
+        """Test if a non dict dtype raises an error with the pyarrow engine."""
+        pytest.importorskip("pyarrow")
+        file = os.path.join("tests", "data", "positionfixes.csv")
+        with pytest.raises(ValueError, match="dtype must be a dict"):
+            ti.read_positionfixes_csv(file, sep=";", index_col="id", engine="pyarrow", dtype=str)
+
+    @pytest.mark.parametrize("engine", [None, "pyarrow"])
+    def test_chunksize(self, engine):
+        """Test if chunksize returns validated positionfixes chunks that match a full read."""
+        if engine == "pyarrow":
+            pytest.importorskip("pyarrow")
+        file = os.path.join("tests", "data", "positionfixes.csv")
+        pfs = ti.read_positionfixes_csv(file, sep=";", index_col=None)
+        chunks = list(ti.read_positionfixes_csv(file, sep=";", index_col=None, engine=engine, chunksize=4))
+        assert [len(c) for c in chunks] == [4, len(pfs) - 4]
+        assert all(isinstance(c, ti.Positionfixes) for c in chunks)
+        assert_geodataframe_equal(pd.concat(chunks), pfs)
+
+    @pytest.mark.parametrize("engine", [None, "pyarrow"])
+    def test_tracked_at_format(self, engine):
+        """Test if tracked_at is parsed with the given format."""
+        if engine == "pyarrow":
+            pytest.importorskip("pyarrow")
+        file = os.path.join("tests", "data", "positionfixes.csv")
+        pfs = ti.read_positionfixes_csv(file, sep=";", index_col="id")
+        tmp_file = os.path.join("tests", "data", "positionfixes_test_format.csv")
+        pfs.as_positionfixes.to_csv(tmp_file, sep=";", date_format="%d.%m.%Y %H:%M:%S")
+        pfs_format = ti.read_positionfixes_csv(
+            tmp_file, sep=";", index_col="id", tz="utc", engine=engine, tracked_at_format="%d.%m.%Y %H:%M:%S"
+        )
+        os.remove(tmp_file)
+        assert_geodataframe_equal(pfs, pfs_format)
+
 
 class TestTriplegs:
     """Test for 'read_triplegs_csv' and 'write_triplegs_csv' functions."""
@@ -5,7 +5,7 @@ import pandas as pd
 import pytest
 import trackintel as ti
 from geopandas.testing import assert_geodataframe_equal
-from pandas.testing import assert_frame_equal, assert_index_equal
+from pandas.testing import assert_frame_equal, assert_index_equal, assert_series_equal
 from shapely.geometry import Point, Polygon, MultiPoint
 from trackintel.io.from_geopandas import (
     _trackintel_model,
@@ -115,6 +115,36 @@ class Test_Trackintel_Model:
         ).dt.tz_convert("Europe/Amsterdam")
         assert_geodataframe_equal(pfs, example_positionfixes)
 
+    def test_naive_datetime_dtype(self, example_positionfixes):
+        """Test if naive datetime64 columns get localized to the given timezone."""
+        pfs = example_positionfixes.copy()
+        pfs["tracked_at"] = pfs["tracked_at"].dt.tz_localize(None)
+        pfs = _trackintel_model(pfs, tz_cols=["tracked_at"], tz="Europe/Amsterdam")
+        expected = example_positionfixes["tracked_at"].dt.tz_localize(None).dt.tz_localize("Europe/Amsterdam")
+        assert_series_equal(pfs["tracked_at"], expected)
+
+    def test_mixed_naive_and_aware(self, example_positionfixes):
+        """Test if naive timestamps get localized and aware timestamps converted in the same column."""
+        example_positionfixes["tracked_at"] = [
+            "2021-08-01 16:00:00",
+            pd.Timestamp("2021-08-01 16:00:00", tz="Asia/Muscat"),
+            "2021-08-01 16:00:00+05:00",
+        ]
+        pfs = _trackintel_model(example_positionfixes.copy(), tz_cols=["tracked_at"], tz="Europe/Amsterdam")
+        expected = pd.Series(
+            pd.to_datetime(["2021-08-01 14:00:00", "2021-08-01 12:00:00", "2021-08-01 11:00:00"], utc=True),
+            index=example_positionfixes.index,
+            name="tracked_at",
+        ).dt.tz_convert("Europe/Amsterdam")
+        assert_series_equal(pfs["tracked_at"], expected)
+
+    def test_missing_timestamps(self, example_positionfixes):
+        """Test if missing values are kept as NaT."""
+        example_positionfixes["tracked_at"] = ["2021-08-01 16:00:00", None, "2021-08-01 17:00:00"]
+        pfs = _trackintel_model(example_positionfixes.copy(), tz_cols=["tracked_at"], tz="UTC")
+        assert isinstance(pfs["tracked_at"].dtype, pd.DatetimeTZDtype)
+        assert pfs["tracked_at"].isna().tolist() == [False, True, False]
+
 
 class TestRead_Positionfixes_Gpd:
     """Test `read_positionfixes_gpd()` function."""
@@ -0,0 +1,337 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from geopandas.testing import assert_geodataframe_equal
+from pandas.testing import assert_frame_equal, assert_index_equal
+
+import trackintel as ti
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def example_positionfixes():
+    """Positionfixes of the test data with a nullable id column and a non-UTC timezone."""
+    file = os.path.join("tests", "data", "positionfixes.csv")
+    pfs = ti.read_positionfixes_csv(file, sep=";", index_col="id", crs="EPSG:4326")
+    pfs["tracked_at"] = pfs["tracked_at"].dt.tz_convert("Europe/Zurich")
+    pfs["tripleg_id"] = pd.array([0, 0, None, 1, 1, None], dtype="Int64")
+    pfs.loc[pfs.index[-2:], "user_id"] = 2
+    return pfs
+
+
+@pytest.fixture
+def example_staypoints():
+    file = os.path.join("tests", "data", "staypoints.csv")
+    return ti.read_staypoints_csv(file, sep=";", tz="utc", index_col="id", crs="EPSG:4326")
+
+
+@pytest.fixture
+def example_tours():
+    """Tours with a list column of trip ids."""
+    t1 = pd.Timestamp("1971-01-01 00:00:00", tz="utc")
+    t2 = pd.Timestamp("1971-01-01 05:00:00", tz="utc")
+    t3 = pd.Timestamp("1971-01-02 07:00:00", tz="utc")
+    h = pd.Timedelta(hours=1)
+
+    list_dict = [
+        {"user_id": 0, "started_at": t1, "finished_at": t1 + h, "trips": [0, 1, 2]},
+        {"user_id": 0, "started_at": t2, "finished_at": t2 + h, "trips": [2, 3, 4]},
+        {"user_id": 1, "started_at": t3, "finished_at": t3 + h, "trips": [4, 5, 6]},
+    ]
+    tours = pd.DataFrame(data=list_dict)
+    tours.index.name = "id"
+    return ti.Tours(tours)
+
+
+class TestPositionfixes:
+    """Test for 'read_positionfixes_parquet' and 'write_positionfixes_parquet' functions."""
+
+    def test_to_from_parquet(self, example_positionfixes, tmp_path):
+        """Test if writing then reading returns the same positionfixes."""
+        pfs = example_positionfixes
+        file = tmp_path / "pfs.parquet"
+        ti.io.write_positionfixes_parquet(pfs, file)
+        pfs_read = ti.io.read_positionfixes_parquet(file)
+        assert isinstance(pfs_read, ti.Positionfixes)
+        assert_geodataframe_equal(pfs, pfs_read)
+        assert pfs_read["tripleg_id"].dtype == "Int64"
+        assert str(pfs_read["tracked_at"].dt.tz) == "Europe/Zurich"
+
+    def test_accessor(self, example_positionfixes, tmp_path):
+        """Test if the to_parquet method writes the same file."""
+        pfs = example_positionfixes
+        pfs.to_parquet(tmp_path / "method.parquet")
+        ti.io.write_positionfixes_parquet(pfs, tmp_path / "function.parquet")
+        assert_geodataframe_equal(
+            ti.io.read_positionfixes_parquet(tmp_path / "method.parquet"),
+            ti.io.read_positionfixes_parquet(tmp_path / "function.parquet"),
+        )
+
+    def test_index(self, example_positionfixes, tmp_path):
+        """Test that the index cannot be dropped on writing."""
+        with pytest.raises(ValueError, match="'index' must be True"):
+            ti.io.write_positionfixes_parquet(example_positionfixes, tmp_path / "pfs.parquet", index=False)
+        ti.io.write_positionfixes_parquet(example_positionfixes, tmp_path / "pfs.parquet", index=True)
+        pfs = ti.io.read_positionfixes_parquet(tmp_path / "pfs.parquet")
+        assert_index_equal(pfs.index, example_positionfixes.index)
+
+    def test_columns(self, example_positionfixes, tmp_path):
+        """Test if only the selected columns (plus required columns and geometry) are read."""
+        pfs = example_positionfixes
+        file = tmp_path / "pfs.parquet"
+        pfs.to_parquet(file)
+        pfs_read = ti.io.read_positionfixes_parquet(file, columns=["elevation"])
+        assert pfs_read.columns.tolist() == ["user_id", "tracked_at", "elevation", "geom"]
+        assert pfs_read.geometry.name == "geom"
+        assert_frame_equal(pfs_read, pfs[pfs_read.columns])
+
+    def test_user_filter(self, example_positionfixes, tmp_path):
+        """Test if only positionfixes of the selected users are read."""
+        pfs = example_positionfixes
+        file = tmp_path / "pfs.parquet"
+        pfs.to_parquet(file)
+        assert_geodataframe_equal(ti.io.read_positionfixes_parquet(file, user_id=2), pfs[pfs["user_id"] == 2])
+        pfs_read = ti.io.read_positionfixes_parquet(file, user_id=[1, 2])
+        assert_geodataframe_equal(pfs_read, pfs)
+
+    def test_time_filter(self, example_positionfixes, tmp_path):
+        """Test if the time window is applied independent of the timezone."""
+        pfs = example_positionfixes
+        file = tmp_path / "pfs.parquet"
+        pfs.to_parquet(file)
+        start = pfs["tracked_at"].iloc[1].tz_convert("utc")
+        end = pfs["tracked_at"].iloc[3].tz_localize(None)  # naive -> local time interpreted as UTC
+        pfs_read = ti.io.read_positionfixes_parquet(file, start=start, end=end)
+        expected = pfs[(pfs["tracked_at"] >= start) & (pfs["tracked_at"] < end.tz_localize("utc"))]
+        assert len(expected) > 0
+        assert_geodataframe_equal(pfs_read, expected)
+
+    def test_filters(self, example_positionfixes, tmp_path):
+        """Test if additional filters are combined with the user filter."""
+        pfs = example_positionfixes
+        file = tmp_path / "pfs.parquet"
+        pfs.to_parquet(file)
+        pfs_read = ti.io.read_positionfixes_parquet(file, user_id=1, filters=[("elevation", ">", 500)])
+        assert_geodataframe_equal(pfs_read, pfs[(pfs["user_id"] == 1) & (pfs["elevation"] > 500)])
+
+
+class TestStaypoints:
+    """Test for 'read_staypoints_parquet' and 'write_staypoints_parquet' functions."""
+
+    def test_to_from_parquet(self, example_staypoints, tmp_path):
+        """Test if writing then reading returns the same staypoints."""
+        sp = example_staypoints
+        file = tmp_path / "sp.parquet"
+        sp.to_parquet(file)
+        sp_read = ti.io.read_staypoints_parquet(file)
+        assert isinstance(sp_read, ti.Staypoints)
+        assert_geodataframe_equal(sp, sp_read)
+
+    def test_time_filter(self, example_staypoints, tmp_path):
+        """Test if all staypoints overlapping the time window are read."""
+        sp = example_staypoints
+        file = tmp_path / "sp.parquet"
+        sp.to_parquet(file)
+        start = sp["finished_at"].iloc[0]
+        end = sp["started_at"].iloc[1]
+        sp_read = ti.io.read_staypoints_parquet(file, start=start, end=end)
+        expected = sp[(sp["finished_at"] >= start) & (sp["started_at"] < end)]
+        assert_geodataframe_equal(sp_read, expected)
+
+
+class TestTriplegs:
+    """Test for 'read_triplegs_parquet' and 'write_triplegs_parquet' functions."""
+
+    def test_to_from_parquet(self, tmp_path):
+        """Test if writing then reading returns the same triplegs."""
+        file = os.path.join("tests", "data", "triplegs.csv")
+        tpls = ti.read_triplegs_csv(file, sep=";", tz="utc", index_col="id", crs="EPSG:4326")
+        tpls.to_parquet(tmp_path / "tpls.parquet")
+        tpls_read = ti.io.read_triplegs_parquet(tmp_path / "tpls.parquet")
+        assert isinstance(tpls_read, ti.Triplegs)
+        assert_geodataframe_equal(tpls, tpls_read)
+
+
+class TestLocations:
+    """Test for 'read_locations_parquet' and 'write_locations_parquet' functions."""
+
+    def test_to_from_parquet(self, tmp_path):
+        """Test if writing then reading returns the same locations."""
+        file = os.path.join("tests", "data", "locations.csv")
+        locs = ti.read_locations_csv(file, sep=";", index_col="id", crs="EPSG:4326")
+        locs.to_parquet(tmp_path / "locs.parquet")
+        locs_read = ti.io.read_locations_parquet(tmp_path / "locs.parquet")
+        assert isinstance(locs_read, ti.Locations)
+        assert_geodataframe_equal(locs, locs_read)
+
+    def test_columns(self, tmp_path):
+        """Test if the geometry is read even if not selected."""
+        file = os.path.join("tests", "data", "locations.csv")
+        locs = ti.read_locations_csv(file, sep=";", index_col="id", crs="EPSG:4326")
+        locs.to_parquet(tmp_path / "locs.parquet")
+        locs_read = ti.io.read_locations_parquet(tmp_path / "locs.parquet", columns=[], user_id=[1])
+        assert locs_read.columns.tolist() == ["user_id", "center"]
+
+
+class TestTrips:
+    """Test for 'read_trips_parquet' and 'write_trips_parquet' functions."""
+
+    def test_to_from_parquet(self, tmp_path):
+        """Test if writing then reading returns the same trips without geometry."""
+        file = os.path.join("tests", "data", "trips.csv")
+        trips = ti.read_trips_csv(file, sep=";", index_col="id")
+        trips.to_parquet(tmp_path / "trips.parquet")
+        trips_read = ti.io.read_trips_parquet(tmp_path / "trips.parquet")
+        assert isinstance(trips_read, ti.TripsDataFrame)
+        assert_frame_equal(trips, trips_read)
+
+    def test_tour_id(self, tmp_path):
+        """Test if the list column 'tour_id' is read back as lists and trips without tour as NaN."""
+        file = os.path.join("tests", "data", "trips.csv")
+        trips = ti.read_trips_csv(file, sep=";", index_col="id")
+        trips["tour_id"] = [[0], [0, 1], np.nan, np.nan]
+        trips.to_parquet(tmp_path / "trips.parquet")
+        trips_read = ti.io.read_trips_parquet(tmp_path / "trips.parquet")
+        assert_frame_equal(trips, trips_read)
+        assert trips_read["tour_id"].iloc[1] == [0, 1]
+        assert np.isnan(trips_read["tour_id"].iloc[2])
+
+    def test_to_from_parquet_geometry(self, tmp_path):
+        """Test if writing then reading returns the same trips with geometry."""
+        file = os.path.join("tests", "data", "trips_mod_columns.csv")
+        column_mapping = {"orig_stp": "origin_staypoint_id", "dest_stp": "destination_staypoint_id"}
+        trips = ti.read_trips_csv(file, columns=column_mapping, sep=";", index_col="id", geom_col="geom", crs=4326)
+        ti.io.write_trips_parquet(trips, tmp_path / "trips.parquet")
+        trips_read = ti.io.read_trips_parquet(tmp_path / "trips.parquet")
+        assert isinstance(trips_read, ti.TripsGeoDataFrame)
+        assert_geodataframe_equal(trips, trips_read)
+
+
+class TestTours:
+    """Test for 'read_tours_parquet' and 'write_tours_parquet' functions."""
+
+    def test_to_from_parquet(self, example_tours, tmp_path):
+        """Test if writing then reading returns the same tours including the list column."""
+        example_tours.to_parquet(tmp_path / "tours.parquet")
+        tours_read = ti.io.read_tours_parquet(tmp_path / "tours.parquet")
+        assert isinstance(tours_read, ti.Tours)
+        assert_frame_equal(example_tours, tours_read)
+        assert tours_read["trips"].iloc[0] == [0, 1, 2]
+
+    def test_user_filter(self, example_tours, tmp_path):
+        """Test if only tours of the selected user are read."""
+        ti.io.write_tours_parquet(example_tours, tmp_path / "tours.parquet")
+        tours_read = ti.io.read_tours_parquet(tmp_path / "tours.parquet", user_id=0)
+        assert_frame_equal(example_tours[example_tours["user_id"] == 0], tours_read)
+
+
+class TestParquetDataset:
+    """Test for 'read_parquet_dataset' and 'write_parquet_dataset' functions."""
+
+    def test_to_from_dataset(self, example_positionfixes, tmp_path):
+        """Test if writing then reading the whole dataset returns the same positionfixes."""
+        pfs = example_positionfixes
+        ti.io.write_parquet_dataset(pfs, tmp_path, n_buckets=4)
+        pfs_read = ti.io.read_parquet_dataset(tmp_path)
+        assert isinstance(pfs_read, ti.Positionfixes)
+        assert_geodataframe_equal(pfs, pfs_read.sort_index())
+
+    def test_partitions(self, example_positionfixes, tmp_path):
+        """Test if partitions are written per user bucket and local date."""
+        pfs = example_positionfixes
+        ti.io.write_parquet_dataset(pfs, tmp_path, n_buckets=1)
+        dates = sorted(os.listdir(tmp_path / "user_bucket=0"))
+        assert dates == sorted(f"date={d}" for d in pfs["tracked_at"].dt.strftime("%Y-%m-%d").unique())
+
+    def test_partition_pruning(self, example_positionfixes, tmp_path):
+        """Test if partitions of other users are not opened."""
+        pfs = example_positionfixes
+        ti.io.write_parquet_dataset(pfs, tmp_path, n_buckets=64)
+        buckets = os.listdir(tmp_path)
+        bucket_2 = f"user_bucket={ti.io.parquet._user_bucket([2], 64)[0]}"
+        assert bucket_2 in buckets
+        # corrupt all other partitions
+        for bucket in buckets:
+            if bucket.startswith("user_bucket") and bucket != bucket_2:
+                for root, _, files in os.walk(tmp_path / bucket):
+                    for file in files:
+                        with open(os.path.join(root, file), "w") as f:
+                            f.write("not a parquet file")
+        pfs_read = ti.io.read_parquet_dataset(tmp_path, user_id=[2])
+        assert_geodataframe_equal(pfs[pfs["user_id"] == 2], pfs_read.sort_index())
+
+    def test_time_window(self, example_staypoints, tmp_path):
+        """Test if staypoints that started on an earlier date but overlap the window are read."""
+        sp = example_staypoints
+        sp.loc[sp.index[0], "finished_at"] = sp["started_at"].iloc[0] + pd.Timedelta(days=2)
+        ti.io.write_parquet_dataset(sp, tmp_path)
+        start = sp["started_at"].iloc[0] + pd.Timedelta(days=1)
+        sp_read = ti.io.read_parquet_dataset(tmp_path, start=start)
+        assert isinstance(sp_read, ti.Staypoints)
+        assert_geodataframe_equal(sp[sp["finished_at"] >= start], sp_read.sort_index())
+
+    def test_append(self, example_positionfixes, tmp_path):
+        """Test if a second write appends to the dataset."""
+        pfs = example_positionfixes
+        ti.io.write_parquet_dataset(pfs.iloc[:3], tmp_path)
+        ti.io.write_parquet_dataset(pfs.iloc[3:], tmp_path)
+        assert_geodataframe_equal(pfs, ti.io.read_parquet_dataset(tmp_path).sort_index())
+
+    def test_append_error(self, example_positionfixes, example_staypoints, tmp_path):
+        """Test if writing another model or number of buckets raises an error."""
+        ti.io.write_parquet_dataset(example_positionfixes, tmp_path)
+        with pytest.raises(ValueError, match="cannot write staypoints"):
+            ti.io.write_parquet_dataset(example_staypoints, tmp_path)
+        with pytest.raises(ValueError, match="with 8 buckets"):
+            ti.io.write_parquet_dataset(example_positionfixes, tmp_path, n_buckets=8)
+
+    def test_append_timezone_error(self, example_positionfixes, tmp_path):
+        """Test if appending data in another timezone raises an error."""
+        pfs = example_positionfixes
+        ti.io.write_parquet_dataset(pfs.iloc[:3], tmp_path)
+        pfs_utc = pfs.iloc[3:].copy()
+        pfs_utc["tracked_at"] = pfs_utc["tracked_at"].dt.tz_convert("UTC")
+        with pytest.raises(ValueError, match="stored in timezone Europe/Zurich"):
+            ti.io.write_parquet_dataset(pfs_utc, tmp_path)
+
+    def test_empty(self, example_positionfixes, tmp_path):
+        """Test if writing empty data raises a clear error."""
+        with pytest.raises(ValueError, match="Cannot write empty positionfixes"):
+            ti.io.write_parquet_dataset(example_positionfixes.iloc[:0], tmp_path)
+
+    def test_categorical_user_id(self, example_positionfixes, tmp_path):
+        """Test if categorical user ids are bucketed by their value and can be read by user."""
+        pfs = example_positionfixes
+        pfs.loc[pfs.index[:2], "user_id"] = 0
+        # as created by optimize_dtypes
+        pfs["user_id"] = pfs["user_id"].astype("category")
+        ti.io.write_parquet_dataset(pfs, tmp_path, n_buckets=4)
+        for user_id in [0, 1, 2]:
+            assert f"user_bucket={ti.io.parquet._user_bucket([user_id], 4)[0]}" in os.listdir(tmp_path)
+            pfs_read = ti.io.read_parquet_dataset(tmp_path, user_id=user_id)
+            pfs_user = pfs[pfs["user_id"] == user_id].astype({"user_id": "int64"})
+            assert_geodataframe_equal(pfs_user, pfs_read.sort_index())
+
+    def test_locations(self, tmp_path):
+        """Test if locations are partitioned by user only."""
+        file = os.path.join("tests", "data", "locations.csv")
+        locs = ti.read_locations_csv(file, sep=";", index_col="id", crs="EPSG:4326")
+        ti.io.write_parquet_dataset(locs, tmp_path)
+        locs_read = ti.io.read_parquet_dataset(tmp_path, user_id=1)
+        assert isinstance(locs_read, ti.Locations)
+        assert_geodataframe_equal(locs[locs["user_id"] == 1], locs_read.sort_index())
+
+    def test_tours(self, example_tours, tmp_path):
+        """Test if tours can be stored in a dataset."""
+        ti.io.write_parquet_dataset(example_tours, tmp_path)
+        tours_read = ti.io.read_parquet_dataset(tmp_path)
+        assert isinstance(tours_read, ti.Tours)
+        assert_frame_equal(example_tours, tours_read.sort_index())
+
+    def test_wrong_type(self, tmp_path):
+        """Test if writing a plain DataFrame raises a TypeError."""
+        with pytest.raises(TypeError, match="Can only write trackintel models"):
+            ti.io.write_parquet_dataset(pd.DataFrame({"user_id": [0]}), tmp_path)
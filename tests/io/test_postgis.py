@@ -1,14 +1,17 @@
 import datetime
 import os
+from functools import partial
 
 import geopandas as gpd
 from geopandas.testing import assert_geodataframe_equal
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import pytest
 import sqlalchemy
 from sqlalchemy import create_engine
 
+import shapely
 from shapely.geometry import LineString, MultiPoint, Point, Polygon
 
 import trackintel as ti
@@ -333,6 +336,83 @@ class TestPositionfixes:
         finally:
             del_table(conn, table)
 
+    def test_read_chunksize(self, example_positionfixes, conn_postgis):
+        """Test if chunksize returns a generator of validated positionfixes."""
+        pfs = example_positionfixes.copy()
+        conn_string, conn = conn_postgis
+        table = "positionfixes"
+        sql = f"SELECT * FROM {table} ORDER BY id"
+        geom_col = pfs.geometry.name
+        try:
+            pfs.as_positionfixes.to_postgis(table, conn_string)
+            chunks = ti.io.read_positionfixes_postgis(sql, conn_string, geom_col, index_col="id", chunksize=2)
+            chunks = list(chunks)
+            assert [len(c) for c in chunks] == [2, 1]
+            assert all(isinstance(c, ti.Positionfixes) for c in chunks)
+            assert_geodataframe_equal(pfs, pd.concat(chunks))
+        finally:
+            del_table(conn, table)
+
+    def test_read_chunksize_align_users(self, example_positionfixes, conn_postgis):
+        """Test if align_users keeps all rows of a user in the same chunk."""
+        pfs = example_positionfixes.copy()
+        conn_string, conn = conn_postgis
+        table = "positionfixes"
+        sql = f"SELECT * FROM {table} ORDER BY user_id, tracked_at"
+        geom_col = pfs.geometry.name
+        try:
+            pfs.as_positionfixes.to_postgis(table, conn_string)
+            engine = create_engine(conn_string)
+            chunks = ti.io.read_positionfixes_postgis(
+                sql, engine, geom_col, index_col="id", chunksize=1, align_users=True
+            )
+            chunks = list(chunks)
+            assert [c["user_id"].unique().tolist() for c in chunks] == [[0], [1]]
+            assert_geodataframe_equal(pfs, pd.concat(chunks))
+        finally:
+            del_table(conn, table)
+
+    def test_read_filters(self, example_positionfixes, conn_postgis):
+        """Test if user, time and bbox filters are applied in the database."""
+        pfs = example_positionfixes.copy()
+        conn_string, conn = conn_postgis
+        table = "positionfixes"
+        sql = f"SELECT * FROM {table}"
+        geom_col = pfs.geometry.name
+        try:
+            pfs.as_positionfixes.to_postgis(table, conn_string)
+            read = partial(ti.io.read_positionfixes_postgis, sql, conn_string, geom_col, index_col="id")
+            assert_geodataframe_equal(read(user_id=[0]), pfs.iloc[:2])
+            assert_geodataframe_equal(read(start="1971-01-01 05:00:00", end="1971-01-02"), pfs.iloc[[1]])
+            assert_geodataframe_equal(read(bbox=(8.4, 47.45, 8.6, 47.7)), pfs.iloc[1:])
+            assert_geodataframe_equal(read(bbox=Point(8.5067847, 47.4).buffer(0.01), crs=pfs.crs), pfs.iloc[[0]])
+            pfs_db = read(columns=[], user_id=1)
+            assert pfs_db.columns.tolist() == ["user_id", "tracked_at", geom_col]
+        finally:
+            del_table(conn, table)
+
+    def test_write_copy(self, example_positionfixes, conn_postgis):
+        """Test if the COPY bulk loader writes the same table as the default method."""
+        pfs = example_positionfixes.copy()
+        conn_string, conn = conn_postgis
+        table = "positionfixes"
+        sql = f"SELECT * FROM {table}"
+        geom_col = pfs.geometry.name
+        try:
+            pfs.as_positionfixes.to_postgis(table, conn_string, method="copy", chunksize=2)
+            assert get_tuple_count(conn, table) == len(pfs)
+            _, dtypes = get_table_schema(conn, table)
+            assert f"geometry(Point,{_get_srid(pfs)})" in dtypes
+            pfs_db = ti.io.read_positionfixes_postgis(sql, conn, geom_col, index_col="id")
+            assert_geodataframe_equal(pfs, pfs_db)
+        finally:
+            del_table(conn, table)
+
+    def test_write_invalid_method(self, example_positionfixes):
+        """Test if an unknown method raises a ValueError."""
+        with pytest.raises(ValueError, match="method must be either None or 'copy'"):
+            example_positionfixes.as_positionfixes.to_postgis("positionfixes", "sqlite://", method="multi")
+
 
 class TestTriplegs:
     def test_write(self, example_triplegs, conn_postgis):
@@ -534,6 +614,22 @@ class TestLocations:
         finally:
             del_table(conn, table)
 
+    def test_write_extent_copy(self, example_locations, conn_postgis):
+        """Test if the COPY bulk loader handles the extent geometry."""
+        conn_string, conn = conn_postgis
+        table = "locations"
+        sql = f"SELECT * FROM {table}"
+        coords = [[8.45, 47.6], [8.45, 47.4], [8.55, 47.4], [8.55, 47.6], [8.45, 47.6]]
+        example_locations["extent"] = gpd.GeoSeries([Polygon(coords)] * len(example_locations))
+        try:
+            example_locations.as_locations.to_postgis(table, conn_string, method="copy")
+            _, dtypes = get_table_schema(conn, table)
+            assert f"geometry(Polygon,{_get_srid(example_locations)})" in dtypes
+            locs_db = ti.io.read_locations_postgis(sql, conn, index_col="id", extent="extent")
+            assert_geodataframe_equal(example_locations, locs_db)
+        finally:
+            del_table(conn, table)
+
     def test_read_extent(self, example_locations, conn_postgis):
         """Test if extent geometry can be read correctly."""
         conn_string, conn = conn_postgis
@@ -726,6 +822,151 @@ class TestTours:
         finally:
             del_table(conn, table)
 
+    def test_trips_column_copy(self, example_tours, conn_postgis):
+        """Test if the COPY bulk loader serializes the list of trips as JSON."""
+        tours = example_tours
+        tours["trips"] = [[1 + i, 10 + i, 100 + i] for i in range(len(tours))]
+        conn_string, conn = conn_postgis
+        table = "tours"
+        sql = f"SELECT * FROM {table}"
+        try:
+            tours.as_tours.to_postgis(table, conn_string, method="copy")
+            tours_db = ti.io.read_tours_postgis(sql, conn, index_col="id")
+            assert_frame_equal(tours, tours_db)
+        finally:
+            del_table(conn, table)
+
+
+class TestFilterQuery:
+    def test_no_filter(self):
+        """Test if the query is not touched without filters."""
+        sql, params = ti.io.postgis._filter_query("SELECT * FROM pfs", None, None, ["user_id"])
+        assert sql == "SELECT * FROM pfs"
+        assert params is None
+
+    def test_named_params(self):
+        """Test if named parameters are generated for users, time and columns."""
+        sql, params = ti.io.postgis._filter_query(
+            "SELECT * FROM sp WHERE a = %(a)s;",
+            None,
+            {"a": 1},
+            ["user_id", "started_at", "finished_at"],
+            columns=["purpose"],
+            geom_col="geom",
+            index_col="id",
+            user_id=np.int64(3),
+            time_cols=["started_at", "finished_at"],
+            start="2021-01-01",
+            end=pd.Timestamp("2021-01-02", tz="Europe/Zurich"),
+        )
+        assert sql == (
+            'SELECT "id", "user_id", "started_at", "finished_at", "purpose", "geom" '
+            "FROM (SELECT * FROM sp WHERE a = %(a)s) AS ti_query "
+            'WHERE "user_id" = ANY(%(ti_param_1)s) AND "finished_at" >= %(ti_param_2)s '
+            'AND "started_at" < %(ti_param_3)s'
+        )
+        assert params["a"] == 1
+        assert params["ti_param_1"] == [3]
+        assert params["ti_param_2"] == datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+        assert params["ti_param_3"] == pd.Timestamp("2021-01-02", tz="Europe/Zurich")
+
+    def test_positional_params(self):
+        """Test if positional parameters are appended in the order of their placeholders."""
+        sql, params = ti.io.postgis._filter_query(
+            "SELECT * FROM pfs WHERE a = %s",
+            None,
+            (1,),
+            ["USER"],
+            geom_col="geom",
+            user_id=[1, 2],
+            bbox=(0, 1, 2, 3),
+            crs=4326,
+        )
+        assert sql.endswith('WHERE "USER" = ANY(%s) AND "geom" && ST_MakeEnvelope(%s, %s, %s, %s, %s)')
+        assert params == [1, [1, 2], 0.0, 1.0, 2.0, 3.0, 4326]
+
+    def test_escape_percent(self):
+        """Test if literal % of a query without parameters are escaped once placeholders are added."""
+        sql, params = ti.io.postgis._filter_query(
+            "SELECT * FROM pfs WHERE name LIKE 'a%'", None, None, ["user_id"], user_id=1
+        )
+        assert sql == (
+            "SELECT * FROM (SELECT * FROM pfs WHERE name LIKE 'a%%') AS ti_query "
+            'WHERE "user_id" = ANY(%(ti_param_0)s)'
+        )
+        assert params == {"ti_param_0": [1]}
+        # queries with parameters already escape literal %
+        sql, _ = ti.io.postgis._filter_query(
+            "SELECT * FROM pfs WHERE name LIKE 'a%%' AND a = %s", None, [2], ["user_id"], user_id=1
+        )
+        assert "LIKE 'a%%' AND a = %s)" in sql
+
+    def test_geometry(self):
+        """Test if a geometry is passed as WKB to ST_Intersects."""
+        polygon = Polygon([(0, 0), (1, 0), (1, 1)])
+        sql, params = ti.io.postgis._filter_query(
+            "SELECT * FROM locs", None, None, ["user_id"], geom_col="center", bbox=polygon, crs="EPSG:2056"
+        )
+        assert sql.endswith('WHERE ST_Intersects("center", ST_GeomFromWKB(%(ti_param_0)s, %(ti_param_1)s))')
+        assert shapely.from_wkb(params["ti_param_0"]).equals(polygon)
+        assert params["ti_param_1"] == 2056
+
+    def test_bbox_without_geometry(self):
+        """Test if a bbox filter without geometry column raises an error."""
+        with pytest.raises(ValueError, match="Filtering with a bbox requires a geometry column"):
+            ti.io.postgis._filter_query("SELECT * FROM trips", None, None, ["user_id"], bbox=(0, 0, 1, 1))
+
+
+class TestCopyBuffer:
+    def test_geometry(self, example_positionfixes):
+        """Test if the geometry is written as EWKB hex and the index as first column."""
+        pfs = example_positionfixes
+        buffer, columns = ti.io.postgis._copy_buffer(pfs, geom_col="geom", srid=4326)
+        assert columns == ["id", "user_id", "tracked_at", "geom"]
+        rows = pd.read_csv(buffer, header=None, names=columns)
+        assert rows["id"].tolist() == pfs.index.tolist()
+        geoms = gpd.GeoSeries.from_wkb(rows["geom"].map(bytes.fromhex), crs=pfs.crs)
+        assert geoms.geom_equals(pfs.geometry.reset_index(drop=True)).all()
+        assert rows["geom"].str.startswith("0101000020E6100000").all()  # point with srid 4326
+
+    def test_json(self, example_tours):
+        """Test if JSON columns are serialized and missing values are written as NULL."""
+        tours = example_tours
+        tours["trips"] = [[1, 2], np.array([3]), None]
+        buffer, columns = ti.io.postgis._copy_buffer(tours, index_label="tour_id", json_cols=["trips"])
+        assert columns == ["tour_id", "user_id", "started_at", "finished_at", "trips"]
+        lines = buffer.getvalue().splitlines()
+        assert lines[0].endswith(',"[1, 2]"')
+        assert lines[1].endswith(",[3]")
+        assert lines[2].endswith(",\\N")
+
+    def test_null_and_empty_string(self, example_positionfixes):
+        """Test if NULL values and empty strings are written differently."""
+        pfs = example_positionfixes
+        pfs["label"] = ["", None, "a"]
+        pfs["accuracy"] = [np.nan, 1.0, 2.0]
+        buffer, columns = ti.io.postgis._copy_buffer(pfs, geom_col="geom", srid=4326)
+        assert columns[-2:] == ["label", "accuracy"]
+        lines = buffer.getvalue().splitlines()
+        assert lines[0].endswith(",,\\N")  # empty string is not the NULL marker
+        assert lines[1].endswith(",\\N,1.0")
+        assert lines[2].endswith(",a,2.0")
+
+    def test_trips_tour_id(self, example_trips, monkeypatch):
+        """Test if the tour_id list column of trips is written as JSON."""
+        calls = []
+        monkeypatch.setattr(ti.io.postgis, "_copy_to_postgis", lambda df, *args: calls.append((df, args)))
+        trips = example_trips
+        trips["tour_id"] = [[1, 2], [], np.nan]
+        ti.io.write_trips_postgis(trips, "trips", None, method="copy")
+        df, (name, con, schema, if_exists, index, index_label, chunksize, dtype) = calls[0]
+        assert dtype["tour_id"] is sqlalchemy.types.JSON
+        buffer, _ = ti.io.postgis._copy_buffer(df, index, index_label, json_cols=["tour_id"])
+        lines = buffer.getvalue().splitlines()
+        assert lines[0].endswith(',"[1, 2]"')
+        assert lines[1].endswith(",[]")
+        assert lines[2].endswith(",\\N")
+
 
 class TestGetSrid:
     def test_srid(self, example_positionfixes):
@@ -738,6 +979,64 @@ class TestGetSrid:
         assert _get_srid(gdf) == srid
 
 
+class TestAlignUserChunks:
+    def test_split_users(self):
+        """Test if users spanning several chunks are merged into one chunk."""
+        df = pd.DataFrame({"user_id": [0, 0, 0, 1, 1, 2, 3, 3]})
+        chunks = [df.iloc[i : i + 2] for i in range(0, len(df), 2)]
+        aligned = list(ti.io.postgis._align_user_chunks(chunks, "user_id"))
+        assert [c["user_id"].tolist() for c in aligned] == [[0, 0, 0], [1, 1], [2], [3, 3]]
+        assert_frame_equal(pd.concat(aligned), df)
+
+    def test_single_user(self):
+        """Test if a single user is returned as one chunk."""
+        df = pd.DataFrame({"user_id": [5] * 5}, index=range(10, 15))
+        chunks = [df.iloc[i : i + 2] for i in range(0, len(df), 2)]
+        aligned = list(ti.io.postgis._align_user_chunks(chunks, "user_id"))
+        assert len(aligned) == 1
+        assert_frame_equal(aligned[0], df)
+
+    def test_empty(self):
+        """Test if no chunks are yielded for an empty query."""
+        assert list(ti.io.postgis._align_user_chunks([pd.DataFrame({"user_id": []})], "user_id")) == []
+
+
+class TestGetEngine:
+    def test_cached(self, tmp_path):
+        """Test if the same engine is returned for the same connection string."""
+        con_string = f"sqlite:///{tmp_path / 'db.sqlite'}"
+        try:
+            engine = ti.io.get_engine(con_string)
+            assert ti.io.get_engine(con_string) is engine
+            assert ti.io.get_engine(f"sqlite:///{tmp_path / 'other.sqlite'}") is not engine
+        finally:
+            ti.io.dispose_engines()
+
+    def test_kwargs(self, tmp_path):
+        """Test if passing engine arguments replaces the cached engine."""
+        con_string = f"sqlite:///{tmp_path / 'db.sqlite'}"
+        try:
+            engine = ti.io.get_engine(con_string)
+            new_engine = ti.io.get_engine(con_string, pool_size=2, max_overflow=0)
+            assert new_engine is not engine
+            assert new_engine.pool.size() == 2
+            assert ti.io.get_engine(con_string) is new_engine
+        finally:
+            ti.io.dispose_engines()
+
+    def test_dispose(self, tmp_path):
+        """Test if dispose_engines removes selected or all engines from the cache."""
+        con_string_1 = f"sqlite:///{tmp_path / 'db1.sqlite'}"
+        con_string_2 = f"sqlite:///{tmp_path / 'db2.sqlite'}"
+        engine_1 = ti.io.get_engine(con_string_1)
+        engine_2 = ti.io.get_engine(con_string_2)
+        ti.io.dispose_engines(con_string_1)
+        assert ti.io.get_engine(con_string_1) is not engine_1
+        assert ti.io.get_engine(con_string_2) is engine_2
+        ti.io.dispose_engines()
+        assert ti.io.postgis._engines == {}
+
+
 class Test_Handle_Con_String:
     def test_conn_string(self, conn_postgis):
         """Test if decorator opens a connection with connection string and closes it."""
@@ -760,3 +1059,29 @@ class Test_Handle_Con_String:
             assert con is conn
 
         wrapped(conn)
+
+    def test_generator(self):
+        """Test if decorator keeps the connection open until a returned generator is exhausted."""
+        connections = []
+
+        @ti.io.postgis._handle_con_string
+        def wrapped(con):
+            connections.append(con)
+            yield con.closed
+
+        assert list(wrapped("sqlite://")) == [False]
+        assert connections[0].closed
+
+    def test_engine_reuse(self, tmp_path):
+        """Test if repeated calls with a connection string check out connections of the same engine."""
+        con_string = f"sqlite:///{tmp_path / 'db.sqlite'}"
+
+        @ti.io.postgis._handle_con_string
+        def wrapped(con):
+            return con.engine
+
+        try:
+            assert wrapped(con_string) is wrapped(con_string)
+            assert wrapped(con_string).pool.checkedout() == 0
+        finally:
+            ti.io.dispose_engines()
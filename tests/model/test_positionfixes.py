@@ -3,6 +3,8 @@ import pytest
 import numpy as np
 
 import geopandas as gpd
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
 from shapely.geometry import LineString
 
 import trackintel as ti
@@ -57,3 +59,87 @@ class TestPositionfixes:
         accessor_result = pfs.as_positionfixes.calculate_distance_matrix(dist_metric="haversine", n_jobs=1)
         function_result = ti.geogr.distances.calculate_distance_matrix(pfs, dist_metric="haversine", n_jobs=1)
         assert np.allclose(accessor_result, function_result)
+
+
+@pytest.fixture
+def compact_geolife():
+    """Read geolife test data and convert it into CompactPositionfixes."""
+    pfs, _ = ti.io.dataset_reader.read_geolife(os.path.join("tests", "data", "geolife_long"))
+    return pfs, pfs.to_compact()
+
+
+class TestCompactPositionfixes:
+    """Tests for the CompactPositionfixes class."""
+
+    def test_from_positionfixes(self, compact_geolife):
+        """Test if the geometry is replaced by float coordinates and categorical users."""
+        pfs, cpfs = compact_geolife
+        assert isinstance(cpfs, ti.CompactPositionfixes)
+        assert "geom" not in cpfs.columns
+        assert isinstance(cpfs["user_id"].dtype, pd.CategoricalDtype)
+        assert cpfs.crs == pfs.crs
+        assert np.array_equal(cpfs["x"].to_numpy(), pfs.geometry.x.to_numpy())
+        assert np.array_equal(cpfs["y"].to_numpy(), pfs.geometry.y.to_numpy())
+
+    def test_roundtrip(self, compact_geolife):
+        """Test if the conversion back to Positionfixes recovers the original data."""
+        pfs, cpfs = compact_geolife
+        back = cpfs.to_positionfixes()
+        assert isinstance(back, ti.Positionfixes)
+        assert_frame_equal(back, pfs[back.columns])
+
+    def test_keep_crs(self, compact_geolife):
+        """Test if the crs is kept by pandas operations."""
+        _, cpfs = compact_geolife
+        assert isinstance(cpfs.iloc[:5], ti.CompactPositionfixes)
+        assert cpfs.iloc[:5].crs == cpfs.crs
+        assert cpfs.sort_values("tracked_at").crs == cpfs.crs
+
+    def test_validate_columns(self, compact_geolife):
+        """Test if the required columns are checked."""
+        _, cpfs = compact_geolife
+        with pytest.raises(AttributeError, match="compact positionfixes, it must have the properties"):
+            ti.CompactPositionfixes(cpfs.drop(columns="x"))
+
+    def test_validate_coordinates(self, compact_geolife):
+        """Test if non finite coordinates are only detected with validation level 'full'."""
+        _, cpfs = compact_geolife
+        cpfs = cpfs.copy()
+        cpfs.loc[cpfs.index[0], "x"] = np.nan
+        with pytest.raises(AssertionError, match="Not all coordinates are finite"):
+            ti.CompactPositionfixes(cpfs)
+        ti.set_validation_level("schema")
+        try:
+            ti.CompactPositionfixes(cpfs)
+        finally:
+            ti.set_validation_level("full")
+
+    def test_generate_staypoints(self, compact_geolife):
+        """Test if staypoints from CompactPositionfixes equal those from Positionfixes."""
+        pfs, cpfs = compact_geolife
+        pfs, sp = pfs.generate_staypoints()
+        cpfs, sp_compact = cpfs.generate_staypoints()
+        assert isinstance(cpfs, ti.CompactPositionfixes)
+        # categorical user_id is kept
+        assert sp_compact["user_id"].dtype == cpfs["user_id"].dtype
+        assert_frame_equal(sp, sp_compact.astype({"user_id": sp["user_id"].dtype}))
+        assert_series_equal(pfs["staypoint_id"], cpfs["staypoint_id"])
+
+    def test_generate_triplegs(self, compact_geolife):
+        """Test if triplegs from CompactPositionfixes equal those from Positionfixes."""
+        pfs, cpfs = compact_geolife
+        pfs, _ = pfs.generate_staypoints()
+        cpfs, _ = cpfs.generate_staypoints()
+        pfs, tpls = pfs.generate_triplegs()
+        cpfs, tpls_compact = cpfs.generate_triplegs()
+        assert_frame_equal(tpls, tpls_compact)
+        assert_series_equal(pfs["tripleg_id"], cpfs["tripleg_id"])
+
+    def test_get_kinematics(self, compact_geolife):
+        """Test if the kinematics are computed on the coordinate columns."""
+        pfs, cpfs = compact_geolife
+        pfs = pfs.get_kinematics()
+        cpfs = cpfs.get_kinematics()
+        assert isinstance(cpfs, ti.CompactPositionfixes)
+        for c in ["speed", "acceleration", "bearing", "turning_angle"]:
+            assert_series_equal(pfs[c], cpfs[c])
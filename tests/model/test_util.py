@@ -1,7 +1,11 @@
+import logging
+
+import numpy as np
 import pandas as pd
 import pytest
-from geopandas import GeoDataFrame
-from shapely.geometry import Point
+from geopandas import GeoDataFrame, GeoSeries, points_from_xy
+from pandas.testing import assert_frame_equal
+from shapely.geometry import Point, Polygon
 
 import trackintel as ti
 from trackintel.model.util import (
@@ -11,6 +15,11 @@ from trackintel.model.util import (
     _wrapped_gdf_method,
     TrackintelGeoDataFrame,
     TrackintelDataFrame,
+    _options,
+    _validate_geometries,
+    optimize_dtypes,
+    get_user_time_index,
+    _sort_by_user,
 )
 
 
@@ -176,6 +185,63 @@ class TestNonCachedAccessor:
         assert A.nca == foo  # class object
         assert a.nca == a  # class instance
 
+    def test_not_cached(self, example_positionfixes):
+        """Test if every access constructs a new object."""
+        pfs = GeoDataFrame(example_positionfixes)
+        assert pfs.as_positionfixes is not pfs.as_positionfixes
+        assert "_trackintel_accessor_cache" not in pfs.__dict__
+
+    def test_validation_cached(self, example_positionfixes, monkeypatch):
+        """Test if the geometries are only scanned on the first access."""
+        pfs = GeoDataFrame(example_positionfixes)
+        pfs.as_positionfixes
+        monkeypatch.setattr(GeoSeries, "is_valid", property(lambda self: pytest.fail("geometries scanned again")))
+        pfs.as_positionfixes
+
+    def test_inplace_values(self, example_positionfixes):
+        """Test if values overwritten in place are reflected and validated again."""
+        pfs = GeoDataFrame(example_positionfixes)
+        pfs.as_positionfixes
+        pfs.loc[pfs.index[0], "user_id"] = 5
+        assert pfs.as_positionfixes["user_id"].iloc[0] == 5
+        pfs["tracked_at"] = pfs["tracked_at"].dt.tz_localize(None)
+        with pytest.raises(AssertionError, match="dtype of tracked_at"):
+            pfs.as_positionfixes
+
+    def test_inplace_geometry(self, example_positionfixes):
+        """Test if geometries overwritten in place are reflected."""
+        pfs = GeoDataFrame(example_positionfixes)
+        pfs.as_positionfixes
+        pfs.loc[pfs.index[0], "geometry"] = Point(50, 50)
+        assert pfs.as_positionfixes.geometry.iloc[0] == Point(50, 50)
+        pfs.loc[pfs.index[0], "geometry"] = Polygon([(0, 0), (0, 1), (1, 0)])
+        with pytest.raises(TypeError, match="The geometry must be a Point"):
+            pfs.as_positionfixes
+
+    def test_changed_instance(self, example_positionfixes):
+        """Test if changes of the DataFrame are validated."""
+        pfs = GeoDataFrame(example_positionfixes)
+        pfs.as_positionfixes
+        pfs["new"] = 1
+        assert "new" in pfs.as_positionfixes.columns
+        pfs.drop(columns="user_id", inplace=True)
+        with pytest.raises(AttributeError, match="To process a DataFrame as a collection of positionfixes"):
+            pfs.as_positionfixes
+
+    def test_no_geometry(self):
+        """Test accessor of DataFrame without geometry."""
+        t = pd.Timestamp("1971-01-01 00:00:00", tz="utc")
+        df = pd.DataFrame(
+            {
+                "user_id": [0],
+                "started_at": [t],
+                "finished_at": [t],
+                "origin_staypoint_id": [0],
+                "destination_staypoint_id": [1],
+            }
+        )
+        assert isinstance(df.as_trips, ti.TripsDataFrame)
+
 
 class Test_register_trackintel_accessor:
     """Test if accessors are correctly registered."""
@@ -208,6 +274,93 @@ class Test_register_trackintel_accessor:
         del pd.DataFrame.foo
 
 
+@pytest.fixture
+def validation_level(monkeypatch):
+    """Reset the validation level after the test."""
+    monkeypatch.setitem(_options, "validation_level", _options["validation_level"])
+
+
+@pytest.mark.usefixtures("validation_level")
+class TestValidationLevel:
+    """Test `set_validation_level` and `get_validation_level`."""
+
+    def test_default(self):
+        """Test that the full validation is the default."""
+        assert ti.get_validation_level() == "full"
+
+    def test_set(self):
+        """Test if the level is set."""
+        ti.set_validation_level("schema")
+        assert ti.get_validation_level() == "schema"
+
+    def test_unknown_level(self):
+        """Test if an unknown level raises a ValueError."""
+        with pytest.raises(ValueError, match="level must be one of"):
+            ti.set_validation_level("partial")
+
+    def test_schema(self, example_positionfixes):
+        """Test that schema validation skips the geometry scan but checks the columns."""
+        geometry = example_positionfixes.geometry.copy()
+        geometry.iloc[0] = Point(float("nan"), 0)
+        example_positionfixes["geometry"] = geometry
+        with pytest.raises(AssertionError, match="Not all geometries are valid"):
+            ti.Positionfixes(example_positionfixes)
+        ti.set_validation_level("schema")
+        ti.Positionfixes(example_positionfixes)
+        with pytest.raises(AttributeError):
+            ti.Positionfixes(example_positionfixes.drop(columns="user_id"))
+
+    def test_off(self, example_positionfixes):
+        """Test that no checks run if validation is off."""
+        ti.set_validation_level("off")
+        ti.Positionfixes(example_positionfixes.drop(columns="user_id"))
+
+
+@pytest.mark.usefixtures("validation_level")
+class Test_validate_geometries:
+    """Test `_validate_geometries` function."""
+
+    def test_cached(self, example_positionfixes, monkeypatch):
+        """Test that the geometries are only scanned once."""
+        pfs = ti.Positionfixes(example_positionfixes)
+        monkeypatch.setattr(GeoSeries, "is_valid", property(lambda self: pytest.fail("geometries scanned again")))
+        _validate_geometries(pfs)
+        ti.Positionfixes(pfs)
+        pfs.copy()
+
+    def test_new_geometries(self, example_positionfixes):
+        """Test that replaced geometries are scanned again."""
+        pfs = ti.Positionfixes(example_positionfixes)
+        geometry = pfs.geometry.copy()
+        geometry.iloc[0] = Point(float("nan"), 0)
+        pfs["geometry"] = geometry
+        with pytest.raises(AssertionError, match="Not all geometries are valid"):
+            _validate_geometries(pfs)
+
+    def test_inplace_write(self, example_positionfixes):
+        """Test that geometries overwritten in place are only scanned again after assigning a new column."""
+        pfs = ti.Positionfixes(example_positionfixes)
+        pfs.loc[0, "geometry"] = Point(float("nan"), 0)
+        _validate_geometries(pfs)  # same geometry array -> not scanned again
+        pfs["geometry"] = pfs["geometry"].copy()
+        with pytest.raises(AssertionError, match="Not all geometries are valid"):
+            _validate_geometries(pfs)
+
+    def test_geometry_array_unchanged(self, example_positionfixes):
+        """Test that the result is kept on the DataFrame and not on the geometry array."""
+        values = example_positionfixes.geometry.values
+        _validate_geometries(example_positionfixes)
+        assert values.__dict__.keys() == GeoSeries([Point(0, 0)]).values.__dict__.keys()
+
+    def test_not_full(self, example_positionfixes):
+        """Test that invalid geometries are not scanned below level 'full'."""
+        pfs = GeoDataFrame(example_positionfixes)
+        pfs["geometry"] = GeoSeries([Point(float("nan"), 0)] * len(pfs), index=pfs.index, crs=pfs.crs)
+        ti.set_validation_level("schema")
+        _validate_geometries(pfs)
+        assert "_trackintel_valid_geometries" not in pfs.__dict__
+
+
 class TestDoc:
     """Test doc decorator"""
 
@@ -260,3 +413,161 @@ class TestDoc:
 
         foo = doc(foo)(foo)
         assert foo.__doc__ == ""
+
+
+@pytest.fixture
+def example_triplegs_dtypes():
+    """Triplegs with int64 ids and object labels."""
+    t = pd.Timestamp("1971-01-01 00:00:00", tz="utc")
+    g = GeoSeries.from_wkt(["LINESTRING (0 0, 1 1)"] * 4, crs="EPSG:4326")
+    tpls = GeoDataFrame(
+        {
+            "user_id": [0, 0, 1, 1],
+            "started_at": [t, t + pd.Timedelta("1min"), t, t + pd.Timedelta("1h")],
+            "finished_at": [t + pd.Timedelta("1min"), t + pd.Timedelta("2min"), t + pd.Timedelta("1ms"), t],
+            "trip_id": pd.array([0, 1, None, 1000], dtype="Int64"),
+            "mode": ["walk", "walk", "car", "walk"],
+            "note": ["a", "b", "c", "d"],
+            "speed": [1.5, 2.0, 10.0, 1.0],
+        },
+        geometry=g,
+    )
+    return ti.Triplegs(tpls.rename_geometry("geom"))
+
+
+class TestOptimizeDtypes:
+    """Test `optimize_dtypes`."""
+
+    def test_dtypes(self, example_triplegs_dtypes):
+        """Test the conversion of each kind of column."""
+        tpls = optimize_dtypes(example_triplegs_dtypes)
+        assert tpls["user_id"].dtype == "category"
+        assert tpls["mode"].dtype == "category"
+        assert tpls["note"].dtype == object  # only unique values
+        assert tpls["trip_id"].dtype == "Int16"
+        assert tpls["started_at"].dtype == "datetime64[s, UTC]"
+        assert tpls["finished_at"].dtype == "datetime64[ms, UTC]"
+        assert tpls["speed"].dtype == "float64"
+
+    def test_values(self, example_triplegs_dtypes):
+        """Test that the values and the class are unchanged."""
+        tpls = example_triplegs_dtypes.optimize_dtypes()
+        assert isinstance(tpls, ti.Triplegs)
+        for col in tpls.columns:
+            assert tpls[col].equals(example_triplegs_dtypes[col].astype(tpls[col].dtype))
+            assert (tpls[col].isna() == example_triplegs_dtypes[col].isna()).all()
+
+    def test_input_unchanged(self, example_triplegs_dtypes):
+        """Test that the input is not modified."""
+        dtypes = example_triplegs_dtypes.dtypes.copy()
+        example_triplegs_dtypes.optimize_dtypes()
+        assert example_triplegs_dtypes.dtypes.equals(dtypes)
+
+    def test_categorical_threshold(self, example_triplegs_dtypes):
+        """Test that categorical_threshold controls the conversion of string columns."""
+        tpls = optimize_dtypes(example_triplegs_dtypes, categorical_threshold=0.4)
+        assert tpls["mode"].dtype == object
+        tpls = optimize_dtypes(example_triplegs_dtypes, categorical_threshold=1)
+        assert tpls["note"].dtype == "category"
+
+    def test_verbose(self, example_triplegs_dtypes, caplog, capsys):
+        """Test that the memory usage is logged and not printed."""
+        with caplog.at_level(logging.INFO):
+            optimize_dtypes(example_triplegs_dtypes, verbose=True)
+        assert "Memory usage" in caplog.text
+        assert capsys.readouterr().out == ""
+
+
+@pytest.fixture
+def unsorted_positionfixes():
+    """Positionfixes of three users in random order."""
+    rng = np.random.default_rng(0)
+    n = 30
+    t = pd.Timestamp("1971-01-01", tz="utc") + pd.to_timedelta(rng.integers(0, 10, n), unit="h")
+    pfs = GeoDataFrame(
+        {"user_id": rng.choice(["b", "a", "c"], n), "tracked_at": t},
+        geometry=points_from_xy(rng.random(n), rng.random(n)),
+        crs="EPSG:4326",
+    )
+    pfs.index = rng.permutation(n)
+    pfs.index.name = "id"
+    return ti.Positionfixes(pfs)
+
+
+class TestGetUserTimeIndex:
+    """Test get_user_time_index and the methods on the trackintel classes."""
+
+    def test_same_as_sort_values(self, unsorted_positionfixes):
+        """Test if the order is the same as a stable sort_values and the offsets split the users."""
+        pfs = unsorted_positionfixes
+        index = get_user_time_index(pfs)
+        assert_frame_equal(pfs.take(index.order), pfs.sort_values(["user_id", "tracked_at"]))
+        assert index.user_ids.to_list() == ["a", "b", "c"]
+        assert index.offsets[-1] == len(pfs)
+
+    def test_categorical(self, unsorted_positionfixes):
+        """Test if categorical users are sorted by the order of the categories."""
+        pfs = unsorted_positionfixes
+        pfs["user_id"] = pfs["user_id"].astype(pd.CategoricalDtype(["c", "b", "a"]))
+        index = get_user_time_index(pfs)
+        assert_frame_equal(pfs.take(index.order), pfs.sort_values(["user_id", "tracked_at"]))
+        assert index.user_ids.to_list() == ["c", "b", "a"]
+
+    def test_cache(self, unsorted_positionfixes):
+        """Test if the index is reused as long as the table is unchanged."""
+        pfs = unsorted_positionfixes
+        index = pfs.user_time_index
+        assert pfs.user_time_index is index
+        pfs["tracked_at"] = pfs["tracked_at"][::-1].to_numpy()
+        assert pfs.user_time_index is not index
+        assert_frame_equal(pfs.take(pfs.user_time_index.order), pfs.sort_values(["user_id", "tracked_at"]))
+
+    def test_cache_inplace_change(self, unsorted_positionfixes):
+        """Test if values changed in place invalidate the cached index."""
+        pfs = unsorted_positionfixes
+        index = pfs.user_time_index
+        # change the values without replacing the column
+        pfs["user_id"].to_numpy()[: len(pfs) // 2] = "d"
+        assert pfs.user_time_index is not index
+        assert_frame_equal(pfs.take(pfs.user_time_index.order), pfs.sort_values(["user_id", "tracked_at"]))
+
+    def test_cache_no_sort(self, unsorted_positionfixes, monkeypatch):
+        """Test if reusing the cached index does not compute the sort keys."""
+        pfs = unsorted_positionfixes
+        index = pfs.user_time_index
+        monkeypatch.setattr(ti.model.util, "_sort_key", lambda col: pytest.fail("sort key computed again"))
+        assert pfs.user_time_index is index
+
+    def test_cache_categories_reordered(self, unsorted_positionfixes):
+        """Test if reordering the categories of the users invalidates the cached index."""
+        pfs = unsorted_positionfixes
+        pfs["user_id"] = pfs["user_id"].astype("category")
+        index = pfs.user_time_index
+        pfs["user_id"] = pfs["user_id"].cat.reorder_categories(["c", "b", "a"])
+        assert pfs.user_time_index is not index
+        assert pfs.user_time_index.user_ids.to_list() == ["c", "b", "a"]
+
+    def test_not_cached_on_dataframe(self, unsorted_positionfixes):
+        """Test if the index is only cached on trackintel classes."""
+        df = pd.DataFrame(unsorted_positionfixes)
+        index = get_user_time_index(df)
+        assert get_user_time_index(df) is not index
+        assert "_trackintel_user_time_index" not in df.__dict__
+        sorted_df = _sort_by_user(unsorted_positionfixes.copy())
+        assert_frame_equal(sorted_df, unsorted_positionfixes.sort_values(["user_id", "tracked_at"]))
+        assert "_trackintel_user_time_index" not in sorted_df.__dict__
+
+    def test_user_slice(self, unsorted_positionfixes):
+        """Test if user_slice returns the rows of the user sorted by time."""
+        pfs = unsorted_positionfixes
+        pfs_user = pfs.user_slice("b")
+        assert isinstance(pfs_user, ti.Positionfixes)
+        assert_frame_equal(pfs_user, pfs[pfs["user_id"] == "b"].sort_values("tracked_at", kind="stable"))
+        with pytest.raises(KeyError):
+            pfs.user_slice("unknown")
+
+    def test_empty(self, unsorted_positionfixes):
+        """Test if empty tables have no users."""
+        index = get_user_time_index(unsorted_positionfixes.iloc[:0])
+        assert len(index.order) == len(index.user_ids) == 0
+        assert index.offsets.tolist() == [0]
@@ -0,0 +1,195 @@
+import functools
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import trackintel as ti
+from trackintel.preprocessing import LazyPipeline
+
+
+@pytest.fixture
+def geolife_pfs():
+    """Read geolife_long positionfixes."""
+    pfs, _ = ti.io.dataset_reader.read_geolife(os.path.join("tests", "data", "geolife_long"))
+    return pfs
+
+
+def _eager_chain(pfs):
+    """Run the full chain with parameters that generate tours."""
+    pfs, sp = pfs.generate_staypoints(dist_threshold=25, time_threshold=5)
+    sp = sp.create_activity_flag(time_threshold=5)
+    pfs, tpls = pfs.generate_triplegs(sp)
+    sp, tpls, trips = ti.preprocessing.generate_trips(sp, tpls)
+    trips, tours = trips.generate_tours(max_dist=1000)
+    return {"positionfixes": pfs, "staypoints": sp, "triplegs": tpls, "trips": trips, "tours": tours}
+
+
+def _lazy_chain(pipeline):
+    """Record the full chain with parameters that generate tours."""
+    return (
+        pipeline.generate_staypoints(dist_threshold=25, time_threshold=5)
+        .create_activity_flag(time_threshold=5)
+        .generate_triplegs()
+        .generate_trips()
+        .generate_tours(max_dist=1000)
+    )
+
+
+class TestLazyPipeline:
+    """Tests for the LazyPipeline class."""
+
+    def test_collect(self, geolife_pfs):
+        """Test if the pipeline returns the same tables as the eager chain."""
+        tables = _lazy_chain(geolife_pfs.lazy()).collect()
+        expected = _eager_chain(geolife_pfs)
+        assert tables.keys() == expected.keys()
+        assert len(tables["tours"]) > 0
+        for name, table in expected.items():
+            assert_frame_equal(tables[name], table)
+
+    def test_lazy(self, geolife_pfs, monkeypatch):
+        """Test that nothing runs before collect."""
+
+        def raise_error(*args, **kwargs):
+            raise AssertionError("stage was run")
+
+        monkeypatch.setattr(ti.preprocessing, "generate_staypoints", raise_error)
+        pipeline = geolife_pfs.lazy().generate_staypoints()
+        with pytest.raises(AssertionError, match="stage was run"):
+            pipeline.collect()
+
+    def test_filter(self, geolife_pfs):
+        """Test if the filters are applied to the positionfixes."""
+        start, end = pd.Timestamp("2008-10-23 04:00", tz="utc"), "2008-10-24 05:00"
+        tables = _lazy_chain(geolife_pfs.lazy().filter(user_id=1, start=start, end=end)).collect()
+        filtered = geolife_pfs[
+            (geolife_pfs["user_id"] == 1)
+            & (geolife_pfs["tracked_at"] >= start)
+            & (geolife_pfs["tracked_at"] < pd.Timestamp(end, tz="utc"))
+        ]
+        expected = _eager_chain(filtered)
+        assert len(tables["tours"]) > 0
+        for name, table in expected.items():
+            assert_frame_equal(tables[name], table)
+
+    def test_locations(self, geolife_pfs, monkeypatch):
+        """Test if the staypoints with locations are passed to generate_tours with use_locations."""
+        calls = []
+        generate_tours = ti.preprocessing.generate_tours
+
+        def spy(trips, staypoints=None, **kwargs):
+            calls.append(staypoints)
+            return generate_tours(trips, staypoints=staypoints, **kwargs)
+
+        monkeypatch.setattr(ti.preprocessing, "generate_tours", spy)
+        pipeline = (
+            geolife_pfs.lazy()
+            .generate_staypoints(dist_threshold=25, time_threshold=5)
+            .create_activity_flag(time_threshold=5)
+            .generate_locations(epsilon=100, num_samples=1)
+            .generate_triplegs()
+            .generate_trips()
+        )
+        tables = pipeline.generate_tours(use_locations=True).collect()
+        assert isinstance(tables["locations"], ti.Locations)
+        assert len(tables["tours"]) > 0
+        assert_frame_equal(calls[0], tables["staypoints"])
+        pipeline.generate_tours().collect()
+        assert calls[1] is None
+
+    def test_combine_filters(self, geolife_pfs):
+        """Test if multiple filters are combined."""
+        pipeline = geolife_pfs.lazy().filter(user_id=[0, 1], start="2008-10-23").filter(user_id=[1, 2], start="2008")
+        assert pipeline._filters == {"user_id": [1], "start": pd.Timestamp("2008-10-23", tz="utc"), "end": None}
+
+    def test_empty_user_filter(self, geolife_pfs):
+        """Test if filters without a common user raise an error."""
+        with pytest.raises(ValueError, match="contain no user"):
+            geolife_pfs.lazy().filter(user_id=1).filter(user_id=0)
+        with pytest.raises(ValueError, match="contain no user"):
+            geolife_pfs.lazy().filter(user_id=[])
+
+    def test_no_match(self, geolife_pfs):
+        """Test if a clear error is raised if no positionfixes match the filters."""
+        pipeline = geolife_pfs.lazy().filter(user_id=1, start="2020").generate_staypoints()
+        with pytest.raises(ValueError, match="No positionfixes match the filters of the pipeline"):
+            pipeline.collect()
+
+        def reader(user_id=None, start=None, end=None):
+            return ti.Positionfixes(geolife_pfs[geolife_pfs["user_id"].isin(user_id)])
+
+        pipeline = LazyPipeline.read(reader).filter(user_id=100)
+        with pytest.raises(ValueError, match="No positionfixes match the filters of the pipeline"):
+            pipeline.collect()
+        assert ti.get_validation_level() == "full"
+
+    def test_immutable(self, geolife_pfs):
+        """Test that recording a stage returns a new pipeline."""
+        pipeline = geolife_pfs.lazy()
+        pipeline.filter(user_id=1).generate_staypoints()
+        assert pipeline._stages == []
+        assert pipeline._filters["user_id"] is None
+
+    def test_pushdown(self, geolife_pfs):
+        """Test if the filters are passed to readers that support them."""
+        calls = []
+
+        def reader(path, user_id=None, start=None, end=None):
+            calls.append({"path": path, "user_id": user_id, "start": start, "end": end})
+            return geolife_pfs[geolife_pfs["user_id"].isin(user_id)]
+
+        pipeline = LazyPipeline.read(reader, "path").filter(user_id=1, end="2009").generate_staypoints()
+        assert "pushed down into reader" in pipeline.explain()
+        tables = pipeline.collect()
+        assert calls == [{"path": "path", "user_id": [1], "start": None, "end": pd.Timestamp("2009", tz="utc")}]
+        assert (tables["staypoints"]["user_id"] == 1).all()
+
+    def test_pushdown_chunks(self, geolife_pfs):
+        """Test if the chunks of a reader that filters itself are concatenated."""
+
+        def reader(path, chunksize=None, user_id=None, start=None, end=None):
+            pfs = geolife_pfs[geolife_pfs["user_id"].isin(user_id)]
+            return (ti.Positionfixes(pfs.iloc[i : i + chunksize]) for i in range(0, len(pfs), chunksize))
+
+        pipeline = LazyPipeline.read(functools.partial(reader, chunksize=1000), "path").filter(user_id=1)
+        assert "pushed down into reader" in pipeline.explain()
+        pfs = pipeline.collect()["positionfixes"]
+        assert_frame_equal(pfs, geolife_pfs[geolife_pfs["user_id"] == 1])
+
+    def test_chunks(self, geolife_pfs, tmp_path):
+        """Test if readers with chunksize are filtered per chunk."""
+        path = os.path.join(tmp_path, "pfs.csv")
+        geolife_pfs.to_csv(path)
+        pipeline = LazyPipeline.read(ti.io.read_positionfixes_csv, path, index_col="id", chunksize=1000)
+        pipeline = pipeline.filter(user_id=1)
+        assert "per chunk" in pipeline.explain()
+        pfs = pipeline.collect()["positionfixes"]
+        expected = ti.io.read_positionfixes_csv(path, index_col="id")
+        assert_frame_equal(pfs, expected[expected["user_id"] == 1])
+
+    def test_collect_tables(self, geolife_pfs):
+        """Test if only the stages for the requested tables are run."""
+        pipeline = _lazy_chain(geolife_pfs.lazy())
+        tables = pipeline.collect("staypoints")
+        assert list(tables) == ["positionfixes", "staypoints"]
+        with pytest.raises(ValueError, match="does not create the tables"):
+            pipeline.collect("locations")
+
+    def test_validation_level(self, geolife_pfs):
+        """Test that the validation level is restored after collect."""
+        _lazy_chain(geolife_pfs.lazy()).collect()
+        assert ti.get_validation_level() == "full"
+
+    def test_stage_order(self, geolife_pfs):
+        """Test if stages in the wrong order or without the required stages raise an error."""
+        pipeline = geolife_pfs.lazy().generate_staypoints()
+        with pytest.raises(ValueError, match="requires the stages"):
+            pipeline.generate_trips()
+        with pytest.raises(ValueError, match="is already part of the pipeline"):
+            pipeline.generate_staypoints()
+        with pytest.raises(ValueError, match="has to be added before"):
+            pipeline.generate_triplegs().create_activity_flag()
+        with pytest.raises(ValueError, match="use_locations requires"):
+            pipeline.create_activity_flag().generate_triplegs().generate_trips().generate_tours(use_locations=True)
@@ -192,6 +192,15 @@ class TestGenerate_staypoints:
         assert pfs["staypoint_id"].dtype == "Int64"
         assert sp.index.dtype == "int64"
 
+    def test_dtype_compact(self):
+        """Test if categorical user_id and the time unit of the positionfixes are kept."""
+        pfs, _ = ti.io.dataset_reader.read_geolife(os.path.join("tests", "data", "geolife_long"))
+        pfs = pfs.optimize_dtypes()
+        pfs, sp = pfs.generate_staypoints(method="sliding", dist_threshold=25, time_threshold=5)
+        assert sp["user_id"].dtype == pfs["user_id"].dtype == "category"
+        assert sp["started_at"].dtype == sp["finished_at"].dtype == pfs["tracked_at"].dtype
+        assert sp["started_at"].dt.unit == "s"
+
     def test_index_start(self, geolife_pfs_sp_long):
         """Test the generated index start from 0 for different methods."""
         _, sp = geolife_pfs_sp_long
@@ -600,6 +600,30 @@ class TestMergeStaypoints:
         assert sp.loc[7, "geom"] == merged_sp.loc[7, "geom"]
         assert sp.loc[2, "geom"] == merged_sp.loc[2, "geom"]
 
+    def test_merge_staypoints_dtypes(self, example_staypoints_merge):
+        """Test if the dtypes of the input staypoints are kept."""
+        sp, tpls = example_staypoints_merge
+        merged_sp = sp.merge_staypoints(tpls)
+        assert (merged_sp.dtypes == sp[merged_sp.columns].dtypes).all()
+        sp = sp.optimize_dtypes()
+        merged_sp = sp.merge_staypoints(tpls)
+        assert (merged_sp.dtypes == sp[merged_sp.columns].dtypes).all()
+        assert merged_sp["user_id"].dtype == "category"
+        assert merged_sp.index.dtype == sp.index.dtype
+
+    def test_merge_staypoints_agg_dtypes(self, example_staypoints_merge):
+        """Test if the dtypes of the columns aggregated with "first" or "last" are kept."""
+        sp, tpls = example_staypoints_merge
+        sp["is_activity"] = True
+        sp["n_pfs"] = np.arange(len(sp), dtype="int32")
+        sp["purpose"] = "work"
+        agg = {"is_activity": "first", "n_pfs": "last", "purpose": "first"}
+        merged_sp = sp.merge_staypoints(tpls, agg=agg)
+        assert merged_sp["is_activity"].dtype == bool
+        assert merged_sp["n_pfs"].dtype == "int32"
+        assert merged_sp["purpose"].dtype == object
+        assert merged_sp.loc[7, "n_pfs"] == sp.loc[80, "n_pfs"]
+
     def test_merge_staypoints_error(self, example_staypoints_merge):
         sp, tpls = example_staypoints_merge
         sp.drop(columns=["location_id"], inplace=True)
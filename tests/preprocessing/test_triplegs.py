@@ -177,6 +177,14 @@ class TestGenerate_trips:
         assert sp["next_trip_id"].dtype == "Int64"
         assert tpls["trip_id"].dtype == "Int64"
 
+    def test_generate_trips_dtype_compact(self, example_triplegs):
+        """Test if categorical user_id and the time unit of the input are kept."""
+        sp, tpls = example_triplegs
+        sp, tpls = sp.optimize_dtypes(), tpls.optimize_dtypes()
+        sp, tpls, trips = generate_trips(sp, tpls, gap_threshold=15)
+        assert trips["user_id"].dtype == tpls["user_id"].dtype == "category"
+        assert trips["started_at"].dtype == trips["finished_at"].dtype == tpls["started_at"].dtype
+
     def test_compare_to_old_trip_function(self, example_triplegs):
         """Test if we can generate the example trips based on example data."""
         sp, tpls = example_triplegs
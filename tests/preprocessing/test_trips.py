@@ -1,9 +1,11 @@
 import os
+import numpy as np
 import pandas as pd
 import pytest
 from shapely.geometry import MultiPoint, Point
 import geopandas as gpd
 from geopandas.testing import assert_geodataframe_equal
+from pandas.testing import assert_frame_equal
 
 import trackintel as ti
 
@@ -336,3 +338,19 @@ class TestTourHelpers:
             # check that all trips belong to the tour
             for i, id in enumerate(trips_on_tour["trip_id"]):
                 assert id in list(tours.loc[tour_id, "trips"])
+
+    def test_get_tour_trip_relation(self, example_nested_tour):
+        """Test if the relation table contains every trip of the tours in order."""
+        _, tours = ti.preprocessing.trips.generate_tours(example_nested_tour)
+        relation = ti.preprocessing.trips.get_tour_trip_relation(tours)
+        assert relation.columns.to_list() == ["tour_id", "trip_id"]
+        assert relation["trip_id"].dtype == "int64"
+        for tour_id, trips in tours["trips"].items():
+            assert relation.loc[relation["tour_id"] == tour_id, "trip_id"].to_list() == list(trips)
+
+    def test_get_tour_trip_relation_arrays(self, example_nested_tour):
+        """Test if trip ids stored as arrays (e.g., read from parquet) are supported."""
+        _, tours = ti.preprocessing.trips.generate_tours(example_nested_tour)
+        relation = ti.preprocessing.trips.get_tour_trip_relation(tours)
+        tours["trips"] = tours["trips"].map(np.array)
+        assert_frame_equal(ti.preprocessing.trips.get_tour_trip_relation(tours), relation)
@@ -5,10 +5,18 @@ import geopandas as gpd
 from geopandas.testing import assert_geoseries_equal
 import pandas as pd
 import pytest
+from numpy.testing import assert_array_equal
 from pandas.testing import assert_frame_equal
 from shapely.geometry import MultiPoint, Point
 
-from trackintel.preprocessing.util import _explode_agg, calc_temp_overlap, angle_centroid_multipoints
+from trackintel.preprocessing.util import (
+    _duplicated,
+    _explode_agg,
+    _flatten_lists,
+    _interval_overlap_join,
+    calc_temp_overlap,
+    angle_centroid_multipoints,
+)
 
 
 @pytest.fixture
@@ -47,6 +55,56 @@ class TestCalc_temp_overlap:
         ratio = calc_temp_overlap(time_1, time_1, time_1, time_1 + one_hour)
         assert ratio == 0
 
+    def test_array(self, one_hour):
+        """Test if array input gives the same ratios as scalar input"""
+        t = pd.Timestamp("2000-01-01", tz="utc")
+        start_1 = pd.Series([t, t, t, t])
+        end_1 = pd.Series([t + one_hour, t + one_hour, t + 2 * one_hour, t])
+        start_2 = pd.Series([t, t, t, t])
+        end_2 = pd.Series([t + one_hour, t + 2 * one_hour, t + one_hour, t + one_hour])
+        ratio = calc_temp_overlap(start_1, end_1, start_2, end_2)
+        expected = [calc_temp_overlap(*args) for args in zip(start_1, end_1, start_2, end_2)]
+        assert isinstance(ratio, np.ndarray)
+        assert ratio.tolist() == expected == [1, 1, 0.5, 0]
+
+    def test_broadcasting(self, one_hour):
+        """Test if a single time span is broadcasted against arrays"""
+        t = pd.Timestamp("2000-01-01", tz="utc")
+        start_1 = pd.DatetimeIndex([t, t + one_hour, t + 2 * one_hour])
+        ratio = calc_temp_overlap(start_1, start_1 + one_hour, t, t + 90 * pd.Timedelta("1min"))
+        assert ratio.tolist() == [1, 0.5, 0]
+
+
+class TestInterval_overlap_join:
+    """Test util method _interval_overlap_join"""
+
+    def test_pairs(self):
+        """Test if all overlapping pairs are found exactly once"""
+        t = pd.Timestamp("2000-01-01", tz="utc")
+        h = pd.Timedelta("1h")
+        start_1 = pd.Series([t, t + 2 * h, t + 10 * h, t + 20 * h])
+        end_1 = pd.Series([t + 3 * h, t + 4 * h, t + 11 * h, t + 20 * h])
+        start_2 = pd.Series([t + 1 * h, t + 3 * h, t - 5 * h, t + 11 * h])
+        end_2 = pd.Series([t + 2 * h, t + 5 * h, t + 30 * h, t + 12 * h])
+        pos_1, pos_2 = _interval_overlap_join(start_1, end_1, start_2, end_2)
+        pairs = sorted(zip(pos_1.tolist(), pos_2.tolist()))
+        # brute force reference (time spans touching at the border do not overlap)
+        expected = [
+            (i, j)
+            for i in range(len(start_1))
+            for j in range(len(start_2))
+            if max(start_1[i], start_2[j]) < min(end_1[i], end_2[j])
+            or (start_1[i] == end_1[i] and start_2[j] < start_1[i] < end_2[j])
+        ]
+        assert pairs == expected
+
+    def test_empty(self):
+        """Test if empty input returns no pairs"""
+        t = pd.Series([pd.Timestamp("2000-01-01", tz="utc")])
+        empty = pd.Series([], dtype="datetime64[ns, UTC]")
+        pos_1, pos_2 = _interval_overlap_join(t, t, empty, empty)
+        assert len(pos_1) == len(pos_2) == 0
+
 
 class TestExplodeAgg:
     """Test util method _explode_agg"""
@@ -94,6 +152,43 @@ class TestExplodeAgg:
         assert_frame_equal(returned_df, solution_df)
 
 
+class TestFlattenLists:
+    """Test util method _flatten_lists"""
+
+    def test_arrays_and_missing(self):
+        """Test if arrays and lists are flattened and missing values are treated as empty lists."""
+        column = pd.Series([np.array([3, 4]), None, [5], []])
+        ids, parents = _flatten_lists(column)
+        assert_array_equal(ids, [3, 4, 5])
+        assert_array_equal(parents, [0, 0, 2])
+
+    def test_empty(self):
+        """Test if empty column returns empty arrays"""
+        ids, parents = _flatten_lists(pd.Series([], dtype=object))
+        assert len(ids) == len(parents) == 0
+
+
+class TestDuplicated:
+    """Test util method _duplicated"""
+
+    def test_same_as_pandas(self):
+        """Test if the result equals GeoDataFrame.duplicated()"""
+        gdf = gpd.GeoDataFrame(
+            {
+                "a": [1, 1, 1, 2, 1],
+                "geom": [Point(0, 0), Point(0, 0), Point(1, 1), Point(0, 0), Point(1, 1)],
+            },
+            geometry="geom",
+            index=[3, 3, 1, 2, 0],  # non unique index
+        )
+        assert _duplicated(gdf).tolist() == gdf.duplicated().tolist() == [False, True, False, False, True]
+
+    def test_no_candidates(self):
+        """Test if no row is marked if the other columns are unique"""
+        gdf = gpd.GeoDataFrame({"a": [1, 2], "geom": [Point(0, 0), Point(0, 0)]}, geometry="geom")
+        assert not _duplicated(gdf).any()
+
+
 class TestAngleCentroidMultipoints:
     """Test util method angle_centroid_multipoints"""
 
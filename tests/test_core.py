@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import trackintel as ti
 
 
@@ -9,3 +12,14 @@ class TestPrint_version:
         ti.print_version()
         captured = capsys.readouterr()
         assert "This is trackintel v" in captured.out
+
+
+class TestImport:
+    """Tests for the import of trackintel."""
+
+    def test_lazy_imports(self):
+        """Check that heavy optional subsystems are only imported on first use."""
+        lazy = ["sklearn", "matplotlib", "osmnx", "similaritymeasures", "sqlalchemy", "geoalchemy2"]
+        code = f"import sys, trackintel; print([m for m in {lazy} if m in sys.modules])"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
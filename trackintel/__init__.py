@@ -1,4 +1,5 @@
 from trackintel.model.positionfixes import Positionfixes
+from trackintel.model.positionfixes import CompactPositionfixes
 from trackintel.model.locations import Locations
 from trackintel.model.triplegs import Triplegs
 from trackintel.model.staypoints import Staypoints
@@ -6,6 +7,7 @@ from trackintel.model.trips import Trips
 from trackintel.model.trips import TripsDataFrame
 from trackintel.model.trips import TripsGeoDataFrame
 from trackintel.model.tours import Tours
+from trackintel.model.util import set_validation_level, get_validation_level, optimize_dtypes
 
 from trackintel.io.file import read_positionfixes_csv
 from trackintel.io.file import read_triplegs_csv
@@ -26,6 +28,7 @@ from .core import print_version
 
 __all__ = [
     "Positionfixes",
+    "CompactPositionfixes",
     "Locations",
     "Triplegs",
     "Staypoints",
@@ -33,6 +36,9 @@ __all__ = [
     "TripsDataFrame",
     "TripsGeoDataFrame",
     "Tours",
+    "set_validation_level",
+    "get_validation_level",
+    "optimize_dtypes",
     "read_positionfixes_csv",
     "read_triplegs_csv",
     "read_staypoints_csv",
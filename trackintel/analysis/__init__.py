@@ -1,4 +1,4 @@
-from .tracking_quality import temporal_tracking_quality
+from .tracking_quality import temporal_tracking_quality, temporal_tracking_quality_positionfixes
 from .tracking_quality import _split_overlaps as split_overlaps
 
 from .labelling import create_activity_flag
@@ -14,6 +14,7 @@ from .metrics import radius_gyration, jump_length
 
 __all__ = [
     "temporal_tracking_quality",
+    "temporal_tracking_quality_positionfixes",
     "split_overlaps",
     "create_activity_flag",
     "predict_transport_mode",
@@ -82,7 +82,7 @@ def predict_transport_mode(triplegs, method="simple-coarse", **kwargs):
         categories = kwargs.pop(
             "categories", {15 / 3.6: "slow_mobility", 100 / 3.6: "motorized_mobility", np.inf: "fast_mobility"}
         )
-        triplegs = triplegs.copy()
+        triplegs = triplegs.copy(deep=False)
         triplegs["mode"] = _predict_transport_mode_simple_coarse(triplegs, categories)
         return triplegs
     else:
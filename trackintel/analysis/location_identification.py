@@ -47,7 +47,7 @@ def location_identifier(staypoints, method="FREQ", pre_filter=True, **pre_filter
     >>> from ti.analysis import location_identifier
     >>> location_identifier(staypoints, pre_filter=True, method="FREQ")
     """
-    sp = staypoints.copy()
+    sp = staypoints.copy(deep=False)
     if "location_id" not in sp.columns:
         raise KeyError(
             (
@@ -67,6 +67,9 @@ def location_identifier(staypoints, method="FREQ", pre_filter=True, **pre_filter
     else:
         raise ValueError(f"Method {method} does not exist.")
 
+    if "purpose" in sp.columns:
+        # own column such that the assignment below does not write into staypoints
+        sp["purpose"] = sp["purpose"].copy()
     sp.loc[f, "purpose"] = method_val["purpose"]
     return sp
 
@@ -121,14 +124,14 @@ def pre_filter_locations(
     >>> mask = pre_filter_locations(staypoints)
     >>> staypoints = staypoints[mask]
     """
-    sp = staypoints.copy()
+    sp = staypoints.copy(deep=False)
     if isinstance(thresh_loc_time, str):
         thresh_loc_time = pd.to_timedelta(thresh_loc_time)
     if isinstance(thresh_loc_period, str):
         thresh_loc_period = pd.to_timedelta(thresh_loc_period)
 
     # filtering users
-    user = sp.groupby("user_id").nunique()
+    user = sp.groupby("user_id", observed=True).nunique()
     user_sp = user["started_at"] >= thresh_sp  # every staypoint should have a started_at -> count
     user_loc = user["location_id"] >= thresh_loc
     user_filter_agg = user_sp & user_loc
@@ -143,7 +146,9 @@ def pre_filter_locations(
         groupby_loc = ["location_id"]
     else:
         raise ValueError(f"Unknown agg_level '{agg_level}' use instead {{'user', 'dataset'}}.")
-    loc = sp.groupby(groupby_loc).agg({"started_at": ["min", "count"], "finished_at": "max", "duration": "sum"})
+    loc = sp.groupby(groupby_loc, observed=True).agg(
+        {"started_at": ["min", "count"], "finished_at": "max", "duration": "sum"}
+    )
     loc.columns = loc.columns.droplevel(0)  # remove possible multi-index
     loc.rename(columns={"min": "started_at", "max": "finished_at", "sum": "duration"}, inplace=True)
     # period for maximal time span first visit - last visit.
@@ -188,12 +193,12 @@ def freq_method(staypoints, *labels):
     >>> from ti.analysis import freq_method
     >>> staypoints = freq_method(staypoints, "home", "work")
     """
-    sp = staypoints.copy()
+    sp = staypoints.copy(deep=False)
     if not labels:
         labels = ("home", "work")
     # Keep backward-compatible dtype semantics independent of pandas string inference.
     sp["purpose"] = pd.Series(np.full(len(sp), None, dtype=object), index=sp.index, dtype=object)
-    for name, group in sp.groupby("user_id"):
+    for name, group in sp.groupby("user_id", observed=True):
         if "duration" not in group.columns:
             group["duration"] = group["finished_at"] - group["started_at"]
         # pandas keeps inner order of groups
@@ -216,7 +221,7 @@ def _freq_transform(group, *labels):
     pd.Series
         dtype : object
     """
-    group_agg = group.groupby("location_id").agg({"duration": "sum"})
+    group_agg = group.groupby("location_id", observed=True).agg({"duration": "sum"})
     group_agg["purpose"] = _freq_assign(group_agg["duration"], *labels)
     group_merge = pd.merge(
         group["location_id"], group_agg["purpose"], how="left", left_on="location_id", right_index=True
@@ -279,7 +284,7 @@ def osna_method(staypoints):
     >>> staypoints = osna_method(staypoints)
     """
     sp_in = staypoints  # no copy --> used to join back later.
-    sp = sp_in.copy()
+    sp = sp_in.copy(deep=False)
     sp["duration"] = sp["finished_at"] - sp["started_at"]
     sp["mean_time"] = sp["started_at"] + sp["duration"] / 2
 
@@ -295,7 +300,7 @@ def osna_method(staypoints):
     # groupby user, location and label.
     groups = ["user_id", "location_id", sp["label"].map(groups_map)]
 
-    sp_agg = sp.groupby(groups)["duration"].sum()
+    sp_agg = sp.groupby(groups, observed=True)["duration"].sum()
     if sp_agg.empty:
         warnings.warn("Got empty table in the osna method, check if the dates lie in weekends.")
         sp_in["purpose"] = pd.NA
@@ -306,7 +311,7 @@ def osna_method(staypoints):
     # get index of maximum for columns "work" and "home"
     # looks over locations to find maximum for columns
     # use fillna such that idxmax raises no error on columns with only NaT
-    sp_idxmax = sp_pivot.fillna(pd.Timedelta(0)).groupby(["user_id"]).idxmax()
+    sp_idxmax = sp_pivot.fillna(pd.Timedelta(0)).groupby(["user_id"], observed=True).idxmax()
 
     # preset dtype to avoid upcast (float64 -> object) in pandas (and the corresponding error)
     sp_pivot["purpose"] = None
@@ -329,7 +334,7 @@ def osna_method(staypoints):
     if not overlap.empty:
         # remove overlap -> must take another location as everything is NaT on maximum
         sp_pivot.loc[overlap, "work"] = pd.NaT
-        sp_idxmax = sp_pivot["work"].fillna(pd.Timedelta(0)).groupby(["user_id"]).idxmax()
+        sp_idxmax = sp_pivot["work"].fillna(pd.Timedelta(0)).groupby(["user_id"], observed=True).idxmax()
         idx_work = sp_pivot.loc[sp_idxmax, "work"].dropna().index
         sp_pivot.loc[idx_work, "purpose"] = "work"
 
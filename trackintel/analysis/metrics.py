@@ -1,11 +1,11 @@
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
 from trackintel.geogr import point_haversine_dist, check_gdf_planar
+from trackintel.model.util import get_user_time_index
 
 
-def radius_gyration(sp, method="count", print_progress=False):
+def radius_gyration(sp, method="count", print_progress=False, freq=None):
     """
     Radius of gyration for individual users.
 
@@ -20,66 +20,64 @@ def radius_gyration(sp, method="count", print_progress=False):
         - `duration`: assigns each Point a weight based on duration.
 
     print_progress: bool, default False
-        Show per-user progress if set to True.
+        Has no effect, the radius of gyration is computed for all users at once.
+        Kept for backwards compatibility.
+
+    freq: str, optional
+        Pandas offset alias (e.g. "W" or "D"). If given, the radius of gyration is computed per user and time
+        window, with staypoints assigned to windows by their (local) 'started_at' time.
 
     Returns
     -------
     Series
-        Radius of gyration for individual users.
+        Radius of gyration for individual users. Indexed by 'user_id', or by ['user_id', 'window'] if `freq` is set.
 
     References
     ----------
     [1] Gonzalez, M. C., Hidalgo, C. A., & Barabasi, A. L. (2008).
     Understanding individual human mobility patterns. Nature, 453(7196), 779-782.
 
+    Examples
+    --------
+    >>> from trackintel.analysis import radius_gyration
+    >>> rg = radius_gyration(sp, method="duration")
+    >>> rg_weekly = radius_gyration(sp, freq="W")
     """
     if method not in ["count", "duration"]:
         raise ValueError(f'Method unknown. Should be on of {{"count", "duration"}}. You passed "{method}"')
 
-    if print_progress:
-        tqdm.pandas(desc="User radius of gyration calculation")
-        s = sp.groupby("user_id").progress_apply(_radius_gyration_user, method=method, include_groups=False)
-    else:
-        s = sp.groupby("user_id").apply(_radius_gyration_user, method=method, include_groups=False)
-
-    s = s.rename("radius_gyration")
-    return s
-
-
-def _radius_gyration_user(sp, method):
-    """
-    User level radius of gyration calculation, see radius_gyration() for more details.
-
-    Parameters
-    ----------
-    sp : Staypoints
-    method: {"count", "duration"}
-
-    Returns
-    -------
-    float
-        The radius of gyration of the user
-    """
-    x = sp.geometry.x
-    y = sp.geometry.y
+    codes, index = _group_codes(sp, freq)
+    x = sp.geometry.x.to_numpy()
+    y = sp.geometry.y.to_numpy()
 
     if method == "duration":
         duration = sp["finished_at"] - sp["started_at"]
-        w = duration.dt.total_seconds()
-    else:  # method == count (check is done in upper level)
+        w = duration.dt.total_seconds().to_numpy()
+    else:  # method == count
         w = np.ones_like(x)
 
-    x_center = np.average(x, weights=w)
-    y_center = np.average(y, weights=w)
+    # staypoints without user_id (code -1) belong to no group
+    valid = codes >= 0
+    if not valid.all():
+        codes, x, y, w = codes[valid], x[valid], y[valid], w[valid]
+
+    # weighted center of mass of every group in a single pass
+    n = len(index)
+    w_sum = np.bincount(codes, weights=w, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_center = np.bincount(codes, weights=w * x, minlength=n) / w_sum
+        y_center = np.bincount(codes, weights=w * y, minlength=n) / w_sum
+
     if check_gdf_planar(sp):
-        sq_dist = (x - x_center) ** 2 + (y - y_center) ** 2
+        sq_dist = (x - x_center[codes]) ** 2 + (y - y_center[codes]) ** 2
     else:
-        sq_dist = point_haversine_dist(x, y, x_center, y_center) ** 2
-    square_rg = np.average(sq_dist, weights=w)
-    return np.sqrt(square_rg)
+        sq_dist = point_haversine_dist(x, y, x_center[codes], y_center[codes]) ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        square_rg = np.bincount(codes, weights=w * sq_dist, minlength=n) / w_sum
+    return pd.Series(np.sqrt(square_rg), index=index, name="radius_gyration")
 
 
-def jump_length(staypoints):
+def jump_length(staypoints, freq=None):
     """
     Jump length between consecutive staypoints per users.
 
@@ -87,6 +85,10 @@ def jump_length(staypoints):
     ----------
     sp : Staypoints
 
+    freq: str, optional
+        Pandas offset alias (e.g. "W" or "D"). If given, only jumps between staypoints that started in the same
+        time window are computed, the last staypoint of every window gets NaN.
+
     Returns
     -------
     pd.Series
@@ -96,33 +98,59 @@ def jump_length(staypoints):
     References
     ----------
     [1] Brockmann, D., Hufnagel, L., & Geisel, T. (2006). The scaling laws of human travel. Nature, 439(7075), 462-465.
+
+    Examples
+    --------
+    >>> from trackintel.analysis import jump_length
+    >>> jl = jump_length(sp)
+    >>> jl_daily = jump_length(sp, freq="D")
     """
-    geom = staypoints.geometry.name
-    staypoints = staypoints.sort_values(by=["user_id", "started_at"])[["user_id", geom]]
-    # due to bug in GeoPandas 0.14.0, we cannot use transform on grouped GeoSeries,
-    # thus we stay in GeoDataFrame and convert in the end to Series (will be fixed in next release)
-    series = staypoints.groupby(by="user_id").transform(_jump_length_user)
-    series = series[geom].rename("jump_length")
-    return series
+    staypoints = staypoints.take(get_user_time_index(staypoints).order)
+    codes, _ = _group_codes(staypoints, freq)
+    x = staypoints.geometry.x.to_numpy()
+    y = staypoints.geometry.y.to_numpy()
+
+    dist = np.full(len(staypoints), np.nan)
+    if check_gdf_planar(staypoints):
+        dist[:-1] = np.hypot(x[1:] - x[:-1], y[1:] - y[:-1])
+    else:
+        dist[:-1] = point_haversine_dist(x[:-1], y[:-1], x[1:], y[1:])
+    # no jumps between users (or time windows), nor from or to staypoints without user_id
+    dist[:-1][(codes[1:] != codes[:-1]) | (codes[1:] < 0) | (codes[:-1] < 0)] = np.nan
+    dist[codes < 0] = np.nan
+    return pd.Series(dist, index=staypoints.index, name="jump_length")
 
 
-def _jump_length_user(g):
+def _group_codes(sp, freq=None):
     """
-    Jump length for a single user.
+    Integer group codes of staypoints per user and (optionally) per time window.
 
     Parameters
     ----------
-    g : gpd.GeoSeries
+    sp : Staypoints
+
+    freq: str, optional
+        Pandas offset alias for the time windows based on the local time of 'started_at'.
 
     Returns
     -------
-    np.array
+    codes : np.array
+        Group code for every staypoint, in the row order of sp. Staypoints without user_id get -1.
+
+    index : pd.Index
+        Sorted group labels, 'user_id' or MultiIndex ['user_id', 'window'].
     """
-    if check_gdf_planar(g):
-        dist = g.distance(g.shift(-1))
-    else:
-        dist = np.zeros(len(g), dtype=np.float64)
-        dist[:-1] = point_haversine_dist(g.x[:-1], g.y[:-1], g.x[1:], g.y[1:])
-        dist[-1] = np.nan
-        dist = pd.Series(data=dist, index=g.index)
-    return dist
+    if freq is None:
+        codes, index = pd.factorize(sp["user_id"], sort=True)
+        return codes, pd.Index(index, name="user_id")
+    started_at = sp["started_at"]
+    if isinstance(started_at.dtype, pd.DatetimeTZDtype):
+        started_at = started_at.dt.tz_localize(None)  # keep local wall time
+    keys = pd.MultiIndex.from_arrays([sp["user_id"], started_at.dt.to_period(freq)])
+    # MultiIndex.factorize keeps NaN as group -> mark rows without user_id with -1 like pd.factorize
+    has_user = sp["user_id"].notna().to_numpy()
+    valid_codes, index = keys[has_user].factorize(sort=True)
+    codes = np.full(len(sp), -1, dtype=np.intp)
+    codes[has_user] = valid_codes
+    index.names = ["user_id", "window"]
+    return codes, index
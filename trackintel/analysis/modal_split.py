@@ -41,7 +41,7 @@ def calculate_modal_split(tpls, freq=None, metric="count", per_user=False, norm=
     >>> triplegs.calculate_modal_split()
     >>> tripleg.calculate_modal_split(freq='W-MON', metric='distance')
     """
-    tpls = tpls.copy()  # copy as we add additional columns on tpls
+    tpls = tpls.copy(deep=False)  # copy as we add additional columns on tpls
 
     # count on mode, sum on length and duration
     agg = "sum"
@@ -66,7 +66,9 @@ def calculate_modal_split(tpls, freq=None, metric="count", per_user=False, norm=
         tpls.index.name = "timestamp"
         group.append(pd.Grouper(freq=freq))
 
-    modal_split = pd.pivot_table(tpls, index=group, columns=["mode"], aggfunc={metric: agg}, fill_value=0)
+    modal_split = pd.pivot_table(
+        tpls, index=group, columns=["mode"], aggfunc={metric: agg}, fill_value=0, observed=True
+    )
     if group:  # non-empty group creates MultiIndex that we need to handle
         modal_split.columns = modal_split.columns.droplevel(0)
 
@@ -1,5 +1,6 @@
 import warnings
 
+import numpy as np
 import pandas as pd
 
 
@@ -64,7 +65,7 @@ def temporal_tracking_quality(source, granularity="all"):
             f"the source dataframe must have the columns {required_columns}, but it has [{', '.join(source.columns)}]."
         )
 
-    df = source.copy()
+    df = source.copy(deep=False)
     df.reset_index(inplace=True)
 
     # filter out records with duration <= 0
@@ -76,9 +77,7 @@ def temporal_tracking_quality(source, granularity="all"):
         return None
 
     if granularity == "all":
-        quality = df.groupby("user_id", as_index=False).apply(
-            _get_tracking_quality_user, granularity, include_groups=False
-        )
+        quality = _get_tracking_quality_user(df, None, granularity).reset_index()
         return quality
 
     # split records that span several days
@@ -107,11 +106,7 @@ def temporal_tracking_quality(source, granularity="all"):
 
     start_date = df["started_at"].min().floor(freq="D")
     # calculate per-user per-grouper tracking quality
-    quality = (
-        df.groupby(["user_id", grouper])[["started_at", "finished_at"]]
-        .apply(_get_tracking_quality_user, start_date, granularity)
-        .reset_index()
-    )
+    quality = _get_tracking_quality_user(df, start_date, granularity, by=["user_id", grouper]).reset_index()
 
     # rename and reorder
     quality.rename(columns={"started_at": column_name}, inplace=True)
@@ -120,10 +115,66 @@ def temporal_tracking_quality(source, granularity="all"):
     return quality
 
 
-def _get_tracking_quality_user(df, start_date, granularity="all"):
+def temporal_tracking_quality_positionfixes(positionfixes, granularity="all", resolution="1min", max_gap="5min"):
+    """
+    Calculate per-user temporal tracking quality (temporal coverage) directly from positionfixes.
+
+    Parameters
+    ----------
+    positionfixes : Positionfixes
+
+    granularity : {"all", "day", "week", "weekday", "hour"}
+        The level of which the tracking quality is calculated, see
+        :func:`trackintel.analysis.temporal_tracking_quality` for details.
+
+    resolution : str or pd.Timedelta, default "1min"
+        Size of the time bins of the coverage bitmap. A bin is covered if it contains a positionfix.
+
+    max_gap : str or pd.Timedelta, default "5min"
+        Maximal time difference between two consecutive positionfixes of a user for which the bins in between
+        are considered covered as well.
+
+    Returns
+    -------
+    quality: DataFrame
+        A per-user per-granularity temporal tracking quality dataframe.
+
+    Notes
+    -----
+    The positionfixes of every user are mapped to a coverage bitmap with one bit per ``resolution``. Gaps up to
+    ``max_gap`` are filled. The bitmap is kept run-length encoded, thus memory scales with the number of
+    positionfixes and not with the tracked time span. The covered runs are then evaluated like tracked time spans
+    of staypoints and triplegs in :func:`trackintel.analysis.temporal_tracking_quality`.
+
+    This allows to filter users with insufficient tracking quality before generating staypoints and triplegs.
+
+    Examples
+    --------
+    >>> # calculate per-day tracking quality with a 1 minute bitmap bridging gaps up to 10 minutes
+    >>> temporal_tracking_quality_positionfixes(pfs, granularity="day", resolution="1min", max_gap="10min")
+    """
+    required_columns = ["user_id", "tracked_at"]
+    if any([c not in positionfixes.columns for c in required_columns]):
+        raise KeyError(
+            "To successfully calculate the user-level tracking quality, "
+            f"the positionfixes must have the columns {required_columns}, "
+            f"but it has [{', '.join(positionfixes.columns)}]."
+        )
+    resolution = pd.Timedelta(resolution)
+    max_gap = pd.Timedelta(max_gap)
+    if resolution <= pd.Timedelta(0):
+        raise ValueError(f"resolution must be positive but is {resolution}.")
+
+    runs = _coverage_runs(positionfixes, resolution, max_gap)
+    return temporal_tracking_quality(runs, granularity=granularity)
+
+
+def _get_tracking_quality_user(df, start_date, granularity="all", by="user_id"):
     """
     Tracking quality per-user per-granularity.
 
+    All groups are aggregated at once, the tracked duration and the extent are computed with a single groupby.
+
     Parameters
     ----------
     df : Trackintel class
@@ -136,36 +187,53 @@ def _get_tracking_quality_user(df, start_date, granularity="all"):
         Determines the extent of the tracking. "all" the entire tracking period,
         "day" and "weekday" a whole day, "week" a whole week, and "hour" a whole hour.
 
+    by : label, pd.Grouper, pd.Series or list of these, default "user_id"
+        Keys to group df by, passed on to ``DataFrame.groupby``.
+
     Returns
     -------
-    pandas.Series
-        A pandas.Series object containing the tracking quality
+    pandas.DataFrame
+        Tracking quality in column "quality", indexed by the group keys.
     """
-    tracked_duration = (df["finished_at"] - df["started_at"]).dt.total_seconds().sum()
+    agg = {"tracked": ("tracked", "sum")}
     if granularity == "all":
         # the whole tracking period
-        extent = (df["finished_at"].max() - df["started_at"].min()).total_seconds()
+        agg.update(first=("started_at", "min"), last=("finished_at", "max"))
+    elif granularity in ["day", "week"]:
+        pass
+    elif granularity == "weekday":
+        # entries from multiple weeks may be grouped together -> count tracked weeks
+        period = (df["started_at"] - start_date).dt.days // 7
+        agg.update(first=("period", "min"), last=("period", "max"))
+    elif granularity == "hour":
+        # entries from multiple days may be grouped together -> count tracked days
+        period = (df["started_at"] - start_date).dt.days
+        agg.update(first=("period", "min"), last=("period", "max"))
+    else:
+        raise ValueError(
+            f"granularity unknown. We only support ['all', 'day', 'week', 'weekday', 'hour']. You passed {granularity}"
+        )
+
+    df = df.assign(tracked=(df["finished_at"] - df["started_at"]).dt.total_seconds())
+    if granularity in ["weekday", "hour"]:
+        df["period"] = period
+    grouped = df.groupby(by, observed=True).agg(**agg)
+
+    if granularity == "all":
+        extent = (grouped["last"] - grouped["first"]).dt.total_seconds()
     elif granularity == "day":
         # total seconds in a day
         extent = 60 * 60 * 24
-    elif granularity == "weekday":
-        # total seconds in an day * number of tracked weeks
-        # (entries from multiple weeks may be grouped together)
-        df["week"] = ((df["started_at"] - start_date)).dt.days // 7
-        extent = 60 * 60 * 24 * (df["week"].max() - df["week"].min() + 1)
     elif granularity == "week":
         # total seconds in a week
         extent = 60 * 60 * 24 * 7
-    elif granularity == "hour":
+    elif granularity == "weekday":
+        # total seconds in an day * number of tracked weeks
+        extent = 60 * 60 * 24 * (grouped["last"] - grouped["first"] + 1)
+    else:  # granularity == "hour"
         # total seconds in an hour * number of tracked days
-        # (entries from multiple days may be grouped together)
-        df["day"] = (df["started_at"] - start_date).dt.days
-        extent = (60 * 60) * (df["day"].max() - df["day"].min() + 1)
-    else:
-        raise ValueError(
-            f"granularity unknown. We only support ['all', 'day', 'week', 'weekday', 'hour']. You passed {granularity}"
-        )
-    return pd.Series([tracked_duration / extent], index=["quality"])
+        extent = (60 * 60) * (grouped["last"] - grouped["first"] + 1)
+    return (grouped["tracked"] / extent).to_frame("quality")
 
 
 def _split_overlaps(source, granularity="day"):
@@ -187,27 +255,87 @@ def _split_overlaps(source, granularity="day"):
         The input object after the splitting
     """
     freq = "h" if granularity == "hour" else "D"
-    gdf = source.copy()
-    gdf[["started_at", "finished_at"]] = gdf.apply(_get_times, axis="columns", result_type="expand", freq=freq)
-    # must call DataFrame.explode directly because GeoDataFrame.explode cannot be used on multiple columns
-    gdf = pd.DataFrame.explode(gdf, ["started_at", "finished_at"], ignore_index=True)
+    rows, started_at, finished_at = _split_times(source["started_at"], source["finished_at"], freq=freq)
+    gdf = source.iloc[rows].reset_index(drop=True)
+    gdf["started_at"] = started_at
+    gdf["finished_at"] = finished_at
     if "duration" in gdf.columns:
         gdf["duration"] = gdf["finished_at"] - gdf["started_at"]
     return gdf
 
 
+def _split_times(started_at, finished_at, freq="D"):
+    """
+    Split time ranges (start-finish) at frequency borders.
+
+    The borders are computed with integer arithmetic on the local wall time, such that a day starts at local
+    midnight. Records are repeated once per part.
+
+    Parameters
+    ----------
+    started_at, finished_at : pd.Series
+        Start and end of the time ranges.
+
+    freq : {'D', 'h'}, default 'D'
+        Pandas frequency string of a fixed frequency.
+
+    Returns
+    -------
+    rows : np.array
+        Position of the original record for every part.
+
+    started_at, finished_at : pd.Series
+        Start and end of every part.
+    """
+    step = pd.Timedelta(1, unit=freq).value
+    started_at = started_at.dt.as_unit("ns").reset_index(drop=True)
+    finished_at = finished_at.dt.as_unit("ns").reset_index(drop=True)
+    tz = started_at.dt.tz
+    start = _wall_time_ns(started_at)
+    finish = _wall_time_ns(finished_at)
+
+    # borders (in units of step) strictly between start and finish
+    first = start // step + 1
+    last = -(-finish // step) - 1
+    n_borders = np.maximum(last - first + 1, 0)
+    n_parts = n_borders + 1
+    rows = np.repeat(np.arange(len(start)), n_parts)
+    part = np.arange(len(rows)) - np.repeat(np.cumsum(n_parts) - n_parts, n_parts)
+    is_first = part == 0
+    is_last = part == n_borders[rows]
+
+    # end of every part is the next border (in wall time)
+    ends = pd.Series(((first[rows] + part) * step).astype("datetime64[ns]"))
+    if tz is not None:
+        # ambiguous borders are resolved to the earlier instant, nonexistent ones are skipped
+        ends = ends.dt.tz_localize(tz, ambiguous=np.ones(len(ends), dtype=bool), nonexistent="shift_forward")
+    ends = ends.where(~is_last, finished_at.iloc[rows].reset_index(drop=True))
+    starts = ends.shift(1).where(~is_first, started_at.iloc[rows].reset_index(drop=True))
+
+    # drop empty parts from borders that collapsed due to daylight saving time
+    keep = (starts != ends).to_numpy() | (n_borders[rows] == 0)
+    return rows[keep], starts[keep].reset_index(drop=True), ends[keep].reset_index(drop=True)
+
+
+def _wall_time_ns(dt):
+    """Local wall time of datetime series as int64 nanoseconds."""
+    if dt.dt.tz is not None:
+        dt = dt.dt.tz_localize(None)
+    return dt.to_numpy().astype("int64")
+
+
 def _get_times(row, freq="D"):
     """
     Returns the times for splitting range (start-finish) at frequency borders.
 
-    Use it with `.apply()` for a single row of a DataFrame. Set result_type="expand".
+    Single row version of `_split_times()`.
 
     Parameters
     ----------
     row : Series
         Row of dataframe with columns ["started_at", "finished_at"].
 
-    freq : str or DateOffset, default 'D'
+    freq : {'D', 'h'}, default 'D'
         Pandas frequency string.
 
     Returns
@@ -215,10 +343,57 @@ def _get_times(row, freq="D"):
     Tuple of lists
         Tuple of (start, end) times.
     """
-    result = []
-    if row["started_at"] != row["started_at"].ceil(freq):
-        result.append(row["started_at"])  # is not on border -> not included in date_range
-    result.extend(pd.date_range(row["started_at"].ceil(freq), row["finished_at"], freq=freq).to_list())
-    if (row["finished_at"] != result[-1]) or (len(result) == 1):  # len check for started_at == finished_at
-        result.append(row["finished_at"])  # is not on border -> not included in data_range
-    return result[:-1], result[1:]
+    _, started_at, finished_at = _split_times(
+        pd.Series([row["started_at"]]), pd.Series([row["finished_at"]]), freq=freq
+    )
+    return started_at.to_list(), finished_at.to_list()
+
+
+def _coverage_runs(positionfixes, resolution, max_gap):
+    """
+    Run-length encoded per-user coverage bitmap of positionfixes.
+
+    Parameters
+    ----------
+    positionfixes : Positionfixes
+
+    resolution : pd.Timedelta
+        Size of the time bins.
+
+    max_gap : pd.Timedelta
+        Gaps between consecutive positionfixes up to max_gap are covered.
+
+    Returns
+    -------
+    pd.DataFrame
+        Covered runs of bins with columns ['user_id', 'started_at', 'finished_at'].
+    """
+    tracked_at = positionfixes["tracked_at"].dt.as_unit("ns")
+    t = tracked_at.astype("int64").to_numpy()
+    codes, users = pd.factorize(positionfixes["user_id"])
+    # positionfixes without user_id (code -1) belong to no user
+    valid = np.flatnonzero(codes >= 0)
+    order = valid[np.lexsort((t[valid], codes[valid]))]
+    t, codes = t[order], codes[order]
+
+    res = resolution.value
+    bins = t // res
+    # each positionfix covers its own bin, and all bins up to the next positionfix if the gap is small enough
+    start = bins
+    end = bins + 1  # exclusive
+    bridge = (codes[1:] == codes[:-1]) & (np.diff(t) <= max_gap.value)
+    end[:-1][bridge] = bins[1:][bridge] + 1
+
+    # within a user, ends are nondecreasing -> a new run starts where the previous interval ended before
+    new_run = np.ones(len(t), dtype=bool)
+    new_run[1:] = (codes[1:] != codes[:-1]) | (start[1:] > end[:-1])
+    run_start = np.flatnonzero(new_run)
+    run_end = np.append(run_start[1:], len(t)) - 1
+
+    tz = tracked_at.dt.tz
+    started_at = pd.to_datetime(start[run_start] * res, utc=tz is not None)
+    finished_at = pd.to_datetime(end[run_end] * res, utc=tz is not None)
+    if tz is not None:
+        started_at = started_at.tz_convert(tz)
+        finished_at = finished_at.tz_convert(tz)
+    return pd.DataFrame({"user_id": users[codes[run_start]], "started_at": started_at, "finished_at": finished_at})
@@ -3,6 +3,7 @@ from .distances import calculate_haversine_length
 from .distances import meters_to_decimal_degrees
 from .distances import point_haversine_dist
 from .distances import get_speed_positionfixes
+from .distances import get_kinematics_positionfixes
 from .distances import get_speed_triplegs
 from .distances import check_gdf_planar
 
@@ -14,6 +15,7 @@ __all__ = [
     "meters_to_decimal_degrees",
     "point_haversine_dist",
     "get_speed_positionfixes",
+    "get_kinematics_positionfixes",
     "get_speed_triplegs",
     "check_gdf_planar",
     "spatial_filter",
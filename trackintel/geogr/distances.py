@@ -3,11 +3,10 @@ import math
 import warnings
 from math import pi
 
+import geopandas as gpd
 import numpy as np
 import pandas as pd
 import shapely
-import similaritymeasures
-from sklearn.metrics import pairwise_distances
 
 from trackintel import Triplegs
 
@@ -135,6 +134,10 @@ def calculate_distance_matrix(X, Y=None, dist_metric="haversine", n_jobs=None, *
     >>> calculate_distance_matrix(triplegs_1, triplegs_2, dist_metric="dtw")
     >>> pfs.calculate_distance_matrix(dist_metric="haversine")
     """
+    # sklearn and similaritymeasures are imported on first use to keep `import trackintel` fast
+    import similaritymeasures
+    from sklearn.metrics import pairwise_distances
+
     geom_type = X.geometry.iat[0].geom_type
     if Y is not None and Y.geometry.iloc[0].geom_type != geom_type:
         raise ValueError("X and Y need to have same geometry type.")
@@ -277,42 +280,106 @@ def calculate_haversine_length(gdf):
     return np.bincount((index[:-1])[no_mix], weights=dist[no_mix])
 
 
+def _coordinates(pfs):
+    """Return the x and y coordinates of (compact) positionfixes as numpy arrays."""
+    if isinstance(pfs, gpd.GeoDataFrame):
+        return pfs.geometry.x.to_numpy(), pfs.geometry.y.to_numpy()
+    return pfs["x"].to_numpy(), pfs["y"].to_numpy()
+
+
 def get_speed_positionfixes(positionfixes):
     """
     Compute speed per positionfix (in m/s)
 
     Parameters
     ----------
-    positionfixes : Positionfixes
+    positionfixes : Positionfixes or CompactPositionfixes
 
     Returns
     -------
-    pfs: Positionfixes
+    pfs: Positionfixes or CompactPositionfixes
         Copy of the original positionfixes with a new column ``[`speed`]``. The speed is given in m/s
 
     Notes
     -----
-    The speed at one positionfix is computed from the distance and time since the previous positionfix.
-    For the first positionfix, the speed is set to the same value as for the second one.
+    The speed at one positionfix is computed from the distance and time since the previous positionfix
+    of the same user (positionfixes are ordered by ``tracked_at`` per user).
+    For the first positionfix of a user, the speed is set to the same value as for the second one.
+    Speeds over a time difference of zero are undefined and set to NaN.
+
+    Examples
+    --------
+    >>> pfs = ti.geogr.get_speed_positionfixes(pfs)
+    >>> pfs = pfs.get_speed()
     """
-    pfs = positionfixes.copy()
-    is_planar_crs = check_gdf_planar(pfs)
+    pfs = positionfixes.copy(deep=False)
+    keys = ["user_id"] if "user_id" in pfs.columns else []
+    speed, _, _, _ = _kinematics_positionfixes(pfs, keys)
+    pfs["speed"] = speed
+    return pfs
 
-    g = pfs.geometry
-    # get distance and time difference
-    if is_planar_crs:
-        dist = g.distance(g.shift(1)).to_numpy()
-    else:
-        x = g.x.to_numpy()
-        y = g.y.to_numpy()
-        dist = np.zeros(len(pfs), dtype=np.float64)
-        dist[1:] = point_haversine_dist(x[:-1], y[:-1], x[1:], y[1:])
 
-    time_delta = (pfs["tracked_at"] - pfs["tracked_at"].shift(1)).dt.total_seconds().to_numpy()
-    # compute speed (in m/s)
-    speed = dist / time_delta
-    speed[0] = speed[1]  # The first point speed is imputed
+def get_kinematics_positionfixes(positionfixes, split_triplegs=False):
+    """
+    Compute speed, acceleration, bearing and turning angle per positionfix.
+
+    All features are computed in a single pass over the coordinate and time arrays of the positionfixes.
+    Consecutive positionfixes of different users (and optionally of different triplegs) are never compared.
+
+    Parameters
+    ----------
+    positionfixes : Positionfixes or CompactPositionfixes
+
+    split_triplegs : bool, default False
+        If True, the features are additionally reset at tripleg boundaries. Requires the column ``tripleg_id``.
+        Positionfixes that do not belong to a tripleg receive NaN for all features.
+
+    Returns
+    -------
+    pfs: Positionfixes or CompactPositionfixes
+        Copy of the original positionfixes with the new columns
+        ``[`speed`, `acceleration`, `bearing`, `turning_angle`]``.
+
+    Notes
+    -----
+    Positionfixes are ordered by ``tracked_at`` within each user (and tripleg) before the computation, the
+    returned positionfixes keep the original order.
+
+    - ``speed`` (m/s): distance over time since the previous positionfix. For the first positionfix, the speed is
+      set to the same value as for the second one (as in :func:`trackintel.geogr.get_speed_positionfixes`).
+    - ``acceleration`` (m/s²): change of speed since the previous positionfix divided by the time difference.
+      NaN for the first two positionfixes.
+    - ``bearing`` (degrees): direction of the movement from the previous positionfix, clockwise from north
+      in [0, 360). NaN for the first positionfix and if the position did not change.
+    - ``turning_angle`` (degrees): change of bearing since the previous positionfix in [-180, 180).
+      Positive values are turns to the right.
+
+    Features over a time difference of zero are undefined and set to NaN.
+    For planar coordinate systems euclidean distances and bearings are used, otherwise
+    haversine distances and initial great circle bearings.
+
+    Examples
+    --------
+    >>> pfs = ti.geogr.get_kinematics_positionfixes(pfs)
+    >>> pfs = pfs.get_kinematics(split_triplegs=True)
+    """
+    pfs = positionfixes.copy(deep=False)
+    keys = ["user_id"] if "user_id" in pfs.columns else []
+    if split_triplegs:
+        if "tripleg_id" not in pfs.columns:
+            raise AttributeError('Positionfixes must include column "tripleg_id".')
+        keys.append("tripleg_id")
+
+    speed, acceleration, bearing, turning_angle = _kinematics_positionfixes(pfs, keys)
+    if split_triplegs:
+        no_tpls = pfs["tripleg_id"].isna().to_numpy()
+        for feature in (speed, acceleration, bearing, turning_angle):
+            feature[no_tpls] = np.nan
+
     pfs["speed"] = speed
+    pfs["acceleration"] = acceleration
+    pfs["bearing"] = bearing
+    pfs["turning_angle"] = turning_angle
     return pfs
 
 
@@ -347,7 +414,7 @@ def get_speed_triplegs(triplegs, positionfixes=None, method="tpls_speed"):
             distance = calculate_haversine_length(triplegs)
         duration = (triplegs["finished_at"] - triplegs["started_at"]).dt.total_seconds()
         # The unit of the speed is m/s
-        tpls = triplegs.copy()
+        tpls = triplegs.copy(deep=False)
         tpls["speed"] = distance / duration
         return tpls
 
@@ -357,8 +424,18 @@ def get_speed_triplegs(triplegs, positionfixes=None, method="tpls_speed"):
             raise ValueError('Method "pfs_mean_speed" requires positionfixes as input.')
         if "tripleg_id" not in positionfixes:
             raise AttributeError('Positionfixes must include column "tripleg_id".')
-        # group positionfixes by triplegs and compute average speed for each collection of positionfixes
-        grouped_pfs = positionfixes.groupby("tripleg_id").apply(_single_tripleg_mean_speed, include_groups=False)
+        # speed of the first positionfix of each tripleg (NaN in raw speed) is excluded from the mean
+        speed, _, _, _ = _kinematics_positionfixes(positionfixes, ["tripleg_id"], impute_first=False)
+        codes, tpls_ids = pd.factorize(positionfixes["tripleg_id"])
+        t = positionfixes["tracked_at"].dt.as_unit("ns").astype("int64").to_numpy()
+        order = np.lexsort((t, codes))
+        order = order[codes[order] != -1]  # positionfixes without tripleg
+        codes, speed = codes[order], speed[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)  # triplegs with only zero time deltas
+            mean_speed = [np.nanmean(s[1:]) for s in np.split(speed, starts[1:])]
+        grouped_pfs = pd.Series(mean_speed, index=tpls_ids[codes[starts]], dtype="float64")
         # add the speed values to the triplegs column
         tpls = pd.merge(triplegs, grouped_pfs.rename("speed"), how="left", left_index=True, right_index=True)
         tpls.index = tpls.index.astype("int64")
@@ -368,7 +445,90 @@ def get_speed_triplegs(triplegs, positionfixes=None, method="tpls_speed"):
         raise ValueError(f"Method {method} not known for speed computation.")
 
 
-def _single_tripleg_mean_speed(positionfixes):
-    pfs_sorted = positionfixes.sort_values(by="tracked_at")
-    pfs_speed = get_speed_positionfixes(pfs_sorted)
-    return np.mean(pfs_speed["speed"].values[1:])
+def _kinematics_positionfixes(pfs, keys, impute_first=True):
+    """
+    Compute speed, acceleration, bearing and turning angle on the coordinate arrays of positionfixes.
+
+    Parameters
+    ----------
+    pfs : Positionfixes or CompactPositionfixes
+
+    keys : list of str
+        Columns of pfs that define independent sequences (e.g., ``["user_id"]``).
+
+    impute_first : bool, default True
+        Set the speed of the first positionfix of a sequence to the speed of the second one.
+
+    Returns
+    -------
+    speed, acceleration, bearing, turning_angle : np.array
+        Features in the row order of pfs, see get_kinematics_positionfixes() for their definition.
+    """
+    n = len(pfs)
+    tracked_at = pfs["tracked_at"]
+    t = tracked_at.dt.as_unit("ns").astype("int64").to_numpy()
+    x, y = _coordinates(pfs)
+    codes = [pd.factorize(pfs[k])[0] for k in keys]
+
+    # order by keys and time, np.lexsort sorts by last key first
+    order = np.lexsort([t] + codes[::-1])
+    t, x, y = t[order], x[order], y[order]
+    new_seq = np.zeros(n, dtype=bool)
+    new_seq[:1] = True
+    for c in codes:
+        c = c[order]
+        new_seq[1:] |= c[1:] != c[:-1]
+
+    # differences to the previous positionfix, undefined at the start of a sequence
+    time_delta = np.full(n, np.nan)
+    time_delta[1:] = np.diff(t) / 1e9
+    time_delta[new_seq] = np.nan
+    valid_time = time_delta > 0
+
+    dist = np.full(n, np.nan)
+    bearing = np.full(n, np.nan)
+    if check_gdf_planar(pfs):
+        dx, dy = np.diff(x), np.diff(y)
+        dist[1:] = np.hypot(dx, dy)
+        bearing[1:] = np.rad2deg(np.arctan2(dx, dy))
+    else:
+        dist[1:] = point_haversine_dist(x[:-1], y[:-1], x[1:], y[1:])
+        lon, lat = np.deg2rad(x), np.deg2rad(y)
+        d_lon = np.diff(lon)
+        bearing[1:] = np.rad2deg(
+            np.arctan2(
+                np.sin(d_lon) * np.cos(lat[1:]),
+                np.cos(lat[:-1]) * np.sin(lat[1:]) - np.sin(lat[:-1]) * np.cos(lat[1:]) * np.cos(d_lon),
+            )
+        )
+    dist[new_seq] = np.nan
+    bearing[new_seq | (dist == 0)] = np.nan
+    bearing = bearing % 360
+
+    speed = np.full(n, np.nan)
+    np.divide(dist, time_delta, out=speed, where=valid_time)
+
+    acceleration = np.full(n, np.nan)
+    acceleration[1:] = speed[1:] - speed[:-1]
+    np.divide(acceleration, time_delta, out=acceleration, where=valid_time)
+    acceleration[~valid_time] = np.nan
+
+    turning_angle = np.full(n, np.nan)
+    turning_angle[1:] = (bearing[1:] - bearing[:-1] + 180) % 360 - 180
+    turning_angle[new_seq] = np.nan
+
+    if impute_first:
+        # the first speed of a sequence is imputed with the second one (if within the same sequence)
+        first = np.flatnonzero(new_seq)
+        second = first + 1
+        has_second = second < n
+        has_second[has_second] &= ~new_seq[second[has_second]]
+        speed[first[has_second]] = speed[second[has_second]]
+
+    # scatter back into the original row order
+    result = []
+    for feature in (speed, acceleration, bearing, turning_angle):
+        out = np.empty(n)
+        out[order] = feature
+        result.append(out)
+    return tuple(result)
@@ -35,7 +35,7 @@ def spatial_filter(source, areas, method="within", re_project=False):
     --------
     >>> sp.spatial_filter(areas, method="within", re_project=False)
     """
-    gdf = source.copy()
+    gdf = source.copy(deep=False)
 
     if re_project:
         init_crs = gdf.crs
@@ -1,27 +1,36 @@
 # -*- coding: utf-8 -*-
 
 import glob
+import hashlib
+import io
 import os
+import shutil
+import uuid
+import warnings
 from zipfile import ZipFile
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from shapely.geometry import LineString
-from sklearn.neighbors import NearestNeighbors
+from shapely.geometry.base import BaseGeometry
 from tqdm import tqdm
 
-from trackintel.preprocessing.util import calc_temp_overlap
+from trackintel.preprocessing.util import _interval_overlap_join, calc_temp_overlap
 from trackintel import Positionfixes, Staypoints, Triplegs
 from trackintel.io import read_positionfixes_gpd
+from trackintel.io.parquet import _write_parquet
 
 FEET2METER = 0.3048
 CRS_WGS84 = 4326
 CRS_CH1903 = 21781
 MZMV_encoding = "latin1"
+SNAPSHOT_VERSION = 1  # increase if the output of the dataset readers changes to invalidate existing snapshots
+GEOLIFE_EPOCH_OFFSET = 25569  # days between 1899-12-30 (day zero of .plt files) and 1970-01-01
 
 
-def read_geolife(geolife_path, print_progress=False):
+def read_geolife(geolife_path, print_progress=False, n_jobs=1, cache_dir=None):
     """
     Read raw geolife data and return trackintel positionfixes.
 
@@ -35,6 +44,14 @@ def read_geolife(geolife_path, print_progress=False):
     print_progress: Bool, default False
         Show per-user progress if set to True.
 
+    n_jobs: int, default 1
+        The maximum number of users read concurrently (in threads). If -1 all CPUs are used.
+
+    cache_dir: str, optional
+        If given, the parsed positionfixes and labels are stored as parquet snapshot in this directory and
+        read from there on subsequent calls. The snapshot is invalidated automatically if any file
+        in ``geolife_path`` is added, removed or modified. Requires pyarrow.
+
     Returns
     -------
     gdf: Positionfixes
@@ -112,12 +129,39 @@ def read_geolife(geolife_path, print_progress=False):
             )
             raise ValueError(errmsg) from err
 
+    if cache_dir is not None:
+        snapshot = _snapshot_dir(cache_dir, "geolife", geolife_path)
+        frames = _read_snapshot(snapshot)
+        if frames is not None:
+            labels = frames.get("labels")
+            labels = {} if labels is None else {user_id: df.droplevel(0) for user_id, df in labels.groupby(level=0)}
+            return Positionfixes(frames["pfs"]), labels
+
     labels = _get_labels(geolife_path, uids)
-    # get the dfs in form of an generator and concatinate them
-    gdf = pd.concat(_get_df(geolife_path, uids, print_progress), axis=0, ignore_index=True)
+
+    # parse the files of each user into arrays and concatenate them once
+    files = [glob.glob(os.path.join(geolife_path, user_id, "Trajectory", "*.plt")) for user_id in uids]
+    arrays = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_read_plt_files)(paths) for paths in tqdm(files, disable=not print_progress)
+    )
+    latitude, longitude, elevation, tracked_at = (np.concatenate(a) for a in zip(*arrays))
+    gdf = pd.DataFrame(
+        {
+            "elevation": elevation,
+            "tracked_at": pd.to_datetime(tracked_at, unit="s", utc=True),
+            "geom": gpd.points_from_xy(longitude, latitude),
+            "user_id": np.repeat([int(user_id) for user_id in uids], [len(a[0]) for a in arrays]),
+        }
+    )
     gdf = Positionfixes(gdf, geometry="geom", crs=CRS_WGS84)
     gdf["accuracy"] = np.nan
     gdf.index.name = "id"
+
+    if cache_dir is not None:
+        frames = {"pfs": gdf}
+        if labels:
+            frames["labels"] = pd.concat(labels, names=["user_id", None])
+        _write_snapshot(snapshot, frames)
     return gdf, labels
 
 
@@ -157,41 +201,42 @@ def _get_labels(geolife_path, uids):
     return label_dict
 
 
-def _get_df(geolife_path, uids, print_progress):
-    """Create a generator that yields single trajectory dataframes.
+def _read_plt_files(paths):
+    """Parse geolife .plt files into typed arrays.
+
+    The files are joined without their 6 header lines and parsed at once in the fixed 7-column format
+    (latitude, longitude, 0, altitude in feet, days since 1899-12-30, date, time). Timestamps are
+    computed from the day-fraction column, rounded to full seconds like the date and time columns.
 
     Parameters
     ----------
-    geolife_path : str
-        Path to the directory with the geolife data.
-    uids : iterable
-        User folders in the geolife data directory.
-    print_progress : bool
-        Show per-user progress if set to True.
+    paths : list of str
+        Paths to the .plt files.
 
-    Yields
+    Returns
     -------
-    pd.DataFrame
-        A single DataFrame from a single trajectory file.
+    latitude, longitude, elevation : np.ndarray
+        Float arrays, elevation is converted to meters.
 
-    Notes
-    -----
-    No further checks are done on user ids, they must be convertable to ints.
+    tracked_at : np.ndarray
+        Integer array with the UTC timestamps in seconds since the unix epoch.
     """
-    disable = not print_progress
-    names = ["latitude", "longitude", "zeros", "elevation", "date days", "date", "time"]
-    usecols = ["latitude", "longitude", "elevation", "date", "time"]
-
-    for user_id in tqdm(uids, disable=disable):
-        pattern = os.path.join(geolife_path, user_id, "Trajectory", "*.plt")
-        for traj_file in glob.glob(pattern):
-            data = pd.read_csv(traj_file, skiprows=6, header=None, names=names, usecols=usecols)
-            data["tracked_at"] = pd.to_datetime(data["date"] + " " + data["time"], format="%Y-%m-%d %H:%M:%S", utc=True)
-            data["geom"] = gpd.points_from_xy(data["longitude"], data["latitude"])
-            data["user_id"] = int(user_id)
-            data["elevation"] = data["elevation"] * FEET2METER
-            data.drop(columns=["date", "time", "longitude", "latitude"], inplace=True)
-            yield data
+    contents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n", 6)
+        content = lines[6] if len(lines) > 6 else b""
+        if content and not content.endswith(b"\n"):
+            content += b"\n"
+        contents.append(content)
+    content = b"".join(contents)
+    if not content.strip():
+        return tuple(np.empty(0, dtype=dtype) for dtype in ["float64", "float64", "float64", "int64"])
+
+    data = pd.read_csv(io.BytesIO(content), header=None, usecols=[0, 1, 3, 4], dtype=np.float64).to_numpy()
+    latitude, longitude, elevation, days = data.T
+    tracked_at = np.rint((days - GEOLIFE_EPOCH_OFFSET) * 86400).astype(np.int64)
+    return latitude, longitude, elevation * FEET2METER, tracked_at
 
 
 def geolife_add_modes_to_triplegs(
@@ -215,11 +260,11 @@ def geolife_add_modes_to_triplegs(
         How much a label needs to overlap a tripleg to assign a the to this tripleg.
 
     max_triplegs : int, default 20
-        Number of neighbors that are considered in the search for matching triplegs.
+        Deprecated, has no effect and warns if set. All triplegs that overlap a label are considered for matching.
 
     max_duration_tripleg : float, default 7 * 24 * 60 * 60 (seconds)
-        Used for a primary filter. All triplegs that are further away in time than 'max_duration_tripleg' from a
-        label won't be considered for matching.
+        Deprecated, has no effect and warns if set. Only triplegs that overlap a label in time are considered for
+        matching.
 
     Returns
     -------
@@ -231,6 +276,9 @@ def geolife_add_modes_to_triplegs(
     In the case that several labels overlap with the same tripleg the label with the highest overlap (relative to the
     tripleg) is chosen
 
+    The overlapping tripleg-label pairs of each user are found with a sort-sweep interval join, such that the
+    matching scales with the number of overlapping pairs instead of the number of triplegs times labels.
+
     Example
     ----------
     >>> from trackintel.io import read_geolife, geolife_add_modes_to_triplegs
@@ -239,79 +287,46 @@ def geolife_add_modes_to_triplegs(
     >>> pfs, tpls = pfs.generate_triplegs(sp)
     >>> tpls = geolife_add_modes_to_triplegs(tpls, mode_labels)
     """
+    if max_triplegs != 20 or max_duration_tripleg != 7 * 24 * 60 * 60:
+        warnings.warn(
+            "The arguments 'max_triplegs' and 'max_duration_tripleg' are deprecated and have no effect, they will be"
+            " removed in future releases.",
+            DeprecationWarning,
+        )
+
     tpls = triplegs.copy()
-    # temp time fields for nn query
-    tpls["started_at_s"] = (tpls["started_at"] - pd.Timestamp("1970-01-01", tz="utc")) // pd.Timedelta("1s")
-    tpls["finished_at_s"] = (tpls["finished_at"] - pd.Timestamp("1970-01-01", tz="utc")) // pd.Timedelta("1s")
-    # tpls_id_mode_list is used to collect tripleg-mode matches. It will be filled with dictionaries with the
-    # following keys: [id', 'label_id', 'mode']
+    # tpls_id_mode_list is used to collect tripleg-mode matches. It will be filled with dataframes with the
+    # following columns: [id', 'label_id', 'mode', 'ratio']
     tpls_id_mode_list = list()
+    user_positions = tpls.groupby("user_id").indices
 
-    for user_this in labels.keys():
-        tpls_this = tpls[tpls["user_id"] == user_this]
-        labels_this = labels[user_this]
-
-        labels_this["started_at_s"] = (
-            labels_this["started_at"] - pd.Timestamp("1970-01-01", tz="utc")
-        ) // pd.Timedelta("1s")
-        labels_this["finished_at_s"] = (
-            labels_this["finished_at"] - pd.Timestamp("1970-01-01", tz="utc")
-        ) // pd.Timedelta("1s")
-
-        # fit search tree on timestamps
-        if tpls_this.shape[0] < max_triplegs:
-            max_triplegs = tpls_this.shape[0]
-        nn = NearestNeighbors(n_neighbors=max_triplegs, metric="chebyshev")
-        nn.fit(tpls_this[["started_at_s", "finished_at_s"]])
-
-        # find closest neighbours for timestamps in labels
-        distances, candidates = nn.kneighbors(labels_this[["started_at_s", "finished_at_s"]])
+    for user_this, labels_this in labels.items():
+        if user_this not in user_positions:
+            continue
+        tpls_this = tpls.iloc[user_positions[user_this]]
+        tpls_id_mode_list.append(_calc_overlap_for_candidates(tpls_this, labels_this, ratio_threshold))
 
-        # filter anything above max_duration_tripleg (max distance start or end)
-        pre_filter = distances > max_duration_tripleg
-
-        candidates = pd.DataFrame(candidates, dtype="Int64")
-        candidates[pre_filter] = np.nan
-        candidates.dropna(how="all", inplace=True)
-
-        # collect the tripleg - mode matches in the
-        tpls_id_mode_list.extend(_calc_overlap_for_candidates(candidates, tpls_this, labels_this, ratio_threshold))
-
-    if len(tpls_id_mode_list) == 0:
+    tpls_id_mode = pd.concat(tpls_id_mode_list) if tpls_id_mode_list else pd.DataFrame()
+    if len(tpls_id_mode) == 0:
         tpls["mode"] = np.nan
     else:
-        tpls_id_mode = pd.DataFrame(tpls_id_mode_list)
-
-        # chose label with highest overlap
-        tpls_id_mode = tpls_id_mode.sort_values(by=["id", "ratio"])
+        # chose label with highest overlap (ties are resolved by the label id)
+        tpls_id_mode = tpls_id_mode.sort_values(by=["id", "ratio", "label_id"])
         # keep last (df sorted ascending)
         tpls_id_mode = tpls_id_mode.drop_duplicates(subset="id", keep="last").set_index("id")
 
-        tpls = tpls.join(tpls_id_mode)
+        tpls = tpls.join(tpls_id_mode.drop(columns="ratio"))
         tpls = tpls.astype({"label_id": "Int64"})
 
-    tpls.drop(["started_at_s", "finished_at_s"], axis=1, inplace=True)
-
-    try:
-        tpls.drop(["ratio"], axis=1, inplace=True)
-    except KeyError:
-        pass
-
     return tpls
 
 
-def _calc_overlap_for_candidates(candidates, tpls_this, labels_this, ratio_threshold):
+def _calc_overlap_for_candidates(tpls_this, labels_this, ratio_threshold):
     """
-    Iterate all candidate triplegs and labels for a single user.
+    Match all overlapping triplegs and labels for a single user.
 
     Parameters
     ----------
-    candidates : DataFrame
-        A dataframe that has the following properties:
-        index = Reference to position in the label_this dataframe
-        columns: nb of neighbors, sorted by temporal distance
-        values: Reference to position in the tpls_this dataframe
-
     tpls_this : Triplegs
         triplegs of a single user
 
@@ -323,50 +338,35 @@ def _calc_overlap_for_candidates(candidates, tpls_this, labels_this, ratio_thres
 
     Returns
     -------
-    tpls_id_mode_list : list
-        tpls_id_mode_list is used to collect tripleg-mode matches. It will be filled with dictionaries with the
-        following keys: [id', 'label_id', 'mode']
+    tpls_id_mode : DataFrame
+        Tripleg-mode matches with the columns ['id', 'label_id', 'mode', 'ratio'].
 
     Notes
     -----
-    Candidates is a matrix with one row per label and where each column corresponds to a potential tripleg match. All
-    potential tripleg matches that are overlapped (in time) by more than ratio_threshold by a label are
-    assigned this label.
+    All triplegs that are overlapped (in time) by more than ratio_threshold by a label are assigned this label.
     """
-    tpls_id_mode_list = []
-
-    # iterate all rows
-    for label_pos, row in candidates.iterrows():
-        potential_label = labels_this.iloc[label_pos, :]
-        # for every row, iterate all columns. Unused column index would indicate the nth column.
-        for _, tpls_pos in row.items():
-            # skip if tripleg was prefiltered and set to nan
-            if pd.isna(tpls_pos):
-                continue
-
-            potential_tripleg = tpls_this.iloc[tpls_pos, :]
-            ratio_this = calc_temp_overlap(
-                potential_tripleg["started_at"],
-                potential_tripleg["finished_at"],
-                potential_label["started_at"],
-                potential_label["finished_at"],
-            )
-
-            if ratio_this >= ratio_threshold:
-                # assign label to tripleg (by storing matching in dictionary)
-                tpls_id_mode_list.append(
-                    {
-                        "id": potential_tripleg.name,
-                        "label_id": potential_label.name,
-                        "mode": potential_label["mode"],
-                        "ratio": ratio_this,
-                    }
-                )
-
-    return tpls_id_mode_list
+    pos_tpls, pos_labels = _interval_overlap_join(
+        tpls_this["started_at"], tpls_this["finished_at"], labels_this["started_at"], labels_this["finished_at"]
+    )
+    ratio = calc_temp_overlap(
+        tpls_this["started_at"].iloc[pos_tpls],
+        tpls_this["finished_at"].iloc[pos_tpls],
+        labels_this["started_at"].iloc[pos_labels],
+        labels_this["finished_at"].iloc[pos_labels],
+    )
+    match = ratio >= ratio_threshold
+    pos_tpls, pos_labels = pos_tpls[match], pos_labels[match]
+    return pd.DataFrame(
+        {
+            "id": tpls_this.index[pos_tpls],
+            "label_id": labels_this.index[pos_labels],
+            "mode": labels_this["mode"].to_numpy()[pos_labels],
+            "ratio": ratio[match],
+        }
+    )
 
 
-def read_mzmv(mzmv_path):
+def read_mzmv(mzmv_path, cache_dir=None):
     """Read the data from Swiss "Mikrozensus Mobilität und Verkehr"
 
     Parameters
@@ -374,6 +374,11 @@ def read_mzmv(mzmv_path):
     mzmv_path : str
         Path to unzipped data folder of MZMV (everything else should be left zipped).
 
+    cache_dir : str, optional
+        If given, the parsed trips, staypoints and triplegs are stored as parquet snapshot in this directory and
+        read from there on subsequent calls. The snapshot is invalidated automatically if any file
+        in ``mzmv_path`` is added, removed or modified. Requires pyarrow.
+
     Returns
     -------
     trips : Trips
@@ -392,6 +397,12 @@ def read_mzmv(mzmv_path):
     Since the MZMV data contains only time information and no date information, the data is set to 1970-01-01.
     Additional geometry available are the verification points in the columns "VP_XY" and "VP_XY_CH1903"
     """
+    if cache_dir is not None:
+        snapshot = _snapshot_dir(cache_dir, "mzmv", mzmv_path)
+        frames = _read_snapshot(snapshot)
+        if frames is not None:
+            return frames["trips"], Staypoints(frames["sp"]), Triplegs(frames["tpls"])
+
     shp = os.path.join(mzmv_path, "5_Routen(Geometriefiles)\\CH_routen.zip")
     db_csv = os.path.join(mzmv_path, "4_DB_csv\\CH_CSV.zip")
 
@@ -452,6 +463,8 @@ def read_mzmv(mzmv_path):
     trips = trips.merge(prev_trip, left_index=True, right_on="prev_trip_id")
     trips = trips.merge(next_trip, left_index=True, right_on="next_trip_id")
 
+    if cache_dir is not None:
+        _write_snapshot(snapshot, {"trips": trips, "sp": sp, "tpls": tpls})
     return trips, sp, tpls
 
 
@@ -686,6 +699,102 @@ def _mzmv_generate_sp(tpls, zf):
     return sp
 
 
+def _snapshot_dir(cache_dir, name, source_path):
+    """Directory of the snapshot of a dataset, keyed by the source path and the state of all its files.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory containing the snapshots.
+
+    name : str
+        Name of the dataset reader, e.g. "geolife".
+
+    source_path : str
+        Directory of the raw dataset.
+
+    Returns
+    -------
+    str
+        "<cache_dir>/<name>-<hash of source path>-<hash of file list, sizes and mtimes>"
+    """
+    files = []
+    for root, _, filenames in os.walk(source_path):
+        for filename in filenames:
+            stat = os.stat(os.path.join(root, filename))
+            files.append((os.path.relpath(os.path.join(root, filename), source_path), stat.st_size, stat.st_mtime_ns))
+    source = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:16]
+    state = hashlib.sha1(repr((SNAPSHOT_VERSION, sorted(files))).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{name}-{source}-{state}")
+
+
+def _read_snapshot(snapshot):
+    """Read all frames of a snapshot memory-mapped, returns None if there is no snapshot.
+
+    Parameters
+    ----------
+    snapshot : str
+        Snapshot directory.
+
+    Returns
+    -------
+    dict or None
+        Dictionary with the file names (without suffix) as keys and the (Geo)DataFrames as values.
+    """
+    import pyarrow.parquet as pq
+
+    if not os.path.isdir(snapshot):
+        return None
+    frames = {}
+    for filename in sorted(os.listdir(snapshot)):
+        path = os.path.join(snapshot, filename)
+        metadata = pq.read_schema(path).metadata or {}
+        read = gpd.read_parquet if b"geo" in metadata else pd.read_parquet
+        frames[os.path.splitext(filename)[0]] = read(path, memory_map=True)
+    return frames
+
+
+def _write_snapshot(snapshot, frames):
+    """Write frames as parquet files into a snapshot directory.
+
+    The snapshot is written into a temporary directory and renamed once complete, such that readers never see
+    partial snapshots. Outdated snapshots of the same source are removed.
+
+    Parameters
+    ----------
+    snapshot : str
+        Snapshot directory, see `_snapshot_dir`.
+
+    frames : dict
+        Dictionary of file names (without suffix) and (Geo)DataFrames to store.
+    """
+    tmp = f"{snapshot}.tmp-{uuid.uuid4().hex}"
+    os.makedirs(tmp)
+    for name, df in frames.items():
+        # additional geometry columns of shapely objects (e.g. "VP_XY" of mzmv) have to be GeoSeries
+        geom_cols = [col for col in df.columns[(df.dtypes == object).to_numpy()] if _holds_geometries(df[col])]
+        if geom_cols:
+            df = df.copy(deep=False)
+            for col in geom_cols:
+                df[col] = gpd.GeoSeries(df[col])
+        _write_parquet(df, os.path.join(tmp, f"{name}.parquet"))
+
+    prefix = snapshot.rsplit("-", 1)[0]
+    for outdated in glob.glob(f"{glob.escape(prefix)}-*"):
+        if outdated != snapshot and ".tmp-" not in outdated:
+            shutil.rmtree(outdated, ignore_errors=True)
+    try:
+        os.rename(tmp, snapshot)
+    except OSError:  # written concurrently by another process
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _holds_geometries(s):
+    """True if the first non-missing value of the Series is a shapely geometry."""
+    values = s.dropna()
+    return len(values) > 0 and isinstance(values.iloc[0], BaseGeometry)
+
+
 def read_gpx(path):
     """
     Read gpx data and return it as Positionfixes of a single user
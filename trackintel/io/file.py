@@ -16,12 +16,24 @@ from trackintel.model.util import doc, _shared_docs
 
 
 @_index_warning_default_none
-def read_positionfixes_csv(*args, columns=None, tz=None, index_col=None, geom_col="geom", crs=None, **kwargs):
+def read_positionfixes_csv(
+    *args,
+    columns=None,
+    tz=None,
+    index_col=None,
+    geom_col="geom",
+    crs=None,
+    engine=None,
+    chunksize=None,
+    tracked_at_format=None,
+    **kwargs,
+):
     """
     Read positionfixes from csv file.
 
     Wraps the pandas read_csv function, extracts longitude and latitude and
     builds a POINT GeoSeries, extracts datetime from column `tracked_at`.
+    "latitude" and "longitude" are always read as float64.
 
     Parameters
     ----------
@@ -48,12 +60,26 @@ def read_positionfixes_csv(*args, columns=None, tz=None, index_col=None, geom_co
         by pyproj.CRS.from_user_input(), such as an authority string
         (eg 'EPSG:4326') or a WKT string.
 
+    engine : {'c', 'python', 'pyarrow'}, optional
+        Parser engine to use. With 'pyarrow' the file is read by the multithreaded
+        pyarrow csv reader, which is considerably faster for large files. Only a single
+        source and the keyword arguments `sep`, `usecols`, `dtype` and `encoding` are
+        supported with it. Otherwise the engine is passed to pd.read_csv().
+
+    chunksize : int, optional
+        If specified, return a generator where each chunk holds `chunksize` rows and
+        is a validated Positionfixes. With 'pyarrow' the file is streamed batch by batch.
+
+    tracked_at_format : str, optional
+        strftime format of the "tracked_at" column (e.g., '%Y-%m-%d %H:%M:%S').
+        If None the format is inferred.
+
     kwargs
         Additional keyword arguments passed to pd.read_csv().
 
     Returns
     -------
-    pfs : Positionfixes
+    pfs : Positionfixes or generator of Positionfixes
 
     Notes
     -----
@@ -62,6 +88,9 @@ def read_positionfixes_csv(*args, columns=None, tz=None, index_col=None, geom_co
     might be easier to just use the GeoPandas import functions
     :func:`trackintel.io.read_positionfixes_gpd`.
 
+    Reading in chunks keeps memory bounded for exports that do not fit into memory at once.
+    Without `index_col` the default index continues over the chunks.
+
     Examples
     --------
     >>> trackintel.read_positionfixes_csv('data.csv')
@@ -73,16 +102,123 @@ def read_positionfixes_csv(*args, columns=None, tz=None, index_col=None, geom_co
     2     2008-10-23 02:53:15+00:00        0  POINT (116.31842 39.98469)
     3     2008-10-23 02:53:20+00:00        0  POINT (116.31839 39.98469)
     4     2008-10-23 02:53:25+00:00        0  POINT (116.31826 39.98465)
+    >>> for pfs in trackintel.read_positionfixes_csv('data.csv', engine='pyarrow', chunksize=10_000_000):
+    ...     pfs.generate_staypoints()
     """
     columns = {} if columns is None else columns
+    raw_names = {v: k for k, v in columns.items()}
+    # explicit schema for the coordinates, avoids type inference (and int columns for the first chunk)
+    dtype = kwargs.pop("dtype", None)
+    if dtype is None or isinstance(dtype, dict):
+        coordinates = {raw_names.get(c, c): "float64" for c in ["latitude", "longitude"]}
+        dtype = {**coordinates, **(dtype or {})}
+
+    if engine == "pyarrow":
+        chunks = _read_csv_arrow(
+            *args,
+            index_col=index_col,
+            chunksize=chunksize,
+            dtype=dtype,
+            timestamp_format=tracked_at_format,
+            **kwargs,
+        )
+    else:
+        chunks = pd.read_csv(*args, index_col=index_col, engine=engine, chunksize=chunksize, dtype=dtype, **kwargs)
+
+    def read_chunk(df):
+        df.rename(columns=columns, inplace=True)
+        df["tracked_at"] = pd.to_datetime(df["tracked_at"], format=tracked_at_format)
+        df[geom_col] = gpd.points_from_xy(df["longitude"], df["latitude"])
+        df.drop(columns=["longitude", "latitude"], inplace=True)
+        return read_positionfixes_gpd(df, geom_col=geom_col, crs=crs, tz=tz)
+
+    if chunksize is None:
+        return read_chunk(chunks)
+    return (read_chunk(df) for df in chunks)
+
+
+def _read_csv_arrow(
+    source, index_col=None, chunksize=None, dtype=None, timestamp_format=None, sep=",", usecols=None, encoding="utf8"
+):
+    """Read a csv file with pyarrow into a DataFrame or a generator of DataFrames.
 
-    df = pd.read_csv(*args, index_col=index_col, **kwargs)
-    df.rename(columns=columns, inplace=True)
+    Parameters
+    ----------
+    source : str or file-like
+        File to read.
+
+    index_col : str, optional
+        Column to set as index. If None a RangeIndex continuing over the chunks is used.
+
+    chunksize : int, optional
+        Number of rows per chunk. If None the whole file is read at once.
+
+    dtype : dict, optional
+        Mapping from column name to type.
+
+    timestamp_format : str, optional
+        strftime format tried before ISO8601 when inferring timestamp columns.
+
+    sep, encoding
+        As in pd.read_csv().
 
-    df["tracked_at"] = pd.to_datetime(df["tracked_at"])
-    df[geom_col] = gpd.points_from_xy(df["longitude"], df["latitude"])
-    df.drop(columns=["longitude", "latitude"], inplace=True)
-    return read_positionfixes_gpd(df, geom_col=geom_col, crs=crs, tz=tz)
+    usecols : list of str, optional
+        Names of the columns to read.
+
+    Returns
+    -------
+    DataFrame or generator of DataFrames
+    """
+    import pyarrow as pa
+    from pyarrow import csv
+
+    if dtype is not None and not isinstance(dtype, dict):
+        raise ValueError(f"dtype must be a dict mapping column names to types for engine 'pyarrow', but got {dtype}.")
+    column_types = {c: pa.from_numpy_dtype(pd.api.types.pandas_dtype(t)) for c, t in (dtype or {}).items()}
+    timestamp_parsers = [csv.ISO8601] if timestamp_format is None else [timestamp_format, csv.ISO8601]
+    options = {
+        "read_options": csv.ReadOptions(encoding=encoding),
+        "parse_options": csv.ParseOptions(delimiter=sep),
+        "convert_options": csv.ConvertOptions(
+            column_types=column_types,
+            timestamp_parsers=timestamp_parsers,
+            include_columns=usecols,
+        ),
+    }
+
+    def to_pandas(table, start):
+        # pandas defaults to nanosecond resolution, keep the result independent of the engine
+        for i, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp("ns", tz=field.type.tz)))
+        df = table.to_pandas()
+        if index_col is not None:
+            return df.set_index(index_col)
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    if chunksize is None:
+        return to_pandas(csv.read_csv(source, **options), 0)
+    return _iter_csv_arrow(csv.open_csv(source, **options), chunksize, to_pandas)
+
+
+def _iter_csv_arrow(reader, chunksize, to_pandas):
+    """Regroup the record batches of a pyarrow csv stream into DataFrames of `chunksize` rows."""
+    import pyarrow as pa
+
+    start = 0
+    batches, n_rows = [], 0
+    with reader:
+        for batch in reader:
+            batches.append(batch)
+            n_rows += batch.num_rows
+            while n_rows >= chunksize:
+                table = pa.Table.from_batches(batches)
+                yield to_pandas(table.slice(0, chunksize), start)
+                start += chunksize
+                batches, n_rows = table.slice(chunksize).to_batches(), n_rows - chunksize
+        if n_rows > 0:
+            yield to_pandas(pa.Table.from_batches(batches, schema=reader.schema), start)
 
 
 def write_positionfixes_csv(positionfixes, filename, *args, **kwargs):
@@ -411,6 +411,10 @@ def _localize_timestamp(dt_series, pytz_tzinfo, col_name):
     """
     Add timezone info to timestamp.
 
+    Naive timestamps are localized to `pytz_tzinfo`, timezone aware timestamps are converted to it.
+    Datetime dtypes are handled with vectorized operations, object columns (e.g., strings) are parsed
+    in one go and only genuinely mixed columns (naive and aware or differing timezones) are parsed per element.
+
     Parameters
     ----------
     dt_series : pandas.Series
@@ -431,16 +435,28 @@ def _localize_timestamp(dt_series, pytz_tzinfo, col_name):
         warnings.warn(f"Assuming UTC timezone for column {col_name}")
         pytz_tzinfo = "utc"
 
-    def localize(ts, tz):
-        """Localize ts if tz is not set else leave it be"""
-        ts = pd.Timestamp(ts)
-        if ts.tz is not None:
-            return ts
-        return pd.Timestamp.tz_localize(ts, tz)
-
-    # localize all datetimes without a timezone
-    dt_series = dt_series.apply(localize, tz=pytz_tzinfo)
-    # create a Timeseries (utc=False will create warning)
-    dt_series = pd.to_datetime(dt_series, utc=True)
-    # convert it back to right tz
+    if not pd.api.types.is_datetime64_any_dtype(dt_series.dtype):
+        try:
+            with warnings.catch_warnings():
+                # pandas warns on mixed offsets and returns an object column that we handle below
+                warnings.simplefilter("ignore", FutureWarning)
+                parsed = pd.to_datetime(dt_series)
+        except ValueError:
+            parsed = dt_series
+        if not pd.api.types.is_datetime64_any_dtype(parsed.dtype):
+            return _localize_mixed(dt_series, pytz_tzinfo)
+        dt_series = parsed
+
+    if dt_series.dt.tz is None:
+        dt_series = dt_series.dt.tz_localize(pytz_tzinfo)
     return dt_series.dt.tz_convert(pytz_tzinfo)
+
+
+def _localize_mixed(dt_series, pytz_tzinfo):
+    """Localize a series mixing naive and timezone aware timestamps by splitting it into both groups."""
+    dt_series = dt_series.map(pd.Timestamp)
+    aware = dt_series.map(lambda ts: ts.tz is not None).astype(bool)
+    localized = pd.Series(pd.NaT, index=dt_series.index, dtype=pd.DatetimeTZDtype(tz=pytz_tzinfo))
+    localized[aware] = pd.to_datetime(dt_series[aware], utc=True).dt.tz_convert(pytz_tzinfo)
+    localized[~aware] = pd.to_datetime(dt_series[~aware]).dt.tz_localize(pytz_tzinfo)
+    return localized.rename(dt_series.name)
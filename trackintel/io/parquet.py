@@ -0,0 +1,494 @@
+import json
+import os
+import uuid
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from trackintel import Locations, Positionfixes, Staypoints, Tours, Triplegs, Trips, TripsDataFrame
+from trackintel.io.util import _utc_timestamp
+from trackintel.model.util import doc, _shared_docs
+
+_time_filter_doc = """
+start : datetime-like, optional
+    Only read {long} {relation} start. Naive timestamps are interpreted as UTC.
+
+end : datetime-like, optional
+    Only read {long} {relation_end} end. Naive timestamps are interpreted as UTC.
+"""
+
+_time_example = ', start="2023-01-01", end="2023-02-01"'
+
+
+def _read_doc(long, short, model, required, relation, relation_end):
+    time_filter = (
+        "" if relation is None else _time_filter_doc.format(long=long, relation=relation, relation_end=relation_end)
+    )
+    return doc(
+        _shared_docs["read_parquet"],
+        long=long,
+        short=short,
+        model=model,
+        required=required,
+        time_filter=time_filter,
+        time_example="" if relation is None else _time_example,
+    )
+
+
+@_read_doc(
+    "positionfixes", "pfs", "Positionfixes", "['user_id', 'tracked_at']", "tracked at or after", "tracked before"
+)
+def read_positionfixes_parquet(path, columns=None, user_id=None, start=None, end=None, filters=None, **kwargs):
+    df = _read_parquet(
+        path, ["user_id", "tracked_at"], columns, user_id, ("tracked_at", "tracked_at"), start, end, filters, **kwargs
+    )
+    return Positionfixes(df)
+
+
+@doc(_shared_docs["write_parquet"], first_arg="\npositionfixes : Positionfixes\n", long="positionfixes", short="pfs")
+def write_positionfixes_parquet(positionfixes, path, **kwargs):
+    _write_parquet(positionfixes, path, **kwargs)
+
+
+@_read_doc(
+    "staypoints",
+    "sp",
+    "Staypoints",
+    "['user_id', 'started_at', 'finished_at']",
+    "that finished at or after",
+    "that started before",
+)
+def read_staypoints_parquet(path, columns=None, user_id=None, start=None, end=None, filters=None, **kwargs):
+    df = _read_parquet(
+        path,
+        ["user_id", "started_at", "finished_at"],
+        columns,
+        user_id,
+        ("started_at", "finished_at"),
+        start,
+        end,
+        filters,
+        **kwargs,
+    )
+    return Staypoints(df)
+
+
+@doc(_shared_docs["write_parquet"], first_arg="\nstaypoints : Staypoints\n", long="staypoints", short="sp")
+def write_staypoints_parquet(staypoints, path, **kwargs):
+    _write_parquet(staypoints, path, **kwargs)
+
+
+@_read_doc(
+    "triplegs",
+    "tpls",
+    "Triplegs",
+    "['user_id', 'started_at', 'finished_at']",
+    "that finished at or after",
+    "that started before",
+)
+def read_triplegs_parquet(path, columns=None, user_id=None, start=None, end=None, filters=None, **kwargs):
+    df = _read_parquet(
+        path,
+        ["user_id", "started_at", "finished_at"],
+        columns,
+        user_id,
+        ("started_at", "finished_at"),
+        start,
+        end,
+        filters,
+        **kwargs,
+    )
+    return Triplegs(df)
+
+
+@doc(_shared_docs["write_parquet"], first_arg="\ntriplegs : Triplegs\n", long="triplegs", short="tpls")
+def write_triplegs_parquet(triplegs, path, **kwargs):
+    _write_parquet(triplegs, path, **kwargs)
+
+
+@_read_doc("locations", "locs", "Locations", "['user_id']", None, None)
+def read_locations_parquet(path, columns=None, user_id=None, filters=None, **kwargs):
+    df = _read_parquet(path, ["user_id"], columns, user_id, None, None, None, filters, **kwargs)
+    return Locations(df)
+
+
+@doc(_shared_docs["write_parquet"], first_arg="\nlocations : Locations\n", long="locations", short="locs")
+def write_locations_parquet(locations, path, **kwargs):
+    _write_parquet(locations, path, **kwargs)
+
+
+@_read_doc(
+    "trips",
+    "trips",
+    "Trips",
+    "['user_id', 'started_at', 'finished_at', 'origin_staypoint_id', 'destination_staypoint_id']",
+    "that finished at or after",
+    "that started before",
+)
+def read_trips_parquet(path, columns=None, user_id=None, start=None, end=None, filters=None, **kwargs):
+    df = _read_parquet(
+        path,
+        ["user_id", "started_at", "finished_at", "origin_staypoint_id", "destination_staypoint_id"],
+        columns,
+        user_id,
+        ("started_at", "finished_at"),
+        start,
+        end,
+        filters,
+        **kwargs,
+    )
+    _arrays_to_lists(df, "tour_id")
+    return Trips(df)
+
+
+@doc(_shared_docs["write_parquet"], first_arg="\ntrips : Trips\n", long="trips", short="trips")
+def write_trips_parquet(trips, path, **kwargs):
+    _write_parquet(trips, path, **kwargs)
+
+
+@_read_doc(
+    "tours",
+    "tours",
+    "Tours",
+    "['user_id', 'started_at', 'finished_at']",
+    "that finished at or after",
+    "that started before",
+)
+def read_tours_parquet(path, columns=None, user_id=None, start=None, end=None, filters=None, **kwargs):
+    df = _read_parquet(
+        path,
+        ["user_id", "started_at", "finished_at"],
+        columns,
+        user_id,
+        ("started_at", "finished_at"),
+        start,
+        end,
+        filters,
+        **kwargs,
+    )
+    _arrays_to_lists(df, "trips")
+    return Tours(df)
+
+
+def _arrays_to_lists(df, column):
+    """Convert the arrays of a parquet list column back to lists (in place), missing values are read as NaN."""
+    if column in df.columns:
+        df[column] = df[column].map(lambda x: x.tolist() if isinstance(x, np.ndarray) else np.nan)
+
+
+@doc(_shared_docs["write_parquet"], first_arg="\ntours : Tours\n", long="tours", short="tours")
+def write_tours_parquet(tours, path, **kwargs):
+    _write_parquet(tours, path, **kwargs)
+
+
+def write_parquet_dataset(data, path, n_buckets=16, **kwargs):
+    """
+    Write a trackintel model to a Hive-partitioned parquet dataset.
+
+    The data is partitioned by a hash of the user id (``user_bucket=...``) and by the local date of the time column
+    (``date=YYYY-MM-DD``, 'tracked_at' for positionfixes, 'started_at' otherwise). Locations are only partitioned by
+    user. Writing to an existing dataset appends new files to the partitions, the model, number of buckets and
+    timezone have to be the same as in the existing dataset. Empty data cannot be written.
+
+    Parameters
+    ----------
+    data : Positionfixes, Staypoints, Triplegs, Locations, Trips or Tours
+        The data to write.
+
+    path : str or path-like
+        Root directory of the dataset.
+
+    n_buckets : int, default 16
+        Number of user buckets. Must be the same for all writes to a dataset.
+
+    kwargs
+        Additional keyword arguments passed to to_parquet().
+
+    Examples
+    --------
+    >>> ti.io.write_parquet_dataset(pfs, "archive/positionfixes", n_buckets=64)
+    >>> pfs = ti.io.read_parquet_dataset("archive/positionfixes", user_id=[1, 2], start="2023-01-01")
+    """
+    import pyarrow.parquet as pq
+
+    model, time_col = _dataset_model(data)
+    if len(data) == 0:
+        raise ValueError(f"Cannot write empty {model} to a parquet dataset.")
+    meta_file = os.path.join(path, _DATASET_META)
+    meta = {"model": model, "n_buckets": n_buckets, "time_col": time_col, "tz": None, "max_duration": 0}
+    if os.path.exists(meta_file):
+        with open(meta_file) as f:
+            meta = json.load(f)
+        if meta["model"] != model or meta["n_buckets"] != n_buckets:
+            raise ValueError(
+                f"Dataset at {path} contains {meta['model']} with {meta['n_buckets']} buckets,"
+                f" cannot write {model} with {n_buckets} buckets."
+            )
+
+    partitions = {"user_bucket": _user_bucket(data["user_id"], n_buckets)}
+    if time_col is not None:
+        partitions["date"] = data[time_col].dt.strftime("%Y-%m-%d").to_numpy()
+        tz = str(data[time_col].dt.tz)
+        if meta["tz"] is not None and meta["tz"] != tz:
+            raise ValueError(f"Dataset at {path} is stored in timezone {meta['tz']}, cannot write {model} in {tz}.")
+        meta["tz"] = tz
+        if time_col == "started_at":
+            # needed to find records that started before but still overlap a time window
+            max_duration = (data["finished_at"] - data["started_at"]).max().total_seconds()
+            meta["max_duration"] = max(meta["max_duration"], max_duration)
+
+    os.makedirs(path, exist_ok=True)
+    keys = pd.DataFrame(partitions)
+    for key, positions in keys.groupby(list(partitions), sort=False, observed=True).indices.items():
+        key = key if isinstance(key, tuple) else (key,)
+        folder = os.path.join(path, *(f"{name}={value}" for name, value in zip(partitions, key)))
+        os.makedirs(folder, exist_ok=True)
+        file = os.path.join(folder, f"part-{uuid.uuid4().hex}.parquet")
+        _write_parquet(data.iloc[positions], file, **kwargs)
+
+    # schema (incl. geo metadata) at the root, such that readers do not need to open any partition for it
+    pq.write_metadata(pq.read_schema(file), os.path.join(path, "_common_metadata"))
+    with open(meta_file, "w") as f:
+        json.dump(meta, f)
+
+
+def read_parquet_dataset(path, user_id=None, start=None, end=None, columns=None, filters=None, **kwargs):
+    """
+    Read a trackintel model from a Hive-partitioned parquet dataset.
+
+    Only the partitions that can contain the requested users and time window are opened. The returned data is
+    validated as the model it was written as.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Root directory of the dataset written by :func:`trackintel.io.write_parquet_dataset`.
+
+    user_id : scalar or list-like, optional
+        Only read data of these users. Must have the same type as the stored user ids.
+
+    start : datetime-like, optional
+        Only read records tracked (or finished) at or after start. Naive timestamps are interpreted as UTC.
+
+    end : datetime-like, optional
+        Only read records tracked (or started) before end. Naive timestamps are interpreted as UTC.
+
+    columns : list of str, optional
+        Columns to read in addition to the required columns, see the `read_*_parquet` functions.
+
+    filters : pyarrow.compute.Expression or list of tuples, optional
+        Additional row filters in the pyarrow format.
+
+    kwargs
+        Additional keyword arguments passed to read_parquet().
+
+    Returns
+    -------
+    Positionfixes, Staypoints, Triplegs, Locations, Trips or Tours
+
+    Notes
+    -----
+    The rows are returned in the order of the partitions, sort by the index to restore the original order.
+
+    Examples
+    --------
+    >>> sp = ti.io.read_parquet_dataset("archive/staypoints", user_id=1, start="2023-01-01", end="2023-02-01")
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    from pyarrow.parquet import filters_to_expression
+
+    with open(os.path.join(path, _DATASET_META)) as f:
+        meta = json.load(f)
+    fields = [("user_bucket", pa.int32())]
+    if meta["time_col"] is not None:
+        fields.append(("date", pa.string()))
+    kwargs["partitioning"] = ds.partitioning(pa.schema(fields), flavor="hive")
+
+    # prune partitions, the rows are filtered by the reader functions
+    expressions = [] if filters is None else [filters]
+    if filters is not None and not isinstance(filters, pc.Expression):
+        expressions = [filters_to_expression(filters)]
+    if user_id is not None:
+        buckets = np.unique(_user_bucket(np.atleast_1d(user_id), meta["n_buckets"])).tolist()
+        expressions.append(pc.field("user_bucket").isin(pa.array(buckets, type=pa.int32())))
+    if meta["time_col"] is not None and start is not None:
+        first = _utc_timestamp(start).tz_convert(meta["tz"]) - pd.Timedelta(seconds=meta["max_duration"])
+        expressions.append(pc.field("date") >= first.strftime("%Y-%m-%d"))
+    if meta["time_col"] is not None and end is not None:
+        expressions.append(pc.field("date") <= _utc_timestamp(end).tz_convert(meta["tz"]).strftime("%Y-%m-%d"))
+    expression = None
+    for e in expressions:
+        expression = e if expression is None else expression & e
+
+    reader = _DATASET_READERS[meta["model"]]
+    if meta["time_col"] is None:
+        data = reader(path, columns=columns, user_id=user_id, filters=expression, **kwargs)
+    else:
+        data = reader(path, columns=columns, user_id=user_id, start=start, end=end, filters=expression, **kwargs)
+    return data.drop(columns=[name for name, _ in fields if name in data.columns])
+
+
+_DATASET_META = "_trackintel.json"
+
+_DATASET_READERS = {
+    "positionfixes": read_positionfixes_parquet,
+    "staypoints": read_staypoints_parquet,
+    "triplegs": read_triplegs_parquet,
+    "locations": read_locations_parquet,
+    "trips": read_trips_parquet,
+    "tours": read_tours_parquet,
+}
+
+
+def _dataset_model(data):
+    """Name and partition time column of the trackintel model of data."""
+    if isinstance(data, Positionfixes):
+        return "positionfixes", "tracked_at"
+    if isinstance(data, Locations):
+        return "locations", None
+    for model, name in [
+        (Staypoints, "staypoints"),
+        (Triplegs, "triplegs"),
+        (TripsDataFrame, "trips"),
+        (Tours, "tours"),
+    ]:
+        if isinstance(data, model):
+            return name, "started_at"
+    raise TypeError(f"Can only write trackintel models to a parquet dataset, but got {type(data).__name__}.")
+
+
+def _user_bucket(user_id, n_buckets):
+    """Stable hash bucket of user ids, integer ids and string ids are hashed by value."""
+    user_id = pd.Series(user_id)
+    if isinstance(user_id.dtype, pd.CategoricalDtype):
+        # same bucket as the value of the category (e.g. after optimize_dtypes)
+        user_id = user_id.astype(user_id.cat.categories.dtype)
+    if pd.api.types.is_integer_dtype(user_id.dtype):
+        values = user_id.to_numpy(dtype="int64")
+    else:
+        values = user_id.astype(str).to_numpy(dtype=object)
+    return (pd.util.hash_array(values) % n_buckets).astype("int32")
+
+
+def _write_parquet(df, path, **kwargs):
+    """Write (Geo)DataFrame to parquet, static calls as the trackintel models overwrite to_parquet."""
+    # store the index as column such that ids survive filtered reads
+    if kwargs.setdefault("index", True) is not True:
+        raise ValueError("The index is always stored in trackintel parquet files, 'index' must be True.")
+    if isinstance(df, gpd.GeoDataFrame):
+        gpd.GeoDataFrame.to_parquet(df, path, **kwargs)
+    else:
+        pd.DataFrame.to_parquet(df, path, **kwargs)
+
+
+def _read_parquet(path, required, columns, user_id, time_cols, start, end, filters, **kwargs):
+    """
+    Read a (Geo)DataFrame from parquet with column projection and filters on user and time.
+
+    Parameters
+    ----------
+    path : str or path-like
+        The file (or directory of files) to read.
+
+    required : list of str
+        Columns that are always read.
+
+    columns : list of str or None
+        Additional columns to read, None reads all columns.
+
+    user_id : scalar or list-like or None
+        Users to read.
+
+    time_cols : tuple of str or None
+        Names of the start and end column that are compared to `end` and `start`.
+
+    start, end : datetime-like or None
+        Time window to read.
+
+    filters : pyarrow.compute.Expression or list of tuples or None
+        Additional filters.
+
+    kwargs
+        Passed to read_parquet().
+
+    Returns
+    -------
+    GeoDataFrame or DataFrame
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    common_metadata = os.path.join(path, "_common_metadata") if isinstance(path, (str, os.PathLike)) else None
+    if common_metadata is not None and os.path.isfile(common_metadata):
+        schema = pq.read_schema(common_metadata)
+    else:
+        schema = ds.dataset(path, format="parquet", filesystem=kwargs.get("filesystem")).schema
+    geo = json.loads(schema.metadata[b"geo"]) if schema.metadata and b"geo" in schema.metadata else None
+
+    if columns is not None:
+        columns = list(dict.fromkeys(required + list(columns)))
+        if geo is not None and geo["primary_column"] not in columns:
+            columns.append(geo["primary_column"])
+
+    expression = _parquet_filters(schema, user_id, time_cols, start, end, filters)
+    if expression is not None:
+        kwargs["filters"] = expression
+
+    if geo is not None:
+        return gpd.read_parquet(path, columns=columns, **kwargs)
+    return pd.read_parquet(path, columns=columns, **kwargs)
+
+
+def _parquet_filters(schema, user_id=None, time_cols=None, start=None, end=None, filters=None):
+    """
+    Combine the filters on user and time with additional filters to a single pyarrow expression.
+
+    Scalars are cast to the type of the column in the parquet schema, such that e.g. timestamps in any timezone and
+    unit can be compared.
+
+    Parameters
+    ----------
+    schema : pyarrow.Schema
+        Schema of the parquet file.
+
+    user_id : scalar or list-like, optional
+
+    time_cols : tuple of str, optional
+        Names of the start and end column.
+
+    start, end : datetime-like, optional
+
+    filters : pyarrow.compute.Expression or list of tuples, optional
+
+    Returns
+    -------
+    pyarrow.compute.Expression or None
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow.parquet import filters_to_expression
+
+    expressions = []
+    if user_id is not None:
+        user_id = np.atleast_1d(user_id).tolist()
+        expressions.append(pc.field("user_id").isin(pa.array(user_id, type=schema.field("user_id").type)))
+    if start is not None:
+        col = time_cols[1]
+        expressions.append(pc.field(col) >= pa.scalar(_utc_timestamp(start), type=schema.field(col).type))
+    if end is not None:
+        col = time_cols[0]
+        expressions.append(pc.field(col) < pa.scalar(_utc_timestamp(end), type=schema.field(col).type))
+    if filters is not None:
+        if not isinstance(filters, pc.Expression):
+            filters = filters_to_expression(filters)
+        expressions.append(filters)
+
+    if len(expressions) == 0:
+        return None
+    expression = expressions[0]
+    for e in expressions[1:]:
+        expression = expression & e
+    return expression
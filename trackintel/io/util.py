@@ -2,6 +2,8 @@ import warnings
 from functools import wraps
 from inspect import signature
 
+import pandas as pd
+
 
 def _index_warning_default_none(func):
     """Decorator function that warns if index_col None is not set explicit."""
@@ -17,3 +19,9 @@ def _index_warning_default_none(func):
         return func(*args, **kwargs)
 
     return wrapper
+
+
+def _utc_timestamp(t):
+    """Timestamp with timezone, naive timestamps are interpreted as UTC."""
+    t = pd.Timestamp(t)
+    return t.tz_localize("UTC") if t.tz is None else t
@@ -5,6 +5,7 @@ from trackintel.model.util import (
     _register_trackintel_accessor,
     _shared_docs,
     doc,
+    get_validation_level,
 )
 
 _required_columns = ["user_id", "center"]
@@ -40,6 +41,8 @@ class Locations(TrackintelBase, TrackintelGeoDataFrame):
 
     @staticmethod
     def validate(obj):
+        if get_validation_level() == "off":
+            return
         if any([c not in obj.columns for c in _required_columns]):
             raise AttributeError(
                 "To process a DataFrame as a collection of locations, it must have the properties"
@@ -59,9 +62,22 @@ class Locations(TrackintelBase, TrackintelGeoDataFrame):
 
     @doc(_shared_docs["write_postgis"], first_arg="", long="locations", short="locs")
     def to_postgis(
-        self, name, con, schema=None, if_exists="fail", index=True, index_label=None, chunksize=None, dtype=None
+        self,
+        name,
+        con,
+        schema=None,
+        if_exists="fail",
+        index=True,
+        index_label=None,
+        chunksize=None,
+        dtype=None,
+        method=None,
     ):
-        ti.io.write_locations_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype)
+        ti.io.write_locations_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype, method)
+
+    @doc(_shared_docs["write_parquet"], first_arg="", long="locations", short="locs")
+    def to_parquet(self, path, **kwargs):
+        ti.io.write_locations_parquet(self, path, **kwargs)
 
     def spatial_filter(self, areas, method="within", re_project=False):
         """
@@ -1,16 +1,22 @@
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+from pyproj import CRS
 
 import trackintel as ti
 from trackintel.model.util import (
     TrackintelBase,
+    TrackintelDataFrame,
     TrackintelGeoDataFrame,
     _register_trackintel_accessor,
     _shared_docs,
+    _validate_geometries,
     doc,
+    get_validation_level,
 )
 
 _required_columns = ["user_id", "tracked_at"]
+_compact_required_columns = ["user_id", "tracked_at", "x", "y"]
 
 
 @_register_trackintel_accessor("as_positionfixes")
@@ -53,6 +59,8 @@ class Positionfixes(TrackintelBase, TrackintelGeoDataFrame, gpd.GeoDataFrame):
 
     @staticmethod
     def validate(obj):
+        if get_validation_level() == "off":
+            return
         assert obj.shape[0] > 0, f"Geodataframe is empty with shape: {obj.shape}"
         # check columns
         if any([c not in obj.columns for c in _required_columns]):
@@ -66,9 +74,7 @@ class Positionfixes(TrackintelBase, TrackintelGeoDataFrame, gpd.GeoDataFrame):
         ), f"dtype of tracked_at is {obj['tracked_at'].dtype} but has to be datetime64 and timezone aware"
 
         # check geometry
-        assert (
-            obj.geometry.is_valid.all()
-        ), "Not all geometries are valid. Try x[~ x.geometry.is_valid] where x is you GeoDataFrame"
+        _validate_geometries(obj)
 
         if obj.geometry.iloc[0].geom_type != "Point":
             raise TypeError("The geometry must be a Point (only first checked).")
@@ -128,6 +134,22 @@ class Positionfixes(TrackintelBase, TrackintelGeoDataFrame, gpd.GeoDataFrame):
             gap_threshold=gap_threshold,
         )
 
+    def lazy(self):
+        """
+        Start a lazy pipeline on the positionfixes.
+
+        See :class:`trackintel.preprocessing.LazyPipeline` for full documentation.
+        """
+        return ti.preprocessing.LazyPipeline(self)
+
+    def to_compact(self):
+        """
+        Convert positionfixes into the compact columnar representation.
+
+        See :func:`trackintel.CompactPositionfixes.from_positionfixes` for full documentation.
+        """
+        return CompactPositionfixes.from_positionfixes(self)
+
     def to_csv(self, filename, *args, **kwargs):
         """
         Write positionfixes to csv file.
@@ -138,9 +160,24 @@ class Positionfixes(TrackintelBase, TrackintelGeoDataFrame, gpd.GeoDataFrame):
 
     @doc(_shared_docs["write_postgis"], first_arg="", long="positionfixes", short="pfs")
     def to_postgis(
-        self, name, con, schema=None, if_exists="fail", index=True, index_label=None, chunksize=None, dtype=None
+        self,
+        name,
+        con,
+        schema=None,
+        if_exists="fail",
+        index=True,
+        index_label=None,
+        chunksize=None,
+        dtype=None,
+        method=None,
     ):
-        ti.io.write_positionfixes_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype)
+        ti.io.write_positionfixes_postgis(
+            self, name, con, schema, if_exists, index, index_label, chunksize, dtype, method
+        )
+
+    @doc(_shared_docs["write_parquet"], first_arg="", long="positionfixes", short="pfs")
+    def to_parquet(self, path, **kwargs):
+        ti.io.write_positionfixes_parquet(self, path, **kwargs)
 
     def calculate_distance_matrix(self, Y=None, dist_metric="haversine", n_jobs=0, **kwds):
         """
@@ -157,3 +194,193 @@ class Positionfixes(TrackintelBase, TrackintelGeoDataFrame, gpd.GeoDataFrame):
         See :func:`trackintel.geogr.get_speed_positionfixes` for full documentation.
         """
         return ti.geogr.get_speed_positionfixes(self)
+
+    def get_kinematics(self, split_triplegs=False):
+        """
+        Compute speed, acceleration, bearing and turning angle per positionfix.
+
+        See :func:`trackintel.geogr.get_kinematics_positionfixes` for full documentation.
+        """
+        return ti.geogr.get_kinematics_positionfixes(self, split_triplegs=split_triplegs)
+
+    def temporal_tracking_quality(self, granularity="all", resolution="1min", max_gap="5min"):
+        """
+        Calculate per-user temporal tracking quality (temporal coverage).
+
+        See :func:`trackintel.analysis.temporal_tracking_quality_positionfixes` for full documentation.
+        """
+        return ti.analysis.temporal_tracking_quality_positionfixes(
+            self, granularity=granularity, resolution=resolution, max_gap=max_gap
+        )
+
+
+class CompactPositionfixes(TrackintelBase, TrackintelDataFrame, pd.DataFrame):
+    """Trackintel class to treat positionfixes as plain coordinate columns instead of shapely Points.
+
+    Requires at least the following columns:
+    ['user_id', 'tracked_at', 'x', 'y']
+
+    The 'index' of the DataFrame will be treated as unique identifier of the `Positionfixes`.
+    The coordinate reference system of 'x' and 'y' is stored in the attribute `crs`.
+
+    Notes
+    -----
+    Creating and storing one shapely Point per positionfix dominates memory and runtime for large datasets.
+    `CompactPositionfixes` keep the coordinates in two float64 columns and the users as categorical column.
+    :func:`trackintel.preprocessing.generate_staypoints`, :func:`trackintel.geogr.get_speed_positionfixes` and
+    :func:`trackintel.geogr.get_kinematics_positionfixes` work directly on the coordinates, functions that need
+    geometries (e.g., :func:`trackintel.preprocessing.generate_triplegs`) convert to `Positionfixes` internally.
+
+    'tracked_at' is a timezone aware pandas datetime object.
+
+    Examples
+    --------
+    >>> cpfs = pfs.to_compact()
+    >>> cpfs, sp = cpfs.generate_staypoints()
+    >>> pfs = cpfs.to_positionfixes()
+    """
+
+    _metadata = ["crs"]
+    crs = None
+
+    def __init__(self, *args, crs=None, validate=True, **kwargs):
+        data = args[0] if args else kwargs.get("data")
+        super().__init__(*args, **kwargs)
+        if crs is None:
+            crs = getattr(data, "crs", None)
+        self.crs = None if crs is None else CRS.from_user_input(crs)
+        if validate:
+            self.validate(self)
+
+    @staticmethod
+    def validate(obj):
+        if get_validation_level() == "off":
+            return
+        assert obj.shape[0] > 0, f"Dataframe is empty with shape: {obj.shape}"
+        # check columns
+        if any([c not in obj.columns for c in _compact_required_columns]):
+            raise AttributeError(
+                "To process a DataFrame as a collection of compact positionfixes, it must have the properties"
+                f" {_compact_required_columns}, but it has [{', '.join(obj.columns)}]."
+            )
+        # check timestamp dtypes
+        assert isinstance(
+            obj["tracked_at"].dtype, pd.DatetimeTZDtype
+        ), f"dtype of tracked_at is {obj['tracked_at'].dtype} but has to be datetime64 and timezone aware"
+        # check coordinates
+        for c in ["x", "y"]:
+            assert pd.api.types.is_float_dtype(obj[c].dtype), f"dtype of {c} is {obj[c].dtype} but has to be float"
+        if get_validation_level() == "full":
+            assert np.isfinite(obj[["x", "y"]].to_numpy()).all(), "Not all coordinates are finite."
+
+    @classmethod
+    def from_positionfixes(cls, positionfixes):
+        """
+        Convert positionfixes into the compact columnar representation.
+
+        The Point geometries are replaced by the float64 columns 'x' and 'y', 'user_id' is stored as categorical.
+
+        Parameters
+        ----------
+        positionfixes : Positionfixes
+
+        Returns
+        -------
+        CompactPositionfixes
+
+        Examples
+        --------
+        >>> cpfs = ti.CompactPositionfixes.from_positionfixes(pfs)
+        """
+        Positionfixes.validate(positionfixes)
+        geometry = positionfixes.geometry
+        df = pd.DataFrame(positionfixes.drop(columns=geometry.name))
+        df["user_id"] = df["user_id"].astype("category")
+        df["x"] = geometry.x.to_numpy()
+        df["y"] = geometry.y.to_numpy()
+        return cls(df, crs=positionfixes.crs, validate=False)
+
+    def to_positionfixes(self):
+        """
+        Convert into positionfixes with Point geometries.
+
+        The columns 'x' and 'y' are replaced by the geometry column 'geom', a categorical 'user_id' is converted
+        back to the dtype of its categories.
+
+        Returns
+        -------
+        Positionfixes
+
+        Examples
+        --------
+        >>> pfs = cpfs.to_positionfixes()
+        """
+        df = pd.DataFrame(self.drop(columns=["x", "y"]))
+        if isinstance(df["user_id"].dtype, pd.CategoricalDtype):
+            df["user_id"] = df["user_id"].astype(df["user_id"].cat.categories.dtype)
+        geom = gpd.points_from_xy(self["x"], self["y"], crs=self.crs)
+        return Positionfixes(df, geometry=geom, crs=self.crs).rename_geometry("geom")
+
+    def generate_staypoints(
+        self,
+        method="sliding",
+        distance_metric="haversine",
+        dist_threshold=100,
+        time_threshold=5.0,
+        gap_threshold=15.0,
+        include_last=False,
+        print_progress=False,
+        exclude_duplicate_pfs=True,
+        n_jobs=1,
+    ):
+        """
+        Generate staypoints based on positionfixes.
+
+        See :func:`trackintel.preprocessing.generate_staypoints` for full documentation.
+        """
+        return ti.preprocessing.generate_staypoints(
+            self,
+            method=method,
+            distance_metric=distance_metric,
+            dist_threshold=dist_threshold,
+            time_threshold=time_threshold,
+            gap_threshold=gap_threshold,
+            include_last=include_last,
+            print_progress=print_progress,
+            exclude_duplicate_pfs=exclude_duplicate_pfs,
+            n_jobs=n_jobs,
+        )
+
+    def generate_triplegs(
+        self,
+        staypoints=None,
+        method="between_staypoints",
+        gap_threshold=15,
+    ):
+        """
+        Generate triplegs from positionfixes.
+
+        See :func:`trackintel.preprocessing.generate_triplegs` for full documentation.
+        """
+        return ti.preprocessing.generate_triplegs(
+            self,
+            staypoints=staypoints,
+            method=method,
+            gap_threshold=gap_threshold,
+        )
+
+    def get_speed(self):
+        """
+        Compute speed per positionfix (in m/s)
+
+        See :func:`trackintel.geogr.get_speed_positionfixes` for full documentation.
+        """
+        return ti.geogr.get_speed_positionfixes(self)
+
+    def get_kinematics(self, split_triplegs=False):
+        """
+        Compute speed, acceleration, bearing and turning angle per positionfix.
+
+        See :func:`trackintel.geogr.get_kinematics_positionfixes` for full documentation.
+        """
+        return ti.geogr.get_kinematics_positionfixes(self, split_triplegs=split_triplegs)
@@ -7,6 +7,8 @@ from trackintel.model.util import (
     _register_trackintel_accessor,
     doc,
     _shared_docs,
+    _validate_geometries,
+    get_validation_level,
 )
 
 _required_columns = ["user_id", "started_at", "finished_at"]
@@ -52,6 +54,8 @@ class Staypoints(TrackintelBase, TrackintelGeoDataFrame):
 
     @staticmethod
     def validate(obj):
+        if get_validation_level() == "off":
+            return
         # check columns
         if any([c not in obj.columns for c in _required_columns]):
             raise AttributeError(
@@ -67,9 +71,7 @@ class Staypoints(TrackintelBase, TrackintelGeoDataFrame):
         ), f"dtype of finished_at is {obj['finished_at'].dtype} but has to be tz aware datetime64"
 
         # check geometry
-        assert (
-            obj.geometry.is_valid.all()
-        ), "Not all geometries are valid. Try x[~ x.geometry.is_valid] where x is you GeoDataFrame"
+        _validate_geometries(obj)
         if obj.geometry.iloc[0].geom_type != "Point":
             raise TypeError("The geometry must be a Point (only first checked).")
 
@@ -140,9 +142,22 @@ class Staypoints(TrackintelBase, TrackintelGeoDataFrame):
 
     @doc(_shared_docs["write_postgis"], first_arg="", long="staypoints", short="sp")
     def to_postgis(
-        self, name, con, schema=None, if_exists="fail", index=True, index_label=None, chunksize=None, dtype=None
+        self,
+        name,
+        con,
+        schema=None,
+        if_exists="fail",
+        index=True,
+        index_label=None,
+        chunksize=None,
+        dtype=None,
+        method=None,
     ):
-        ti.io.write_staypoints_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype)
+        ti.io.write_staypoints_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype, method)
+
+    @doc(_shared_docs["write_parquet"], first_arg="", long="staypoints", short="sp")
+    def to_parquet(self, path, **kwargs):
+        ti.io.write_staypoints_parquet(self, path, **kwargs)
 
     def temporal_tracking_quality(self, granularity="all"):
         """
@@ -160,18 +175,18 @@ class Staypoints(TrackintelBase, TrackintelGeoDataFrame):
         """
         return ti.preprocessing.generate_trips(self, triplegs, gap_threshold=gap_threshold, add_geometry=add_geometry)
 
-    def radius_gyration(self, method="count", print_progress=False):
+    def radius_gyration(self, method="count", print_progress=False, freq=None):
         """
         Calculate radius for gyration for Staypoints
 
         See :func:`trackintel.analysis.radius_gyration` for full documentation.
         """
-        return ti.analysis.radius_gyration(self, method, print_progress)
+        return ti.analysis.radius_gyration(self, method, print_progress, freq)
 
-    def jump_length(self):
+    def jump_length(self, freq=None):
         """
         Calculate jump length per user between consecutive staypoints.
 
         See :func:`trackintel.analysis.jump_length` for full documentation.
         """
-        return ti.analysis.jump_length(self)
+        return ti.analysis.jump_length(self, freq)
@@ -7,6 +7,7 @@ from trackintel.model.util import (
     _register_trackintel_accessor,
     _shared_docs,
     doc,
+    get_validation_level,
 )
 
 _required_columns = ["user_id", "started_at", "finished_at"]
@@ -48,6 +49,8 @@ class Tours(TrackintelBase, TrackintelDataFrame):
 
     @staticmethod
     def validate(obj):
+        if get_validation_level() == "off":
+            return
         if any([c not in obj.columns for c in _required_columns]):
             raise AttributeError(
                 "To process a DataFrame as a collection of tours, it must have the properties"
@@ -68,6 +71,19 @@ class Tours(TrackintelBase, TrackintelDataFrame):
 
     @doc(_shared_docs["write_postgis"], first_arg="", long="tours", short="tours")
     def to_postgis(
-        self, name, con, schema=None, if_exists="fail", index=True, index_label=None, chunksize=None, dtype=None
+        self,
+        name,
+        con,
+        schema=None,
+        if_exists="fail",
+        index=True,
+        index_label=None,
+        chunksize=None,
+        dtype=None,
+        method=None,
     ):
-        ti.io.write_tours_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype)
+        ti.io.write_tours_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype, method)
+
+    @doc(_shared_docs["write_parquet"], first_arg="", long="tours", short="tours")
+    def to_parquet(self, path, **kwargs):
+        ti.io.write_tours_parquet(self, path, **kwargs)
@@ -6,7 +6,9 @@ from trackintel.model.util import (
     TrackintelGeoDataFrame,
     _register_trackintel_accessor,
     _shared_docs,
+    _validate_geometries,
     doc,
+    get_validation_level,
 )
 
 _required_columns = ["user_id", "started_at", "finished_at"]
@@ -48,6 +50,8 @@ class Triplegs(TrackintelBase, TrackintelGeoDataFrame):
 
     @staticmethod
     def validate(obj):
+        if get_validation_level() == "off":
+            return
         assert obj.shape[0] > 0, f"Geodataframe is empty with shape: {obj.shape}"
         # check columns
         if any([c not in obj.columns for c in _required_columns]):
@@ -65,9 +69,7 @@ class Triplegs(TrackintelBase, TrackintelGeoDataFrame):
         ), f"dtype of finished_at is {obj['finished_at'].dtype} but has to be datetime64 and timezone aware"
 
         # check geometry
-        assert (
-            obj.geometry.is_valid.all()
-        ), "Not all geometries are valid. Try x[~ x.geometry.is_valid] where x is you GeoDataFrame"
+        _validate_geometries(obj)
         if obj.geometry.iloc[0].geom_type != "LineString":
             raise TypeError("The geometry must be a LineString (only first checked).")
 
@@ -77,9 +79,22 @@ class Triplegs(TrackintelBase, TrackintelGeoDataFrame):
 
     @doc(_shared_docs["write_postgis"], first_arg="", long="triplegs", short="tpls")
     def to_postgis(
-        self, name, con, schema=None, if_exists="fail", index=True, index_label=None, chunksize=None, dtype=None
+        self,
+        name,
+        con,
+        schema=None,
+        if_exists="fail",
+        index=True,
+        index_label=None,
+        chunksize=None,
+        dtype=None,
+        method=None,
     ):
-        ti.io.write_triplegs_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype)
+        ti.io.write_triplegs_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype, method)
+
+    @doc(_shared_docs["write_parquet"], first_arg="", long="triplegs", short="tpls")
+    def to_parquet(self, path, **kwargs):
+        ti.io.write_triplegs_parquet(self, path, **kwargs)
 
     def calculate_distance_matrix(self, Y=None, dist_metric="haversine", n_jobs=0, **kwds):
         """
@@ -8,7 +8,9 @@ from trackintel.model.util import (
     TrackintelGeoDataFrame,
     _register_trackintel_accessor,
     _shared_docs,
+    _validate_geometries,
     doc,
+    get_validation_level,
 )
 
 
@@ -96,6 +98,8 @@ class TripsDataFrame(TrackintelBase, TrackintelDataFrame):
 
     @staticmethod
     def validate(obj):
+        if get_validation_level() == "off":
+            return
         if any([c not in obj.columns for c in _required_columns]):
             raise AttributeError(
                 "To process a DataFrame as a collection of trips, it must have the properties"
@@ -116,9 +120,22 @@ class TripsDataFrame(TrackintelBase, TrackintelDataFrame):
 
     @doc(_shared_docs["write_postgis"], first_arg="", long="trips", short="trips")
     def to_postgis(
-        self, name, con, schema=None, if_exists="fail", index=True, index_label=None, chunksize=None, dtype=None
+        self,
+        name,
+        con,
+        schema=None,
+        if_exists="fail",
+        index=True,
+        index_label=None,
+        chunksize=None,
+        dtype=None,
+        method=None,
     ):
-        ti.io.write_trips_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype)
+        ti.io.write_trips_postgis(self, name, con, schema, if_exists, index, index_label, chunksize, dtype, method)
+
+    @doc(_shared_docs["write_parquet"], first_arg="", long="trips", short="trips")
+    def to_parquet(self, path, **kwargs):
+        ti.io.write_trips_parquet(self, path, **kwargs)
 
     def temporal_tracking_quality(self, granularity="all"):
         """
@@ -178,9 +195,9 @@ class TripsGeoDataFrame(TrackintelGeoDataFrame, TripsDataFrame, gpd.GeoDataFrame
 
     @staticmethod
     def validate(self):
+        if get_validation_level() == "off":
+            return
         TripsDataFrame.validate(self)
-        assert (
-            self.geometry.is_valid.all()
-        ), "Not all geometries are valid. Try x[~x.geometry.is_valid] where x is you GeoDataFrame"
+        _validate_geometries(self)
         if self.geometry.iloc[0].geom_type != "MultiPoint":
             raise ValueError("The geometry must be a MultiPoint (only first checked).")
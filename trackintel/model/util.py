@@ -1,10 +1,100 @@
+import logging
 import warnings
+import weakref
 from functools import wraps, partial
 from textwrap import dedent
 
+import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
 
+_validation_levels = ["full", "schema", "off"]
+_options = {"validation_level": "full"}
+
+
+def set_validation_level(level):
+    """
+    Set how thoroughly trackintel classes validate their data.
+
+    Validation runs when a trackintel class is created and at the start of the preprocessing functions.
+
+    Parameters
+    ----------
+    level : {'full', 'schema', 'off'}
+        - full: Check the schema and that all geometries are valid. The result of the geometry scan is kept on
+          the (Geo)DataFrame, such that the same geometries are only scanned once.
+        - schema: Only check the required columns, dtypes and the geometry type of the first row.
+        - off: Skip all checks.
+
+    Notes
+    -----
+    Replacing the geometry (e.g., filtering rows or assigning a new geometry column) creates a new geometry array
+    and therefore triggers a new scan. Copies of a checked (Geo)DataFrame keep the result. Geometries overwritten
+    in place (e.g., with ``.loc``) are not checked again, assign a new geometry column to check them again, e.g.,
+    ``pfs["geom"] = pfs["geom"].copy()``.
+
+    Examples
+    --------
+    >>> ti.set_validation_level("schema")
+    >>> pfs = ti.Positionfixes(gdf)  # no geometry scan
+    >>> ti.set_validation_level("full")
+    """
+    if level not in _validation_levels:
+        raise ValueError(f"level must be one of {_validation_levels}, but got '{level}'.")
+    _options["validation_level"] = level
+
+
+def get_validation_level():
+    """
+    Return the current validation level of trackintel classes.
+
+    See :func:`trackintel.set_validation_level` for the possible levels.
+
+    Returns
+    -------
+    level : str
+
+    Examples
+    --------
+    >>> ti.get_validation_level()
+    'full'
+    """
+    return _options["validation_level"]
+
+
+def _validate_geometries(obj):
+    """Assert that all geometries of obj are valid, runs only once per geometry array of obj with level 'full'."""
+    if _options["validation_level"] != "full":
+        return
+    if _has_valid_geometries(obj):
+        return
+    assert (
+        obj.geometry.is_valid.all()
+    ), "Not all geometries are valid. Try x[~ x.geometry.is_valid] where x is you GeoDataFrame"
+    _set_valid_geometries(obj)
+
+
+def _has_valid_geometries(obj):
+    """Return True if the current geometry array of obj was scanned and all geometries are valid."""
+    ref = obj.__dict__.get("_trackintel_valid_geometries")
+    return ref is not None and ref() is obj.geometry.values
+
+
+def _set_valid_geometries(obj):
+    """Mark the current geometry array of obj as scanned, the weak reference does not keep the array alive."""
+    obj.__dict__["_trackintel_valid_geometries"] = weakref.ref(obj.geometry.values)
+
+
+def _copy_validation(source, target):
+    """Mark the geometries of target as valid if they are an unchanged copy of the validated geometries of source."""
+    if not (isinstance(source, GeoDataFrame) and isinstance(target, GeoDataFrame)) or len(source) != len(target):
+        return
+    try:
+        if _has_valid_geometries(source):
+            _set_valid_geometries(target)
+    except AttributeError:  # no active geometry
+        return
+
 
 def _wrapped_gdf_method(func):
     """Decorator function that downcast types to trackintel class if is (Geo)DataFrame and has the required columns."""
@@ -35,6 +125,13 @@ class TrackintelGeoDataFrame(GeoDataFrame):
     # set fallback_class for missing geometry, if None default to pd.DataFrame
     fallback_class = None
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # GeoDataFrame(gdf) copies the geometry array -> keep the result of a previous geometry scan
+        data = args[0] if args else kwargs.get("data")
+        if isinstance(data, GeoDataFrame) and len(args) <= 1 and kwargs.keys() <= {"data", "validate"}:
+            _copy_validation(data, self)
+
     @property
     def _constructor(self):
         """Interface to subtype pandas properly"""
@@ -62,7 +159,9 @@ class TrackintelGeoDataFrame(GeoDataFrame):
 
     @_wrapped_gdf_method
     def copy(self, deep=True):
-        return super().copy(deep=deep)
+        result = super().copy(deep=deep)
+        _copy_validation(self, result)
+        return result
 
     @_wrapped_gdf_method
     def merge(self, *args, **kwargs):
@@ -84,10 +183,150 @@ class TrackintelBase(object):
 
     # so far we don't have a lot of methods here
     # but a lot of IO code can be moved here.
-    pass
+
+    def optimize_dtypes(self, categorical_threshold=0.5, verbose=False):
+        """
+        Convert the columns into memory efficient dtypes.
+
+        See :func:`trackintel.optimize_dtypes` for full documentation.
+        """
+        return optimize_dtypes(self, categorical_threshold=categorical_threshold, verbose=verbose)
+
+    @property
+    def user_time_index(self):
+        """
+        Sort order of the rows by user and time with the offsets of the users.
+
+        See :func:`trackintel.model.util.get_user_time_index` for full documentation.
+        """
+        return get_user_time_index(self)
+
+    def user_slice(self, user_id):
+        """
+        Return the rows of one user sorted by time.
+
+        Uses the cached :attr:`user_time_index` instead of filtering or grouping the whole table. To iterate over
+        many users, get the index once and use ``index.positions(user_id)``.
+
+        Parameters
+        ----------
+        user_id
+            The user to select.
+
+        Returns
+        -------
+        Same type as self
+            The rows of the user sorted by time.
+
+        Raises
+        ------
+        KeyError
+            If there are no rows for the user.
+
+        Examples
+        --------
+        >>> sp_user = sp.user_slice(0)
+        """
+        return self.take(self.user_time_index.positions(user_id))
+
+
+_time_units = ["s", "ms", "us", "ns"]
+
+
+def optimize_dtypes(obj, categorical_threshold=0.5, verbose=False):
+    """
+    Convert the columns of a trackintel class into memory efficient dtypes.
+
+    - 'user_id' and string columns with few distinct values are converted to categoricals.
+    - Integer columns (including nullable id columns) are downcast to the smallest integer dtype that holds
+      all values.
+    - Timestamps are converted to the coarsest unit ('s', 'ms', 'us' or 'ns') that represents all values exactly.
+
+    The index and geometry columns are not changed.
+
+    Parameters
+    ----------
+    obj : Positionfixes, Staypoints, Triplegs, Locations, Trips, Tours or (Geo)DataFrame
+
+    categorical_threshold : float, default 0.5
+        String columns are converted to categoricals if the number of distinct values divided by the number of
+        rows is at most `categorical_threshold`.
+
+    verbose : bool, default False
+        If True, log the memory usage before and after the conversion (logging level INFO).
+
+    Returns
+    -------
+    obj : same type as input
+        Shallow copy of `obj` with converted columns.
+
+    Notes
+    -----
+    The preprocessing and analysis functions keep categorical user ids, i.e., the staypoints generated from
+    positionfixes with categorical 'user_id' also have categorical 'user_id'.
+
+    Examples
+    --------
+    >>> sp = sp.optimize_dtypes(verbose=True)
+    >>> sp = ti.optimize_dtypes(sp)
+    """
+    result = obj.copy(deep=False)
+    for col in obj.columns:
+        converted = _optimize_column(obj[col], categorical_threshold, col == "user_id")
+        if converted is not None:
+            result[col] = converted
+
+    if verbose:
+        before = obj.memory_usage(deep=True).sum()
+        after = result.memory_usage(deep=True).sum()
+        logging.info(
+            f"Memory usage: {before:,} bytes before, {after:,} bytes after "
+            f"({100 * (before - after) / max(before, 1):.1f}% saved)."
+        )
+    return result
+
+
+def _optimize_column(col, categorical_threshold, categorical):
+    """Return col in the most compact dtype, None if the dtype should not be changed."""
+    dtype = col.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return None
+    if categorical:
+        return col.astype("category")
+    if pd.api.types.is_bool_dtype(dtype):
+        return None
+    if pd.api.types.is_integer_dtype(dtype):
+        downcast = pd.to_numeric(col, downcast="integer")
+        return downcast if downcast.dtype != dtype else None
+    if isinstance(dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(dtype):
+        return _coarsest_time_unit(col)
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        if pd.api.types.infer_dtype(col, skipna=True) != "string":
+            return None
+        if col.nunique() <= categorical_threshold * len(col):
+            return col.astype("category")
+    return None
+
+
+def _coarsest_time_unit(col):
+    """Return col in the coarsest time unit that represents all timestamps exactly, None if unchanged."""
+    unit = col.dt.unit
+    values = col.array.asi8[col.notna().to_numpy()]
+    current = _time_units.index(unit)
+    for coarser in range(current):
+        if np.all(values % 1000 ** (current - coarser) == 0):
+            return col.dt.as_unit(_time_units[coarser])
+    return None
 
 
 class NonCachedAccessor:
+    """
+    Accessor that constructs a new trackintel object on every access.
+
+    Only the result of the geometry scan is kept on the instance, such that unchanged geometries are not scanned
+    again on the next access. All other checks run on every access.
+    """
+
     def __init__(self, name: str, accessor) -> None:
         self._name = name
         self._accessor = accessor
@@ -97,7 +336,159 @@ class NonCachedAccessor:
             # we're accessing the attribute of the class, i.e., Dataset.geo
             return self._accessor
         # copied code from pandas accessor, minus the caching
-        return self._accessor(obj)
+        accessor_obj = self._accessor(obj)
+        _copy_validation(accessor_obj, obj)
+        return accessor_obj
+
+
+class UserTimeIndex:
+    """
+    Sort order of the rows of a table by user and time, with the offsets of the users in the sorted order.
+
+    Attributes
+    ----------
+    order : np.ndarray
+        Positions of the rows sorted by ["user_id", time column]. Same order as a (stable) ``sort_values``.
+    user_ids : pd.Index
+        The users in sorted order.
+    offsets : np.ndarray
+        The rows of ``user_ids[i]`` are at positions ``order[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, order, user_ids, offsets):
+        self.order = order
+        self.user_ids = user_ids
+        self.offsets = offsets
+
+    def positions(self, user_id):
+        """Positions of the rows of a user, sorted by time. Raises KeyError for unknown users."""
+        i = self.user_ids.get_loc(user_id)
+        return self.order[self.offsets[i] : self.offsets[i + 1]]
+
+
+def get_user_time_index(obj, time_col=None):
+    """
+    Get the sort order of a table by user and time and the offsets of the users.
+
+    For trackintel classes the result is cached on the table and reused as long as the user and time columns still
+    match the cached order. The check takes linear time without sorting, which is much faster than sorting again.
+    For other tables the order is computed on every call. Functions that would sort by ["user_id", time column]
+    can reuse it instead.
+
+    Parameters
+    ----------
+    obj : Positionfixes, Staypoints, Triplegs, Trips, Tours or DataFrame
+        Table with column "user_id" and the time column.
+
+    time_col : str, optional
+        Column with the time, by default "tracked_at" if it exists otherwise "started_at".
+
+    Returns
+    -------
+    UserTimeIndex
+        The order of the rows and the offsets of the users in that order.
+
+    Examples
+    --------
+    >>> index = get_user_time_index(sp)
+    >>> sp_sorted = sp.take(index.order)
+    """
+    time_col = _time_column(obj, time_col)
+    cached = isinstance(obj, TrackintelBase)
+    if cached:
+        cache = obj.__dict__.setdefault("_trackintel_user_time_index", {})
+        index = cache.get(time_col)
+        if index is not None and _matches_user_time_index(index, obj["user_id"], obj[time_col]):
+            return index
+
+    user_key = _sort_key(obj["user_id"])
+    order = np.lexsort((_sort_key(obj[time_col]), user_key))
+    user_sorted = user_key[order]
+    if len(order) == 0:
+        offsets = np.zeros(1, dtype=np.int64)
+    else:
+        offsets = np.concatenate(([0], np.flatnonzero(user_sorted[1:] != user_sorted[:-1]) + 1, [len(order)]))
+    user_ids = pd.Index(obj["user_id"].take(order[offsets[:-1]]))
+    index = UserTimeIndex(order, user_ids, offsets)
+    if cached:
+        cache[time_col] = index
+    return index
+
+
+def _time_column(obj, time_col=None):
+    """Name of the time column, by default "tracked_at" if it exists otherwise "started_at"."""
+    if time_col is not None:
+        return time_col
+    return "tracked_at" if "tracked_at" in obj.columns else "started_at"
+
+
+def _sort_key(col):
+    """Integer key of a column that sorts like sort_values (missing values last)."""
+    if isinstance(col.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(col.dtype):
+        key = col.array.asi8
+        missing = col.isna().to_numpy()
+    else:
+        key, _ = pd.factorize(col, sort=True)
+        missing = key == -1
+    if missing.any():
+        key = np.where(missing, np.iinfo(np.int64).max, key)
+    return key
+
+
+def _matches_user_time_index(index, user_col, time_col):
+    """Check if the cached order still sorts the current users and times, without sorting or factorizing."""
+    if len(index.order) != len(user_col):
+        return False
+    # the users of the runs have to be the cached users, still in sorted order
+    first = user_col.take(index.order[index.offsets[:-1]])
+    if not (index.user_ids.equals(pd.Index(first)) and first.is_monotonic_increasing and first.is_unique):
+        return False
+    # and the runs must not contain other users
+    if isinstance(user_col.dtype, pd.CategoricalDtype):
+        user_sorted = user_col.cat.codes.to_numpy()[index.order]
+    else:
+        user_sorted = user_col.to_numpy()[index.order]
+    boundaries = np.flatnonzero(user_sorted[1:] != user_sorted[:-1]) + 1
+    if not np.array_equal(boundaries, index.offsets[1:-1]):
+        return False
+    # time has to be sorted within users, missing times are not sorted last by asi8 -> sort again
+    if time_col.hasnans:
+        return False
+    time_diff = np.diff(time_col.array.asi8[index.order])
+    time_diff[boundaries - 1] = 0
+    return not np.any(time_diff < 0)
+
+
+def _user_time_order(df, time_col=None):
+    """Positions of the rows of df sorted by ["user_id", time column], same as a stable sort_values."""
+    time_col = _time_column(df, time_col)
+    return np.lexsort((_sort_key(df[time_col]), _sort_key(df["user_id"])))
+
+
+def _sort_by_user(df, source=None, time_col=None):
+    """
+    Sort df by ["user_id", time column].
+
+    Parameters
+    ----------
+    df : DataFrame
+        Table to sort.
+
+    source : Positionfixes, Staypoints, Triplegs, Trips or Tours, optional
+        Table with the same rows in the same order as df (e.g. the input df is a shallow copy of), whose cached
+        index is used. By default df is sorted without caching, as intermediate tables are only sorted once.
+
+    time_col : str, optional
+        Column with the time, see get_user_time_index.
+
+    Returns
+    -------
+    DataFrame
+        Sorted df.
+    """
+    if source is not None:
+        return df.take(get_user_time_index(source, time_col=time_col).order)
+    return df.take(_user_time_order(df, time_col=time_col))
 
 
 def _register_trackintel_accessor(name: str):
@@ -202,6 +593,14 @@ dtype: dict of column name to SQL type, default None
     Specifying the datatype for columns.
     The keys should be the column names and the values should be the SQLAlchemy types.
 
+method : {{None, 'copy'}}, default None
+    Controls the SQL insertion clause used.
+
+    - None: Uses geopandas/pandas to write the data.
+    - 'copy': Bulk loads the rows with PostgreSQL ``COPY ... FROM STDIN`` in CSV format, with geometries
+      encoded as EWKB and JSON columns serialized. Usually much faster for large tables,
+      requires a psycopg2 or psycopg connection.
+
 Examples
 --------
 >>> {short}.to_postgis(conn_string, table_name)
@@ -229,3 +628,60 @@ Examples
 --------
 >>> {short}.to_csv("export_{long}.csv")
 """
+
+_shared_docs["write_parquet"] = """
+Write {long} to a GeoParquet file.
+
+Wraps the GeoPandas to_parquet function (pandas for data without geometry).
+Geometries are stored as WKB, timezone aware timestamps and nullable integer columns are preserved.
+The index is always stored as a column, such that ids are kept when reading with filters.
+
+Parameters
+----------{first_arg}
+path : str or path-like
+    The file to write to.
+
+kwargs
+    Additional keyword arguments passed to to_parquet(), e.g., `row_group_size` or `compression`.
+    Smaller row groups allow to skip more data when reading with filters. `index` must not be changed.
+
+Examples
+--------
+>>> {short}.to_parquet("export_{long}.parquet")
+>>> ti.io.write_{long}_parquet({short}, "export_{long}.parquet")
+"""
+
+_shared_docs["read_parquet"] = """
+Read {long} from a GeoParquet file.
+
+Wraps the GeoPandas read_parquet function (pandas for data without geometry) and builds a {model} instance.
+Filters on 'user_id' and time are pushed down to the parquet reader, such that row groups that do not match
+are skipped.
+
+Parameters
+----------
+path : str or path-like
+    The file (or directory of files) to read.
+
+columns : list of str, optional
+    Columns to read in addition to the required columns {required} and the geometry.
+    If None, all columns are read.
+
+user_id : scalar or list-like, optional
+    Only read {long} of these users.
+{time_filter}
+filters : pyarrow.compute.Expression or list of tuples, optional
+    Additional row filters in the pyarrow format, combined with the other filters.
+
+kwargs
+    Additional keyword arguments passed to read_parquet().
+
+Returns
+-------
+{short} : {model}
+
+Examples
+--------
+>>> ti.io.read_{long}_parquet("{long}.parquet", user_id=[0, 1])
+>>> ti.io.read_{long}_parquet("{long}.parquet", columns=[]{time_example})
+"""
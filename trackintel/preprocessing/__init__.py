@@ -11,6 +11,8 @@ from .triplegs import generate_trips
 
 from .trips import generate_tours
 
+from .pipeline import LazyPipeline
+
 __all__ = [
     "generate_staypoints",
     "generate_triplegs",
@@ -18,6 +20,7 @@ __all__ = [
     "merge_staypoints",
     "generate_trips",
     "generate_tours",
+    "LazyPipeline",
     "calc_temp_overlap",
     "applyParallel",
 ]
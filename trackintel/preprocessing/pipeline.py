@@ -0,0 +1,397 @@
+import inspect
+
+import numpy as np
+import pandas as pd
+
+import trackintel as ti
+from trackintel import Positionfixes
+from trackintel.io.util import _utc_timestamp
+from trackintel.model.util import get_validation_level, set_validation_level
+
+# stages in the order of the trackintel model chain
+_stage_order = [
+    "generate_staypoints",
+    "create_activity_flag",
+    "generate_locations",
+    "generate_triplegs",
+    "generate_trips",
+    "generate_tours",
+]
+# stages that have to be recorded before a stage
+_stage_requires = {
+    "create_activity_flag": ["generate_staypoints"],
+    "generate_locations": ["generate_staypoints"],
+    "generate_triplegs": ["generate_staypoints"],
+    "generate_trips": ["generate_staypoints", "create_activity_flag", "generate_triplegs"],
+    "generate_tours": ["generate_trips"],
+}
+# tables that are created by a stage
+_stage_creates = {
+    "generate_staypoints": "staypoints",
+    "generate_locations": "locations",
+    "generate_triplegs": "triplegs",
+    "generate_trips": "trips",
+    "generate_tours": "tours",
+}
+
+
+class LazyPipeline:
+    """
+    Lazy pipeline over the trackintel model chain.
+
+    The pipeline records the preprocessing steps with their parameters and only runs them on :func:`collect`.
+    Filters on users and time are applied to the positionfixes, and pushed down into the reader if possible.
+
+    Parameters
+    ----------
+    positionfixes : Positionfixes
+        Positionfixes in memory, use :func:`LazyPipeline.read` to read them lazily.
+
+    Notes
+    -----
+    Pushing down the filters
+        - Readers with the arguments `user_id`, `start` and `end` (e.g., :func:`trackintel.io.read_positionfixes_parquet`
+          and :func:`trackintel.io.read_positionfixes_postgis`) receive the filters and only read the matching rows.
+        - Readers with a `chunksize` argument (e.g., :func:`trackintel.io.read_positionfixes_csv`) are read in chunks
+          and every chunk is filtered directly, such that never all positionfixes are held in memory.
+        - Otherwise the positionfixes are filtered after reading.
+
+    The filters always apply to the positionfixes, wherever they are placed in the pipeline. Staypoints and
+    triplegs at the borders of the time range therefore only contain the positionfixes within the range.
+    All stages work per user, except `generate_locations` with ``agg_level="dataset"``.
+
+    The stages are run one after the other without validating the intermediate results again, as they
+    are created by the previous stage. Stages that are not needed for the requested tables are skipped.
+
+    Examples
+    --------
+    >>> pipeline = (
+    ...     ti.preprocessing.LazyPipeline.read(ti.io.read_positionfixes_parquet, "pfs.parquet")
+    ...     .filter(user_id=[1, 2], start="2023-01-01", end="2023-02-01")
+    ...     .generate_staypoints(dist_threshold=100)
+    ...     .create_activity_flag()
+    ...     .generate_triplegs()
+    ...     .generate_trips()
+    ... )
+    >>> tables = pipeline.collect()
+    >>> trips = tables["trips"]
+    """
+
+    def __init__(self, positionfixes):
+        self._reader = None
+        self._reader_args = ()
+        self._reader_kwargs = {}
+        self._positionfixes = positionfixes
+        self._chunksize = None
+        self._filters = {"user_id": None, "start": None, "end": None}
+        self._stages = []
+
+    @classmethod
+    def read(cls, reader, *args, chunksize=1_000_000, **kwargs):
+        """
+        Create a pipeline that reads the positionfixes on :func:`collect`.
+
+        Parameters
+        ----------
+        reader : callable
+            Function that returns positionfixes, e.g., :func:`trackintel.io.read_positionfixes_parquet`.
+
+        args, kwargs
+            Arguments passed to `reader`.
+
+        chunksize : int, default 1_000_000
+            Number of rows per chunk for readers that are read in chunks to apply the filters.
+            It is never passed to readers that apply the filters themselves. If `reader` still returns
+            chunks (e.g., a :func:`functools.partial` with a `chunksize`), they are concatenated.
+
+        Returns
+        -------
+        LazyPipeline
+
+        Examples
+        --------
+        >>> pipeline = ti.preprocessing.LazyPipeline.read(ti.io.read_positionfixes_csv, "pfs.csv", sep=";")
+        """
+        pipeline = cls(None)
+        pipeline._reader = reader
+        pipeline._reader_args = args
+        pipeline._reader_kwargs = kwargs
+        pipeline._chunksize = chunksize
+        return pipeline
+
+    def _copy(self):
+        pipeline = self.__class__.__new__(self.__class__)
+        pipeline.__dict__.update(self.__dict__)
+        pipeline._filters = dict(self._filters)
+        pipeline._stages = list(self._stages)
+        return pipeline
+
+    def filter(self, user_id=None, start=None, end=None):
+        """
+        Only process the positionfixes of these users and within this time range.
+
+        Multiple filters are combined, i.e., only users in all filters and the intersection of the time ranges
+        are kept. If no user is in all filters a ValueError is raised. If no positionfixes match the filters,
+        :func:`LazyPipeline.collect` raises a ValueError.
+
+        Parameters
+        ----------
+        user_id : scalar or list-like, optional
+            Only process the positionfixes of these users.
+
+        start, end : datetime-like, optional
+            Only process positionfixes tracked at or after `start` / before `end`.
+            Naive timestamps are interpreted as UTC.
+
+        Returns
+        -------
+        LazyPipeline
+
+        Examples
+        --------
+        >>> pipeline.filter(user_id=[1, 2], start="2023-01-01")
+        """
+        pipeline = self._copy()
+        filters = pipeline._filters
+        if user_id is not None:
+            user_id = list(np.atleast_1d(user_id))
+            if filters["user_id"] is not None:
+                user_id = [u for u in filters["user_id"] if u in set(user_id)]
+            if not user_id:
+                raise ValueError("The combined user_id filters of the pipeline contain no user.")
+            filters["user_id"] = user_id
+        if start is not None:
+            start = _utc_timestamp(start)
+            filters["start"] = start if filters["start"] is None else max(start, filters["start"])
+        if end is not None:
+            end = _utc_timestamp(end)
+            filters["end"] = end if filters["end"] is None else min(end, filters["end"])
+        return pipeline
+
+    def _add_stage(self, name, kwargs):
+        recorded = [stage for stage, _ in self._stages]
+        if name in recorded:
+            raise ValueError(f"Stage '{name}' is already part of the pipeline.")
+        if recorded and _stage_order.index(name) < _stage_order.index(recorded[-1]):
+            raise ValueError(f"Stage '{name}' has to be added before '{recorded[-1]}'.")
+        missing = [stage for stage in _stage_requires.get(name, []) if stage not in recorded]
+        if missing:
+            raise ValueError(f"Stage '{name}' requires the stages {missing}.")
+        pipeline = self._copy()
+        pipeline._stages.append((name, kwargs))
+        return pipeline
+
+    def generate_staypoints(self, **kwargs):
+        """
+        Record generating staypoints from the positionfixes.
+
+        See :func:`trackintel.preprocessing.generate_staypoints` for the arguments.
+        """
+        return self._add_stage("generate_staypoints", kwargs)
+
+    def create_activity_flag(self, **kwargs):
+        """
+        Record flagging the activity staypoints.
+
+        See :func:`trackintel.analysis.create_activity_flag` for the arguments.
+        """
+        return self._add_stage("create_activity_flag", kwargs)
+
+    def generate_locations(self, **kwargs):
+        """
+        Record generating locations from the staypoints.
+
+        See :func:`trackintel.preprocessing.generate_locations` for the arguments.
+        """
+        return self._add_stage("generate_locations", kwargs)
+
+    def generate_triplegs(self, **kwargs):
+        """
+        Record generating triplegs from the positionfixes and staypoints.
+
+        See :func:`trackintel.preprocessing.generate_triplegs` for the arguments.
+        """
+        return self._add_stage("generate_triplegs", kwargs)
+
+    def generate_trips(self, **kwargs):
+        """
+        Record generating trips from the staypoints and triplegs.
+
+        See :func:`trackintel.preprocessing.generate_trips` for the arguments.
+        """
+        return self._add_stage("generate_trips", kwargs)
+
+    def generate_tours(self, use_locations=False, **kwargs):
+        """
+        Record generating tours from the trips.
+
+        Parameters
+        ----------
+        use_locations : bool, default False
+            If True, trips are connected via the locations of the staypoints. Requires the stage
+            `generate_locations`.
+
+        kwargs
+            See :func:`trackintel.preprocessing.generate_tours` for the arguments.
+        """
+        if use_locations and "generate_locations" not in [stage for stage, _ in self._stages]:
+            raise ValueError("use_locations requires the stage 'generate_locations'.")
+        return self._add_stage("generate_tours", dict(kwargs, use_locations=use_locations))
+
+    def explain(self):
+        """
+        Return a description of the plan that is run on :func:`collect`.
+
+        Returns
+        -------
+        str
+
+        Examples
+        --------
+        >>> print(pipeline.explain())
+        """
+        if self._reader is None:
+            source = "positionfixes in memory"
+        else:
+            args = [repr(a) for a in self._reader_args] + [f"{k}={v!r}" for k, v in self._reader_kwargs.items()]
+            source = f"{getattr(self._reader, '__name__', repr(self._reader))}({', '.join(args)})"
+        filters = [f"{k}={v!r}" for k, v in self._filters.items() if v is not None]
+        lines = ["LazyPipeline", f"  source: {source}"]
+        if filters:
+            lines.append(f"  filters ({self._filter_mode()}): {', '.join(filters)}")
+        for name, kwargs in self._stages:
+            lines.append(f"  {name}({', '.join(f'{k}={v!r}' for k, v in kwargs.items())})")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return self.explain()
+
+    def _filter_mode(self):
+        """Return how the filters are applied to the positionfixes."""
+        if self._reader is None:
+            return "in memory"
+        parameters = inspect.signature(self._reader).parameters
+        if {"user_id", "start", "end"} <= parameters.keys():
+            return "pushed down into reader"
+        if "chunksize" in parameters:
+            return "per chunk"
+        return "after reading"
+
+    def _read_positionfixes(self):
+        filters = {k: v for k, v in self._filters.items() if v is not None}
+        if self._reader is None:
+            if not filters:
+                return self._positionfixes
+            pfs = _filter_positionfixes(self._positionfixes, **filters)
+        elif not filters:
+            pfs = self._reader(*self._reader_args, **self._reader_kwargs)
+            return pfs if isinstance(pfs, pd.DataFrame) else Positionfixes(_concat_chunks(pfs))
+        elif self._filter_mode() == "pushed down into reader":
+            # the reader would fail on validating an empty result
+            level = get_validation_level()
+            try:
+                set_validation_level("off")
+                # chunks must be read before the validation is switched on again
+                pfs = _concat_chunks(self._reader(*self._reader_args, **self._reader_kwargs, **filters))
+            finally:
+                set_validation_level(level)
+        elif self._filter_mode() == "per chunk":
+            chunks = self._reader(*self._reader_args, chunksize=self._chunksize, **self._reader_kwargs)
+            pfs = pd.concat([_filter_positionfixes(chunk, **filters) for chunk in chunks])
+        else:
+            pfs = _filter_positionfixes(
+                _concat_chunks(self._reader(*self._reader_args, **self._reader_kwargs)), **filters
+            )
+
+        if len(pfs) == 0:
+            filters = ", ".join(f"{k}={v}" for k, v in filters.items())
+            raise ValueError(f"No positionfixes match the filters of the pipeline ({filters}).")
+        return Positionfixes(pfs)
+
+    def collect(self, tables=None):
+        """
+        Run the pipeline.
+
+        Parameters
+        ----------
+        tables : str or list of str, optional
+            Only run the stages up to the last stage that creates one of these tables
+            ('positionfixes', 'staypoints', 'locations', 'triplegs', 'trips', 'tours').
+            If None, all stages are run.
+
+        Returns
+        -------
+        dict
+            The tables by name, i.e., the filtered positionfixes and the tables created by the run stages.
+            Raises a ValueError if no positionfixes match the filters.
+
+        Examples
+        --------
+        >>> tables = pipeline.collect()
+        >>> sp = pipeline.collect("staypoints")["staypoints"]
+        """
+        stages = self._stages
+        if tables is not None:
+            tables = [tables] if isinstance(tables, str) else list(tables)
+            known = ["positionfixes"] + [_stage_creates[stage] for stage, _ in stages if stage in _stage_creates]
+            unknown = [t for t in tables if t not in known]
+            if unknown:
+                raise ValueError(f"The pipeline does not create the tables {unknown}, only {known}.")
+            last = max([i for i, (stage, _) in enumerate(stages) if _stage_creates.get(stage) in tables], default=-1)
+            stages = stages[: last + 1]
+
+        result = {"positionfixes": self._read_positionfixes()}
+        level = get_validation_level()
+        try:
+            # the input of each stage is the validated output of the previous stage
+            set_validation_level("off")
+            for name, kwargs in stages:
+                _run_stage(name, kwargs, result)
+        finally:
+            set_validation_level(level)
+        return result
+
+
+def _run_stage(name, kwargs, tables):
+    """Run a stage of the pipeline and update the tables in place."""
+    if name == "generate_staypoints":
+        tables["positionfixes"], tables["staypoints"] = ti.preprocessing.generate_staypoints(
+            tables["positionfixes"], **kwargs
+        )
+    elif name == "create_activity_flag":
+        tables["staypoints"] = ti.analysis.create_activity_flag(tables["staypoints"], **kwargs)
+    elif name == "generate_locations":
+        tables["staypoints"], tables["locations"] = ti.preprocessing.generate_locations(tables["staypoints"], **kwargs)
+    elif name == "generate_triplegs":
+        tables["positionfixes"], tables["triplegs"] = ti.preprocessing.generate_triplegs(
+            tables["positionfixes"], tables["staypoints"], **kwargs
+        )
+    elif name == "generate_trips":
+        tables["staypoints"], tables["triplegs"], tables["trips"] = ti.preprocessing.generate_trips(
+            tables["staypoints"], tables["triplegs"], **kwargs
+        )
+    elif name == "generate_tours":
+        kwargs = dict(kwargs)
+        staypoints = tables["staypoints"] if kwargs.pop("use_locations") else None
+        tables["trips"], tables["tours"] = ti.preprocessing.generate_tours(
+            tables["trips"], staypoints=staypoints, **kwargs
+        )
+
+
+def _concat_chunks(result):
+    """Concatenate the result of a reader that returns chunks instead of a single DataFrame."""
+    if isinstance(result, pd.DataFrame):
+        return result
+    return pd.concat(list(result))
+
+
+def _filter_positionfixes(pfs, user_id=None, start=None, end=None):
+    """Return the positionfixes of the users tracked in [start, end)."""
+    mask = np.ones(len(pfs), dtype=bool)
+    if user_id is not None:
+        mask &= pfs["user_id"].isin(user_id).to_numpy()
+    if start is not None:
+        mask &= (pfs["tracked_at"] >= start).to_numpy()
+    if end is not None:
+        mask &= (pfs["tracked_at"] < end).to_numpy()
+    return pfs[mask]
@@ -8,9 +8,11 @@ import pandas as pd
 from shapely.geometry import LineString, Point
 from tqdm import tqdm
 
-from trackintel import Positionfixes, Staypoints, Triplegs
+from trackintel import CompactPositionfixes, Positionfixes, Staypoints, Triplegs
 from trackintel.geogr import check_gdf_planar
-from trackintel.preprocessing.util import _explode_agg, applyParallel
+from trackintel.geogr.distances import _coordinates
+from trackintel.model.util import _sort_by_user
+from trackintel.preprocessing.util import _duplicated, _explode_agg, applyParallel
 
 
 def generate_staypoints(
@@ -30,7 +32,7 @@ def generate_staypoints(
 
     Parameters
     ----------
-    positionfixes : Positionfixes
+    positionfixes : Positionfixes or CompactPositionfixes
 
     method : {'sliding'}
         Method to create staypoints. 'sliding' applies a sliding window over the data.
@@ -71,7 +73,7 @@ def generate_staypoints(
 
     Returns
     -------
-    pfs: Positionfixes
+    pfs: Positionfixes or CompactPositionfixes
         The original positionfixes with a new column ``[`staypoint_id`]``.
 
     sp: Staypoints
@@ -98,13 +100,16 @@ def generate_staypoints(
     similarity based on location history. In Proceedings of the 16th ACM SIGSPATIAL international
     conference on Advances in geographic information systems (p. 34). ACM.
     """
-    Positionfixes.validate(positionfixes)
-    # copy the original pfs for adding 'staypoint_id' column
-    pfs = positionfixes.copy()
+    if isinstance(positionfixes, CompactPositionfixes):
+        CompactPositionfixes.validate(positionfixes)
+    else:
+        Positionfixes.validate(positionfixes)
+    # shallow copy of the original pfs for adding 'staypoint_id' column
+    pfs = positionfixes.copy(deep=False)
 
     if exclude_duplicate_pfs:
         len_org = pfs.shape[0]
-        pfs = pfs.drop_duplicates()
+        pfs = pfs[~_duplicated(pfs)]
         nb_dropped = len_org - pfs.shape[0]
         if nb_dropped > 0:
             warn_str = (
@@ -119,7 +124,7 @@ def generate_staypoints(
 
     elevation_flag = "elevation" in pfs.columns  # if there is elevation data
 
-    geo_col = pfs.geometry.name
+    geo_col = "geom" if isinstance(pfs, CompactPositionfixes) else pfs.geometry.name
     if elevation_flag:
         sp_column = ["user_id", "started_at", "finished_at", "elevation", geo_col]
     else:
@@ -128,7 +133,7 @@ def generate_staypoints(
     # TODO: tests using a different distance function, e.g., L2 distance
     if method == "sliding":
         # Algorithm from Li et al. (2008). For details, please refer to the paper.
-        grouped = pfs.groupby("user_id", as_index=False)
+        grouped = pfs.groupby("user_id", as_index=False, observed=True)
         if n_jobs == 1:
             result_list = [
                 _generate_staypoints_sliding_user(
@@ -176,6 +181,8 @@ def generate_staypoints(
 
     # user_id of sp should be the same as ret_pfs
     sp["user_id"] = sp["user_id"].astype(pfs["user_id"].dtype)
+    # keep the time unit of the positionfixes
+    sp[["started_at", "finished_at"]] = sp[["started_at", "finished_at"]].astype(pfs["tracked_at"].dtype)
 
     if len(sp) == 0:
         warnings.warn("No staypoints can be generated, returning empty sp.")
@@ -195,7 +202,8 @@ def generate_triplegs(
 
     Parameters
     ----------
-    positionfixes : Positionfixes
+    positionfixes : Positionfixes or CompactPositionfixes
+        CompactPositionfixes are converted to Positionfixes as triplegs require the Point geometries.
         If 'staypoint_id' column is not found, 'staypoints' needs to be provided.
 
     staypoints : Staypoints, optional
@@ -231,16 +239,18 @@ def generate_triplegs(
     --------
     >>> pfs.generate_triplegs('between_staypoints', gap_threshold=15)
     """
+    if isinstance(positionfixes, CompactPositionfixes):
+        positionfixes = positionfixes.to_positionfixes()
     Positionfixes.validate(positionfixes)
-    # copy the original pfs for adding 'tripleg_id' column
-    pfs = positionfixes.copy()
+    # shallow copy of the original pfs for adding 'tripleg_id' column
+    pfs = positionfixes.copy(deep=False)
 
     # if the positionfixes already have a column "tripleg_id", we drop it
     if "tripleg_id" in pfs:
         pfs.drop(columns="tripleg_id", inplace=True)
 
     # we need to ensure pfs is properly ordered
-    pfs.sort_values(by=["user_id", "tracked_at"], inplace=True)
+    pfs = _sort_by_user(pfs, source=positionfixes)
 
     # get case:
     # Case 1: True, pfs have a column 'staypoint_id'
@@ -500,8 +510,7 @@ def _generate_staypoints_sliding_user(
     time_threshold_value = time_threshold / pd.Timedelta(1, unit=tracked_unit)
 
     # put x and y into numpy arrays to speed up the access in the for loop (shapely is slow)
-    x = df[geo_col].x.to_numpy()
-    y = df[geo_col].y.to_numpy()
+    x, y = _coordinates(df)
     lon_rad = np.deg2rad(x)
     lat_rad = np.deg2rad(y)
     cos_lat = np.cos(lat_rad)
@@ -574,7 +583,8 @@ def __create_new_staypoints(start, end, pfs, elevation_flag, geo_col, x, y, plan
 
     if elevation_flag:
         new_sp["elevation"] = pfs["elevation"].iloc[start:end].median()
-    new_sp["pfs_id"] = pfs.index[start:end].to_list()
+    # view of the ids, flattened in generate_staypoints without creating Python lists
+    new_sp["pfs_id"] = pfs.index.to_numpy()[start:end]
 
     return new_sp
 
@@ -1,12 +1,12 @@
 import numpy as np
 import geopandas as gpd
 import pandas as pd
-from sklearn.cluster import DBSCAN
 import warnings
 from tqdm import tqdm
 
 from trackintel import Staypoints, Locations
 from trackintel.geogr import check_gdf_planar, meters_to_decimal_degrees
+from trackintel.model.util import _sort_by_user, get_user_time_index
 from trackintel.preprocessing.util import applyParallel, angle_centroid_multipoints
 
 
@@ -82,24 +82,28 @@ def generate_locations(
         raise ValueError(f"method '{method}' is unknown. Supported value is ['dbscan'].")
 
     # initialize the return GeoDataFrames
-    sp = gpd.GeoDataFrame(staypoints.copy())
+    sp = gpd.GeoDataFrame(staypoints.copy(deep=False))
+    # sort by user and time with the cached order of the input
+    order = get_user_time_index(staypoints).order
     non_activities = None
     if activities_only:
         if "activity" not in sp.columns:
             raise KeyError('staypoints must contain column "activity" if "activities_only" flag is set.')
         non_activities = sp[~sp["activity"]]
-        sp = sp[sp["activity"]]
-    sp = sp.sort_values(["user_id", "started_at"])
+        order = order[sp["activity"].to_numpy(dtype=bool)[order]]
+    sp = sp.take(order)
     geo_col = sp.geometry.name
 
     if method == "dbscan":
+        from sklearn.cluster import DBSCAN
+
         eps = epsilon / 6371000 if distance_metric == "haversine" else epsilon
         # scikit haversine_distance wants radian. (We assume that this is good enough)
         # https://scikit-learn.org/stable/modules/generated/sklearn.metrics.pairwise.haversine_distances.html
         db = DBSCAN(eps=eps, min_samples=num_samples, algorithm="ball_tree", metric=distance_metric)
 
         if agg_level == "user":
-            grouped = sp.groupby("user_id", as_index=False)
+            grouped = sp.groupby("user_id", as_index=False, observed=True)
             if n_jobs == 1:
                 result_list = [
                     _gen_locs_dbscan(group, distance_metric=distance_metric, db=db)
@@ -136,7 +140,7 @@ def generate_locations(
 
             sp_non_noise_labels["location_id"] = sp_non_noise_labels["location_id"] + loc_id_offset
             sp = gpd.GeoDataFrame(pd.concat([sp_non_noise_labels, sp_noise_labels]), geometry=geo_col)
-            sp.sort_values(["user_id", "started_at"], inplace=True)
+            sp = _sort_by_user(sp)
 
         else:
             _gen_locs_dbscan(sp, db=db, distance_metric=distance_metric)
@@ -149,7 +153,7 @@ def generate_locations(
             singleton_locs = temp_sp.loc[~duplicate_mask].copy()
             multi_rows = temp_sp.loc[duplicate_mask]
             if len(multi_rows) > 0:
-                multi_locs = multi_rows.dissolve(by=["user_id", "location_id"], as_index=False)
+                multi_locs = multi_rows.dissolve(by=["user_id", "location_id"], as_index=False, observed=True)
                 locs = gpd.GeoDataFrame(
                     pd.concat([singleton_locs, multi_locs], ignore_index=True),
                     geometry=geo_col,
@@ -163,7 +167,7 @@ def generate_locations(
             # get user-location pairs
             locs = temp_sp[["user_id", "location_id"]].drop_duplicates(ignore_index=True)
             # get location geometries
-            geom_gdf = temp_sp.dissolve(by=["location_id"], as_index=False).drop(columns={"user_id"})
+            geom_gdf = temp_sp.dissolve(by=["location_id"], as_index=False, observed=True).drop(columns={"user_id"})
             # merge pairs with location geometries
             locs = geom_gdf.merge(locs, on="location_id", how="right")
 
@@ -291,19 +295,17 @@ def merge_staypoints(staypoints, triplegs, max_time_gap="10min", agg={}):
         raise TypeError("Parameter max_time_gap must be either of type String or pd.Timedelta!")
     assert "location_id" in staypoints.columns, "Staypoints must contain column location_id"
 
-    sp_merge = staypoints.copy()
+    sp_merge = staypoints.copy(deep=False)
     index_name = staypoints.index.name
 
     # concat sp and tpls to get information whether there is a tripleg between to staypoints
-    tpls_merge = triplegs.copy()
+    tpls_merge = triplegs.copy(deep=False)
     tpls_merge["type"] = "tripleg"
     sp_merge["type"] = "staypoint"
-    # convert datatypes in order to preserve the datatypes (especially ints) despite of NaNs during concat
-    sp_merge = sp_merge.convert_dtypes()
 
     # a joined dataframe sp_tpls is constructed to add the columns 'type' and 'next_type' to the 'sp_merge' table
     # concat and sort by time
-    sp_tpls = pd.concat([sp_merge, tpls_merge]).sort_values(by=["user_id", "started_at"])
+    sp_tpls = _sort_by_user(pd.concat([sp_merge, tpls_merge]))
     # TODO: we want to make tpls as argumtent optional and adapt this logic here. See issue #463.
     sp_tpls.index.rename(index_name, inplace=True)
     # get information whether the there is a tripleg after a staypoint
@@ -355,8 +357,14 @@ def merge_staypoints(staypoints, triplegs, max_time_gap="10min", agg={}):
     agg_dict.update(agg)
 
     # aggregate values
-    sp = sp_merge.groupby(by="index_temp").agg(agg_dict).sort_values(by=["user_id", "started_at"])
+    sp = _sort_by_user(sp_merge.groupby(by="index_temp").agg(agg_dict))
 
     # clean
     sp = sp.set_index(index_name)
+    # restore the dtypes that were upcast by the concat with triplegs (e.g., int with NaN to float, bool to object)
+    for col, func in agg_dict.items():
+        if func in ("first", "last") and col in sp.columns and col in staypoints.columns:
+            if sp[col].dtype != staypoints[col].dtype:
+                sp[col] = sp[col].astype(staypoints[col].dtype)
+    sp.index = sp.index.astype(staypoints.index.dtype)
     return sp
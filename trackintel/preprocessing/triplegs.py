@@ -3,10 +3,12 @@ import warnings
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-from shapely.geometry import MultiPoint, Point
+import shapely
+from shapely.geometry import MultiPoint
 
 from trackintel import Staypoints, Triplegs, Trips
-from trackintel.preprocessing.util import _explode_agg
+from trackintel.model.util import _sort_by_user
+from trackintel.preprocessing.util import _assign_by_id
 
 
 def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
@@ -97,30 +99,18 @@ def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
     sp_tpls_no_act = sp_tpls[~sp_tpls["is_activity"]]
     sp_tpls_only_act = sp_tpls[sp_tpls["is_activity"]]
 
+    # the ids of the staypoints and triplegs of a trip are kept as flat arrays instead of list columns
+    is_tpls = sp_tpls_no_act["type"] == "tripleg"
     trips_grouper = sp_tpls_no_act.groupby("temp_trip_id")
-    trips = trips_grouper.agg(
-        {"user_id": "first", "started_at": "min", "finished_at": "max", "type": list, "sp_tpls_id": list}
-    )
-
-    def _seperate_ids(row):
-        """Split aggregated sp_tpls_ids into staypoint ids and tripleg ids columns."""
-        row_type = np.array(row["type"])
-        row_id = np.array(row["sp_tpls_id"])
-        t = row_type == "tripleg"
-        tpls_ids = row_id[t]
-        sp_ids = row_id[~t]
-        # for dropping trips that don't have triplegs
-        tpls_ids = tpls_ids if len(tpls_ids) > 0 else None
-        return [sp_ids, tpls_ids]
-
-    trips[["sp", "tpls"]] = trips.apply(_seperate_ids, axis=1, result_type="expand")
+    trips = trips_grouper.agg({"user_id": "first", "started_at": "min", "finished_at": "max"})
 
     # drop all trips that don't contain any triplegs
-    trips.dropna(subset=["tpls"], inplace=True)
+    trips = trips[is_tpls.groupby(sp_tpls_no_act["temp_trip_id"]).any()]
 
     # recount trips ignoring empty trips and save trip_id as for id assignment.
+    trips["trip_id"] = np.arange(len(trips))
+    trip_ids = sp_tpls_no_act["temp_trip_id"].map(trips["trip_id"])
     trips.reset_index(inplace=True, drop=True)
-    trips["trip_id"] = trips.index
 
     # add gaps as activities, to simplify id assignment.
     gaps = pd.DataFrame(sp_tpls.loc[gap, "user_id"])
@@ -134,16 +124,13 @@ def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
 
     # merge trips with (filler) activities
 
-    # make space so no overlap with activity "sp_tpls_id"
-    trips.drop(columns=["type", "sp_tpls_id"], inplace=True)
-
     # trips are no activity (with this we don't have to fillna later)
     trips["is_activity"] = False
 
     # Inserting `gaps` and `user_change` into the dataframe creates buffers that catch shifted
     # "staypoint_id" and "trip_id" from corrupting staypoints/trips.
     trips_with_act = pd.concat((trips, sp_tpls_only_act, gaps, user_change), axis=0, ignore_index=True)
-    trips_with_act.sort_values(["user_id", "started_at"], inplace=True)
+    trips_with_act = _sort_by_user(trips_with_act)
 
     # ID assignment #
     # add origin/destination ids by shifting
@@ -178,7 +165,8 @@ def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
     # now handle the data that is aggregated in the trips
     # assign trip_id to tpls, override "trip_id" -> warning in _create_sp_tpls
     cols = triplegs.columns.difference(["trip_id"])
-    tpls = _explode_agg("tpls", "trip_id", triplegs[cols], trips)  # creates copy of triplegs
+    tpls_ids = sp_tpls_no_act.loc[is_tpls, "sp_tpls_id"]
+    tpls = _assign_by_id(triplegs[cols], "trip_id", tpls_ids, trip_ids[is_tpls])  # creates copy of triplegs
 
     # first assign prev_trip_id, next_trip_id for activity staypoints
     activity_staypoints = trips_with_act[trips_with_act["type"] == "staypoint"].copy()
@@ -188,24 +176,26 @@ def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
     cols = staypoints.columns.difference(["prev_trip_id", "next_trip_id", "trip_id"])
     sp = staypoints[cols].join(activity_staypoints[["prev_trip_id", "next_trip_id"]], how="left")
     # second assign trip_id to all staypoints
-    sp = _explode_agg("sp", "trip_id", sp, trips)
+    sp = _assign_by_id(sp, "trip_id", sp_tpls_no_act.loc[~is_tpls, "sp_tpls_id"], trip_ids[~is_tpls])
 
     # fill missing points and convert to MultiPoint
     # for all trips with missing 'origin_staypoint_id' we now assign the startpoint of the first tripleg of the trip.
     # for all tripls with missing 'destination_staypoint_id' we now assign the endpoint of the last tripleg of the trip.
     if add_geometry:
+        # first and last tripleg of every trip (sp_tpls is sorted by time)
+        tpls_ends = tpls_ids.groupby(trip_ids[is_tpls]).agg(["first", "last"])
+        tpls_ends.index = tpls_ends.index.astype("int64")
+        tpls_geom = tpls.geometry
         # fill geometry for origin staypoints that are NaN
-        origin_nan_rows = trips[pd.isna(trips["origin_staypoint_id"])].copy()
-        trips.loc[pd.isna(trips["origin_staypoint_id"]), "origin_geom"] = origin_nan_rows.tpls.map(
-            # from tpls table, get the first point of the first tripleg for the trip
-            lambda x: Point(tpls.loc[x[0], tpls.geometry.name].coords[0])
-        )
+        origin_nan = pd.isna(trips["origin_staypoint_id"])
+        # from tpls table, get the first point of the first tripleg for the trip
+        first_tpls = tpls_ends.loc[trips.index[origin_nan], "first"]
+        trips.loc[origin_nan, "origin_geom"] = shapely.get_point(tpls_geom.loc[first_tpls].to_numpy(), 0)
         # fill geometry for destionations staypoints that are NaN
-        destination_nan_rows = trips[pd.isna(trips["destination_staypoint_id"])].copy()
-        trips.loc[pd.isna(trips["destination_staypoint_id"]), "destination_geom"] = destination_nan_rows.tpls.map(
-            # from tpls table, get the last point of the last tripleg on the trip
-            lambda x: Point(tpls.loc[x[-1], tpls.geometry.name].coords[-1])
-        )
+        destination_nan = pd.isna(trips["destination_staypoint_id"])
+        # from tpls table, get the last point of the last tripleg on the trip
+        last_tpls = tpls_ends.loc[trips.index[destination_nan], "last"]
+        trips.loc[destination_nan, "destination_geom"] = shapely.get_point(tpls_geom.loc[last_tpls].to_numpy(), -1)
         # convert to GeoDataFrame with MultiPoint column and crs (not-None if possible)
         trips["geom"] = [MultiPoint([x, y]) for x, y in zip(trips.origin_geom, trips.destination_geom)]
         crs_trips = sp.crs if sp.crs else tpls.crs
@@ -214,7 +204,7 @@ def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
         trips.drop(["origin_geom", "destination_geom"], inplace=True, axis=1)
 
     # final cleaning
-    trips.drop(columns=["tpls", "sp", "trip_id"], inplace=True)
+    trips.drop(columns=["trip_id"], inplace=True)
 
     # dtype consistency
     # trips id (generated by this function) should be int64
@@ -228,6 +218,10 @@ def generate_trips(staypoints, triplegs, gap_threshold=15, add_geometry=True):
 
     # user_id of trips should be the same as tpls
     trips["user_id"] = trips["user_id"].astype(tpls["user_id"].dtype)
+    # keep the time unit if staypoints and triplegs share it (gaps are computed in ns)
+    for col in ["started_at", "finished_at"]:
+        if staypoints[col].dtype == triplegs[col].dtype:
+            trips[col] = trips[col].astype(triplegs[col].dtype)
 
     return sp, tpls, Trips(trips)
 
@@ -255,9 +249,9 @@ def _concat_staypoints_triplegs(staypoints, triplegs, add_geometry):
     """
     if "is_activity" not in staypoints:
         raise AttributeError("staypoints need the column 'is_activity' to be able to generate trips")
-    # Copy the input because we add temporary column "type"
-    tpls = triplegs.copy()
-    sp = staypoints.copy()
+    # Shallow copy of the input because we add temporary column "type"
+    tpls = triplegs.copy(deep=False)
+    sp = staypoints.copy(deep=False)
 
     # write warnings for columns that we replace
     if "trip_id" in tpls:
@@ -287,8 +281,7 @@ def _concat_staypoints_triplegs(staypoints, triplegs, add_geometry):
         ), "CRS of staypoints and triplegs differ. Geometry cannot be joined safely."
         sp_tpls["geom"] = pd.concat([sp.geometry, tpls.geometry])
 
-    sp_tpls.sort_values(by=["user_id", "started_at"], inplace=True)
-    return sp_tpls
+    return _sort_by_user(sp_tpls)
 
 
 def _get_activity_masks(df):
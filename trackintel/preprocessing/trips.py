@@ -6,7 +6,7 @@ import pandas as pd
 
 import trackintel as ti
 from trackintel import Tours
-from trackintel.preprocessing.util import applyParallel
+from trackintel.preprocessing.util import _flatten_lists, applyParallel
 
 
 def get_trips_grouped(trips, tours):
@@ -34,23 +34,49 @@ def get_trips_grouped(trips, tours):
     This function is necessary because when running generate_tours, one trip only gets the tour ID of the smallest
     tour it belongs to assigned. Here, we return all trips for each tour, which might contain a nested tour.
     """
-    trips_inp = trips.copy()
+    trips_inp = trips.copy(deep=False)
     if "tour_id" in trips_inp.columns:
         trips_inp.drop(columns=["tour_id"], inplace=True)
-    # make smaller version of tours
-    tours_to_trips = tours.reset_index()[["id", "trips"]]
-    # switch to trips id as index
-    tours_to_trips.rename(columns={"id": "tour_id", "trips": "trip_id"}, inplace=True)
-    # expand this small version so that each trip id is one row
-    tours_expanded = tours_to_trips.explode("trip_id").reset_index(drop=True)
+    # each trip on a tour is one row
+    tours_to_trips = get_tour_trip_relation(tours)
 
     # join with trips table by id
-    tours_with_trips = tours_expanded.merge(trips_inp, left_on="trip_id", right_on="id", how="left")
+    tours_with_trips = tours_to_trips.merge(trips_inp, left_on="trip_id", right_on="id", how="left")
     # group
     trips_grouped_by_tour = tours_with_trips.groupby("tour_id")
     return trips_grouped_by_tour
 
 
+def get_tour_trip_relation(tours):
+    """Get the relation between tours and trips as a table with one row per trip on a tour.
+
+    Parameters
+    ----------
+    tours: Tours
+        Output of generate_tours function, must contain column "trips" with list of trip ids on tour
+
+    Returns
+    -------
+    tours_to_trips: pd.DataFrame
+        Columns ["tour_id", "trip_id"], ordered by tour and by the position of the trip on the tour.
+
+    Examples
+    --------
+    >>> get_tour_trip_relation(tours)
+
+    Notes
+    -----
+    Trips and tours have an n:n relationship, in the relation table this is simply a trip_id that appears in the rows
+    of multiple tours. The table can be joined with the trips or grouped by "tour_id" or "trip_id" without exploding
+    the list column "trips".
+    """
+    trip_ids, parents = _flatten_lists(tours["trips"])
+    tours_to_trips = pd.DataFrame(
+        {"tour_id": tours.index.to_numpy()[parents], "trip_id": trip_ids.astype("int64", copy=False)}
+    )
+    return tours_to_trips
+
+
 def generate_tours(
     trips,
     staypoints=None,
@@ -142,7 +168,7 @@ def generate_tours(
     elif not isinstance(max_time, pd.Timedelta):
         raise TypeError("Parameter max_time must be either of type String or pd.Timedelta!")
 
-    trips_input = trips.copy()
+    trips_input = trips.copy(deep=False)
     # If the trips already have a column "tour_id", we drop it
     if "tour_id" in trips_input:
         trips_input.drop(columns="tour_id", inplace=True)
@@ -158,7 +184,7 @@ def generate_tours(
     }
 
     tours = applyParallel(
-        trips_input.groupby("user_id", group_keys=False, as_index=False),
+        trips_input.groupby("user_id", group_keys=False, as_index=False, observed=True),
         _generate_tours_user,
         print_progress=print_progress,
         n_jobs=n_jobs,
@@ -175,15 +201,18 @@ def generate_tours(
     tours.set_index("id", inplace=True)
 
     # assign tour id to trips
-    tour2trip_map = tours.reset_index().explode("trips").rename(columns={"id": "tour_id"})
+    tour2trip_map = get_tour_trip_relation(tours)
     # Each trip is only assigned to one tour. If a trip belongs to multiple tours, we can find its smallest subtour
     # by using the first one it is assigned to (nested tours are always found before big tours - have smaller tour_id)
-    temp = tour2trip_map.groupby("trips").agg({"tour_id": list})
+    temp = tour2trip_map.groupby("trip_id").agg({"tour_id": list})
 
     trips_with_tours = trips_input.join(temp, how="left")
 
     # trips id (generated by this function) should be int64
     tours.index = tours.index.astype("int64")
+    # user_id and timestamps of tours should be the same as trips
+    for col in ["user_id", "started_at", "finished_at"]:
+        tours[col] = tours[col].astype(trips_input[col].dtype)
 
     return trips_with_tours, Tours(tours)
 
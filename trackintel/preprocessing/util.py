@@ -15,33 +15,90 @@ def calc_temp_overlap(start_1, end_1, start_2, end_2):
 
     Parameters
     ----------
-    start_1: datetime
+    start_1: datetime or array-like of datetime
         start of first time span
-    end_1: datetime
+    end_1: datetime or array-like of datetime
         end of first time span
-    start_2: datetime
+    start_2: datetime or array-like of datetime
         start of second time span
-    end_2: datetime
+    end_2: datetime or array-like of datetime
         end of second time span
 
     Returns
     -------
-    float:
+    float or np.array:
         The ratio by which the first timespan overlaps with the second.
+        If any of the inputs is array-like, the ratios are computed elementwise (with broadcasting).
 
     Examples
     --------
     >>> ti.preprocessing.calc_temp_overlap(start_1, end_1, start_2, end_2)
+    >>> ti.preprocessing.calc_temp_overlap(tpls["started_at"], tpls["finished_at"], start_2, end_2)
+    """
+    if all(np.ndim(t) == 0 for t in (start_1, end_1, start_2, end_2)):
+        start = max(start_1, start_2)
+        end = min(end_1, end_2)
+        temp_overlap = max(timedelta(0), end - start)
+
+        dur = end_1 - start_1
+        if dur <= timedelta(0):
+            return 0  # either invalid or division 0
+        return temp_overlap / dur
+
+    start_1, end_1, start_2, end_2 = (_to_int64_ns(t) for t in (start_1, end_1, start_2, end_2))
+    temp_overlap = np.maximum(np.minimum(end_1, end_2) - np.maximum(start_1, start_2), 0)
+    dur = np.broadcast_to(end_1 - start_1, temp_overlap.shape)
+    # either invalid or division 0 -> 0
+    return np.divide(temp_overlap, dur, out=np.zeros(temp_overlap.shape), where=dur > 0)
+
 
+def _to_int64_ns(times):
+    """Convert datetime or array-like of datetime to int64 nanoseconds since epoch (UTC)."""
+    times = pd.to_datetime(times, utc=True)
+    if isinstance(times, pd.Timestamp):
+        return np.int64(times.as_unit("ns").value)
+    return pd.DatetimeIndex(times).as_unit("ns").asi8
+
+
+def _interval_overlap_join(start_1, end_1, start_2, end_2):
     """
-    start = max(start_1, start_2)
-    end = min(end_1, end_2)
-    temp_overlap = max(timedelta(0), end - start)
+    Find all pairs of time spans from two collections that overlap.
 
-    dur = end_1 - start_1
-    if dur <= timedelta(0):
-        return 0  # either invalid or division 0
-    return temp_overlap / dur
+    Sort-sweep join: the spans of both collections are sorted by their start. A pair overlaps if the start of one
+    span lies within the other span, thus the candidates of each span are a contiguous range in the sorted starts of
+    the other collection and can be found with a binary search.
+
+    Parameters
+    ----------
+    start_1, end_1 : array-like of datetime
+        Start and end of the first collection of time spans.
+
+    start_2, end_2 : array-like of datetime
+        Start and end of the second collection of time spans.
+
+    Returns
+    -------
+    pos_1, pos_2 : np.array
+        Positions of the overlapping pairs in the first and second collection.
+    """
+    start_1, end_1, start_2, end_2 = (_to_int64_ns(t) for t in (start_1, end_1, start_2, end_2))
+    # case 1: start_2 in [start_1, end_1)
+    pos_1, pos_2 = _starts_within(start_1, end_1, start_2, left_closed=True)
+    # case 2: start_1 in (start_2, end_2), strict to avoid duplicates with case 1
+    pos_2_, pos_1_ = _starts_within(start_2, end_2, start_1, left_closed=False)
+    return np.concatenate((pos_1, pos_1_)), np.concatenate((pos_2, pos_2_))
+
+
+def _starts_within(start, end, other_start, left_closed=True):
+    """Pairs of (span, other) where other_start lies within the span [start, end) (or (start, end))."""
+    order = np.argsort(other_start, kind="stable")
+    sorted_start = other_start[order]
+    lo = np.searchsorted(sorted_start, start, side="left" if left_closed else "right")
+    hi = np.searchsorted(sorted_start, end, side="left")
+    n = np.maximum(hi - lo, 0)
+    pos = np.repeat(np.arange(len(start)), n)
+    offset = np.arange(len(pos)) - np.repeat(np.cumsum(n) - n, n)
+    return pos, order[np.repeat(lo, n) + offset]
 
 
 def applyParallel(dfGrouped, func, n_jobs, print_progress, **kwargs):
@@ -104,16 +161,88 @@ def _explode_agg(column, agg, orig_df, agg_df):
     pd.DataFrame
         Original Dataframe with additional colum from aggregated DataFrame.
     """
-    temp = agg_df.explode(column)
-    temp = temp[temp[column].notna()]
-    temp.index = temp[column]
+    ids, parents = _flatten_lists(agg_df[column])
+    return _assign_by_id(orig_df, agg, ids, agg_df[agg].iloc[parents])
+
+
+def _flatten_lists(column):
+    """
+    Flatten a column of id lists (or arrays) into one flat array.
+
+    Same layout as an Arrow list array: the ids of all rows are stored contiguously, and the position of the row
+    they belong to is given by the parent indices. Missing values are treated as empty lists.
+
+    Parameters
+    ----------
+    column : pd.Series
+        Column with lists or np.ndarrays of ids.
+
+    Returns
+    -------
+    ids, parents : np.ndarray
+        Flat ids and position of their row in column.
+    """
+    lists = [x for x in column if hasattr(x, "__len__") and len(x) > 0]
+    lengths = np.array([len(x) if hasattr(x, "__len__") else 0 for x in column], dtype=np.int64)
+    ids = np.concatenate(lists) if lists else np.array([], dtype=np.int64)
+    parents = np.repeat(np.arange(len(column)), lengths)
+    return ids, parents
 
-    return_df = orig_df.join(temp[agg], how="left")
-    # ensure index dtype the same as input
-    return_df.index = return_df.index.astype(orig_df.index.dtype)
+
+def _assign_by_id(orig_df, agg, ids, values):
+    """
+    Assign values to the rows of orig_df with index label ids, similar to a left join on the index.
+
+    Parameters
+    ----------
+    orig_df : pd.DataFrame
+        Original Dataframe without the aggregate column.
+    agg : str
+        Name of the new column.
+    ids : array-like
+        Unique index labels of orig_df, ids not in orig_df are ignored.
+    values : array-like
+        Values of the new column for the ids, rows of orig_df without value are set to NaN.
+
+    Returns
+    -------
+    pd.DataFrame
+        Shallow copy of the original Dataframe with the additional column.
+    """
+    values = pd.Series(values, copy=False)
+    values.index = ids
+    values = values.reindex(orig_df.index)
+    values.index = orig_df.index
+    return_df = orig_df.copy(deep=False)
+    return_df[agg] = values
     return return_df
 
 
+def _duplicated(gdf):
+    """
+    Mark rows that equal a previous row in all columns, same as gdf.duplicated().
+
+    Comparing geometries requires to encode all of them, thus only rows that are duplicated
+    in the other columns are checked for equal geometries.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame or DataFrame
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of the duplicated rows.
+    """
+    if not isinstance(gdf, gpd.GeoDataFrame):
+        return gdf.duplicated().to_numpy()
+    candidates = gdf.duplicated(subset=gdf.columns.drop(gdf.geometry.name), keep=False).to_numpy()
+    duplicated = np.zeros(len(gdf), dtype=bool)
+    if candidates.any():
+        duplicated[candidates] = gdf[candidates].duplicated().to_numpy()
+    return duplicated
+
+
 def angle_centroid_multipoints(geometry):
     """Calculate the mean of angles of MultiPoints
 
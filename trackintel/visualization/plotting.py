@@ -1,13 +1,7 @@
 import logging
 import time
 
-import matplotlib
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
 import numpy as np
-import osmnx as ox
-from matplotlib.collections import LineCollection
-from networkx.exception import NetworkXPointlessConcept
 from pandas.api.types import is_datetime64_any_dtype
 
 from trackintel.geogr import check_gdf_planar, meters_to_decimal_degrees
@@ -68,6 +62,9 @@ def regular_figure():
     (figure, axis)
         The figure and its default axis.
     """
+    # matplotlib is imported on first use to keep `import trackintel` fast
+    import matplotlib
+    import matplotlib.pyplot as plt
 
     params = {
         "axes.labelsize": 7,  # Fontsize for x and y labels (originally 10).
@@ -104,6 +101,7 @@ def save_fig(out_filename, tight="tight", formats=["png", "pdf"]):
     --------
     >>> ti.visualization.util("figure", formats=["png"])
     """
+    import matplotlib.pyplot as plt
 
     if out_filename.endswith(".png"):
         outpath = out_filename
@@ -138,6 +136,10 @@ def plot_osm_streets(bbox, ax):
     --------
     >>> ti.visualization.plotting.plot_osm_street(47.392, 47.364, 8.557, 8.509, ax)
     """
+    import osmnx as ox
+    from matplotlib.collections import LineCollection
+    from networkx.exception import NetworkXPointlessConcept
+
     try:
         G = ox.graph_from_bbox(bbox=bbox, network_type="drive")
         lines = []
@@ -238,6 +240,8 @@ def _plot_frames(positionfixes, staypoints, triplegs, locations, radius_sp, radi
     radius_locs : float
     ax : matplotlib.pyplot.Artist
     """
+    import matplotlib.patches as mpatches
+
     if positionfixes is not None:
         positionfixes.plot(ax=ax, markersize=0.5)
     if staypoints is not None:
@@ -302,6 +306,8 @@ def plot(
     --------
     >>> ti.plot(positionfixes=pfs, filename="output.png", plot_osm=True)
     """
+    import matplotlib.pyplot as plt
+
     has_no_ax_input = ax is None
     if ax is None:
         _, ax = regular_figure()
@@ -384,6 +390,7 @@ def plot_modal_split(
     >>> plot_modal_split(modal_split, out_path=tmp_file, date_fmt_x_axis='%d',
     >>>                  y_label='Percentage of daily count', x_label='days')
     """
+    import matplotlib.pyplot as plt
 
     df_modal_split = df_modal_split_in.copy()
     if axis is None: